@@ -0,0 +1,14 @@
+# benchmarks/__init__.py
+"""Headless, deterministic performance benchmarks for Infinite Journal.
+
+Run with `make benchmark` or `python -m benchmarks --help`.
+"""
+
+import os
+import sys
+
+# Without a display SDL falls back to EGL, so PyOpenGL must use EGL too.
+# This has to happen before OpenGL is first imported.
+if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or
+                                             os.environ.get('WAYLAND_DISPLAY')):
+    os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
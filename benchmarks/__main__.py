@@ -0,0 +1,97 @@
+# benchmarks/__main__.py
+"""Command line entry point: python -m benchmarks."""
+
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Importing the benchmark modules registers their benchmarks
+from benchmarks import bench_camera, bench_strokes, bench_spatial, bench_storage, bench_scene  # noqa: F401
+from benchmarks.harness import (
+    BENCHMARKS, Context, compare, create_gl_context, destroy_gl_context, environment,
+    load_report, time_benchmark, write_report
+)
+
+PRESETS = {
+    'small': 10_000,
+    'medium': 1_000_000,
+    'large': 10_000_000,
+}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Run Infinite Journal performance benchmarks.")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small',
+                        help="journal size: small (10k points), medium (1M) or large (10M)")
+    parser.add_argument('--points', type=int, help="journal size in points (overrides --preset)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the synthetic journal")
+    parser.add_argument('--frames', type=int, default=600, help="frames per camera script")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs per benchmark")
+    parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this")
+    parser.add_argument('--no-gl', action='store_true', help="skip benchmarks that need GL")
+    parser.add_argument('--output', type=Path, help="write results to this JSON file")
+    parser.add_argument('--compare', type=Path, help="baseline JSON file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed median slowdown against the baseline (0.10 = 10%%)")
+    parser.add_argument('--list', action='store_true', help="list benchmarks and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the selected benchmarks; returns the process exit code."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    selected = [bench for bench in BENCHMARKS if args.filter in bench.name]
+    if args.list:
+        for bench in selected:
+            marker = " (GL)" if bench.requires_gl else ""
+            print(f"{bench.name}{marker}")
+        return 0
+
+    workdir = Path(tempfile.mkdtemp(prefix="ij_bench_"))
+    context = Context(args.points or PRESETS[args.preset], args.seed, args.frames, workdir)
+    try:
+        if not args.no_gl and any(bench.requires_gl for bench in selected):
+            context.gl_available, context.gl_error, context.gl_renderer = create_gl_context()
+        elif args.no_gl:
+            context.gl_error = "disabled with --no-gl"
+
+        print(f"Journal: {context.points} points, seed {context.seed}; "
+              f"GL: {context.gl_renderer or context.gl_error or 'not needed'}")
+        results = []
+        for bench in selected:
+            result = time_benchmark(bench, context, max(1, args.repeat), max(0, args.warmup))
+            results.append(result)
+            if result.skipped:
+                print(f"  {result.name:<34} skipped: {result.skipped}")
+            else:
+                print(f"  {result.name:<34} {result.median * 1000:10.3f} ms  "
+                      f"(min {result.min * 1000:.3f}, {result.ns_per_item:.1f} ns/item)")
+    finally:
+        destroy_gl_context()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        write_report(args.output, environment(context), results)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(load_report(args.compare), results, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms "
+                  f"({(ratio - 1.0) * 100:+.1f}%)")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
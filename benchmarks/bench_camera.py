@@ -0,0 +1,48 @@
+# benchmarks/bench_camera.py
+"""Camera and player movement benchmarks."""
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from benchmarks.synthetic import drive_player, make_camera_script
+from infinitejournal.world.camera import FPSCamera
+from infinitejournal.world.player import PlayerController
+
+
+@benchmark("camera.player_walk", "camera")
+def player_walk(context):
+    """Player input, movement and matrices along a scripted walk."""
+    script = make_camera_script('walk', context.frames, seed=context.seed)
+
+    def run():
+        player = PlayerController()
+        for frame in range(len(script)):
+            drive_player(player, script, frame)
+            player.update(script.delta_time)
+            player.camera.get_view_projection_matrix()
+    return run, len(script)
+
+
+@benchmark("camera.view_projection", "camera")
+def view_projection(context):
+    """Rebuild the view-projection matrix after every look update."""
+    camera = FPSCamera(position=np.array([0.0, 1.7, 0.0], dtype=np.float32))
+
+    def run():
+        for _ in range(context.frames):
+            camera.handle_mouse_movement(3.0, 0.5)
+            camera.get_view_projection_matrix()
+    return run, context.frames
+
+
+@benchmark("camera.predict_path", "camera")
+def predict_path(context):
+    """Predict the sprint path used for chunk prefetching."""
+    player = PlayerController()
+    player.keys_pressed = {'w': True}
+    player.is_sprinting = True
+
+    def run():
+        for _ in range(context.frames):
+            player.predict_path(0.8, 4)
+    return run, context.frames
@@ -0,0 +1,46 @@
+# benchmarks/bench_scene.py
+"""Whole-frame scene benchmarks; these need a GL context."""
+
+import numpy as np
+
+from benchmarks.bench_storage import chunk_parts, save_world
+from benchmarks.harness import benchmark
+from benchmarks.synthetic import drive_player, make_camera_script
+from infinitejournal.config import Config
+
+
+def _scene_benchmark(context, kind: str):
+    """Run Scene.update and Scene.render along a camera script."""
+    from OpenGL.GL import glFinish
+    from infinitejournal.world.scene import Scene
+
+    config = Config(save_directory=context.new_directory("scene"), profiler_enabled=False)
+    save_world(config.save_directory / "world", chunk_parts(context.journal))
+
+    scene = Scene(config)
+    scene.initialize()
+    scene.resize(640, 360)
+    script = make_camera_script(kind, context.frames, seed=context.seed)
+    start = np.array([0.0, 1.7, 0.0], dtype=np.float32)
+
+    def run():
+        scene.player.set_position(start)
+        scene.player.camera.velocity[:] = 0.0
+        for frame in range(len(script)):
+            drive_player(scene.player, script, frame)
+            scene.update(script.delta_time)
+            scene.render()
+        glFinish()
+    return run, len(script), scene.cleanup
+
+
+@benchmark("scene.walk", "scene", requires_gl=True)
+def scene_walk(context):
+    """Update and render the scene along a walk through the journal."""
+    return _scene_benchmark(context, 'walk')
+
+
+@benchmark("scene.sprint", "scene", requires_gl=True)
+def scene_sprint(context):
+    """Update and render the scene while sprinting, streaming chunks in."""
+    return _scene_benchmark(context, 'sprint')
@@ -0,0 +1,162 @@
+# benchmarks/bench_spatial.py
+"""Culling, bounding-box query and spatial index benchmarks."""
+
+import numpy as np
+
+from benchmarks.bench_strokes import filled_store
+from benchmarks.harness import benchmark
+from benchmarks.synthetic import drive_player, make_camera_script
+from infinitejournal.drawing.models.spatial import SpatialHashGrid
+from infinitejournal.tools.eraser import Eraser
+from infinitejournal.utilities.spatial import aabb_overlaps, ray_aabb_intersect
+from infinitejournal.world.chunks import ChunkManager
+from infinitejournal.world.culling import StrokeCuller
+from infinitejournal.world.player import PlayerController
+
+
+def path_matrices(context, kind: str) -> list:
+    """Get the view-projection matrices of a scripted camera path."""
+    script = make_camera_script(kind, context.frames, seed=context.seed)
+    player = PlayerController()
+    player.set_position(np.array([0.0, 1.7, 0.0], dtype=np.float32))
+    matrices = []
+    for frame in range(len(script)):
+        drive_player(player, script, frame)
+        player.update(script.delta_time)
+        matrices.append(player.get_view_projection_matrix().copy())
+    return matrices
+
+
+@benchmark("spatial.cull_path", "spatial")
+def cull_path(context):
+    """Frustum-cull the journal every frame of a camera path."""
+    store = filled_store(context.journal)
+    culler = StrokeCuller(store, ChunkManager())
+    matrices = path_matrices(context, 'look')
+    culler.cull(matrices[0])
+
+    def run():
+        for matrix in matrices:
+            culler.cull(matrix)
+    return run, len(matrices)
+
+
+@benchmark("spatial.cull_rebuild", "spatial")
+def cull_rebuild(context):
+    """Regroup every stroke by chunk, as after an edit."""
+    store = filled_store(context.journal)
+    culler = StrokeCuller(store, ChunkManager())
+    matrix = path_matrices(context, 'look')[0]
+
+    def run():
+        culler.invalidate()
+        culler.cull(matrix)
+    return run, len(store)
+
+
+@benchmark("spatial.box_queries", "spatial")
+def box_queries(context):
+    """Overlap tests of every stroke box against query boxes."""
+    store = filled_store(context.journal)
+    _, mins, maxs = store.get_all_bounds()
+    rng = np.random.default_rng(context.seed)
+    extent = context.journal.extent
+    centers = rng.uniform(-extent, extent, (64, 3)).astype(np.float32)
+
+    def run():
+        for center in centers:
+            aabb_overlaps(mins, maxs, center - 2.0, center + 2.0)
+    return run, len(centers) * len(mins)
+
+
+@benchmark("spatial.ray_picks", "spatial")
+def ray_picks(context):
+    """Slab-test picking rays against every stroke box."""
+    store = filled_store(context.journal)
+    _, mins, maxs = store.get_all_bounds()
+    rng = np.random.default_rng(context.seed)
+    directions = rng.normal(0.0, 1.0, (64, 3)).astype(np.float32)
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    origin = np.array([0.0, 1.7, 0.0], dtype=np.float32)
+
+    def run():
+        for direction in directions:
+            ray_aabb_intersect(origin, direction, mins, maxs)
+    return run, len(directions) * len(mins)
+
+
+@benchmark("spatial.index_build", "spatial")
+def index_build(context):
+    """Bulk-insert every stroke box into the spatial hash grid."""
+    store = filled_store(context.journal)
+
+    def run():
+        SpatialHashGrid.from_store(store)
+    return run, len(store)
+
+
+@benchmark("spatial.index_box_queries", "spatial")
+def index_box_queries(context):
+    """Box queries through the spatial hash grid."""
+    store = filled_store(context.journal)
+    index = SpatialHashGrid.from_store(store)
+    rng = np.random.default_rng(context.seed)
+    extent = context.journal.extent
+    centers = rng.uniform(-extent, extent, (64, 3)).astype(np.float32)
+
+    def run():
+        for center in centers:
+            index.query_aabb(center - 2.0, center + 2.0)
+    return run, len(centers)
+
+
+@benchmark("spatial.index_raycasts", "spatial")
+def index_raycasts(context):
+    """First-hit picking rays walked through the spatial hash grid."""
+    store = filled_store(context.journal)
+    index = SpatialHashGrid.from_store(store)
+    rng = np.random.default_rng(context.seed)
+    directions = rng.normal(0.0, 1.0, (64, 3)).astype(np.float32)
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    origin = np.array([0.0, 1.7, 0.0], dtype=np.float32)
+
+    def run():
+        for direction in directions:
+            index.raycast(origin, direction)
+    return run, len(directions)
+
+
+@benchmark("spatial.index_nearest", "spatial")
+def index_nearest(context):
+    """Nearest-stroke searches through the spatial hash grid."""
+    store = filled_store(context.journal)
+    index = SpatialHashGrid.from_store(store)
+    rng = np.random.default_rng(context.seed)
+    extent = context.journal.extent
+    points = rng.uniform(-extent, extent, (64, 3)).astype(np.float32)
+    points[:, 1] = rng.uniform(0.5, 3.0, len(points))
+
+    def run():
+        for point in points:
+            index.nearest(point, k=8)
+    return run, len(points)
+
+
+@benchmark("spatial.erase_sweeps", "spatial")
+def erase_sweeps(context):
+    """Drag the eraser across the journal, one path segment per frame."""
+    store = filled_store(context.journal)
+    eraser = Eraser(store, radius=0.25)
+    eraser.sync_index()
+    rng = np.random.default_rng(context.seed)
+    extent = context.journal.extent
+    frames = 60
+
+    def run():
+        # A fresh line every run, so earlier runs do not leave it empty
+        ends = rng.uniform(-extent, extent, (2, 3)).astype(np.float32)
+        ends[:, 1] = rng.uniform(0.5, 3.0)
+        path = ends[0] + (ends[1] - ends[0]) * np.linspace(0.0, 1.0, frames + 1)[:, None]
+        for frame in range(frames):
+            eraser.erase_path(path[frame:frame + 2])
+    return run, frames
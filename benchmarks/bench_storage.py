@@ -0,0 +1,110 @@
+# benchmarks/bench_storage.py
+"""Chunk serialization, write-ahead log and streaming benchmarks."""
+
+from benchmarks.harness import benchmark
+from infinitejournal.backends.opengl.renderer import build_chunk_vertices
+from infinitejournal.drawing.models.lod import level_tolerances
+from infinitejournal.storage.formats import decode_chunk, encode_chunk
+from infinitejournal.storage.world import WorldStorage
+
+CHUNK_SIZE = 32.0
+
+
+def chunk_parts(journal) -> list:
+    """Split a journal into (coord, ids, positions, lengths, pressures, colors) per chunk."""
+    return [(coord,) + journal.subset(indices)
+            for coord, indices in journal.chunk_groups(CHUNK_SIZE).items()]
+
+
+def save_world(directory, parts: list) -> WorldStorage:
+    """Log chunk parts to a new world and close it, compacting them into chunk files."""
+    storage = WorldStorage(directory)
+    storage.open()
+    for coord, ids, positions, lengths, pressures, colors in parts:
+        start = 0
+        for stroke_id, length in zip(ids.tolist(), lengths.tolist()):
+            end = start + length
+            storage.log_add(stroke_id, coord, positions[start:end], pressures[start:end],
+                            colors[start:end])
+            start = end
+    storage.close()
+    return storage
+
+
+def _encode_benchmark(context, quantize: bool):
+    parts = chunk_parts(context.journal)
+
+    def run():
+        for part in parts:
+            encode_chunk(*part, quantize=quantize)
+    return run, context.journal.point_count
+
+
+def _decode_benchmark(context, quantize: bool):
+    buffers = [encode_chunk(*part, quantize=quantize) for part in chunk_parts(context.journal)]
+
+    def run():
+        for buffer in buffers:
+            data = decode_chunk(buffer)
+            data.positions
+            data.colors
+    return run, context.journal.point_count
+
+
+@benchmark("storage.encode_chunks", "storage")
+def encode_chunks(context):
+    """Serialize every chunk of the journal."""
+    return _encode_benchmark(context, False)
+
+
+@benchmark("storage.encode_chunks_quantized", "storage")
+def encode_chunks_quantized(context):
+    """Serialize every chunk with quantized positions."""
+    return _encode_benchmark(context, True)
+
+
+@benchmark("storage.decode_chunks", "storage")
+def decode_chunks(context):
+    """Parse every chunk and read its positions and colors."""
+    return _decode_benchmark(context, False)
+
+
+@benchmark("storage.decode_chunks_quantized", "storage")
+def decode_chunks_quantized(context):
+    """Parse and dequantize every chunk."""
+    return _decode_benchmark(context, True)
+
+
+@benchmark("storage.log_and_compact", "storage", max_points=2_000_000)
+def log_and_compact(context):
+    """Log every stroke to a fresh world, then fold the log into chunk files."""
+    parts = chunk_parts(context.journal)
+
+    def run():
+        save_world(context.new_directory("world"), parts)
+    return run, context.journal.stroke_count
+
+
+@benchmark("storage.load_chunks", "storage")
+def load_chunks(context):
+    """Load every chunk from memory-mapped chunk files."""
+    parts = chunk_parts(context.journal)
+    storage = save_world(context.new_directory("world"), parts)
+    storage.open()
+
+    def run():
+        for part in parts:
+            storage.load_chunk(part[0])
+    return run, context.journal.point_count, storage.close
+
+
+@benchmark("streaming.build_vertices", "streaming")
+def build_vertices(context):
+    """Build the LOD vertex blocks of every chunk, as the loader threads do."""
+    parts = chunk_parts(context.journal)
+    tolerances = level_tolerances(4, 0.002)
+
+    def run():
+        for _, ids, positions, lengths, _, colors in parts:
+            build_chunk_vertices(ids, positions, lengths, colors, tolerances)
+    return run, context.journal.point_count
@@ -0,0 +1,105 @@
+# benchmarks/bench_strokes.py
+"""Stroke store and level-of-detail benchmarks."""
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from infinitejournal.drawing.models.curves import StrokeCurve
+from infinitejournal.drawing.models.lod import rdp_importance
+from infinitejournal.drawing.strokes import StrokeStore
+
+
+def filled_store(journal) -> StrokeStore:
+    """Get a store holding every stroke of a journal."""
+    store = StrokeStore()
+    store.add_strokes(journal.positions, journal.lengths, journal.pressures, journal.colors,
+                      journal.ids)
+    return store
+
+
+@benchmark("strokes.add_strokes", "strokes")
+def add_strokes(context):
+    """Bulk-add a whole journal, as chunk loading does."""
+    journal = context.journal
+
+    def run():
+        filled_store(journal)
+    return run, journal.point_count
+
+
+@benchmark("strokes.gather", "strokes")
+def gather(context):
+    """Gather every stroke back into flat arrays, as chunk unloading does."""
+    journal = context.journal
+    store = filled_store(journal)
+
+    def run():
+        store.gather(journal.ids)
+    return run, journal.point_count
+
+
+@benchmark("strokes.all_bounds", "strokes")
+def all_bounds(context):
+    """Read the bounds of every stroke."""
+    store = filled_store(context.journal)
+
+    def run():
+        store.get_all_bounds()
+    return run, len(store)
+
+
+@benchmark("strokes.churn", "strokes")
+def churn(context):
+    """Fill a store, remove every other stroke and compact it."""
+    journal = context.journal
+    removed = journal.ids[::2]
+
+    def run():
+        store = filled_store(journal)
+        store.remove_strokes(removed)
+        store.compact()
+    return run, journal.point_count
+
+
+@benchmark("strokes.live_drawing", "strokes")
+def live_drawing(context):
+    """Append points to open strokes a few at a time, as input arrives."""
+    rng = np.random.default_rng(context.seed)
+    points = rng.normal(0.0, 1.0, (4096, 3)).astype(np.float32)
+    strokes = 32
+
+    def run():
+        store = StrokeStore()
+        for _ in range(strokes):
+            stroke_id = store.begin_stroke().stroke_id
+            for start in range(0, len(points), 4):
+                store.append_points(stroke_id, points[start:start + 4])
+            store.end_stroke(stroke_id)
+    return run, strokes * len(points)
+
+
+@benchmark("strokes.live_curve", "strokes")
+def live_curve(context):
+    """Smooth and tessellate long strokes as their points arrive."""
+    rng = np.random.default_rng(context.seed)
+    points = np.cumsum(rng.normal(0.0, 0.01, (4096, 3)), axis=0).astype(np.float32)
+    normal = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+    strokes = 4
+
+    def run():
+        for _ in range(strokes):
+            curve = StrokeCurve(normal)
+            for start in range(0, len(points), 4):
+                curve.append(points[start:start + 4])
+            curve.finish()
+    return run, strokes * len(points)
+
+
+@benchmark("lod.rdp_importance", "lod", max_points=2_000_000)
+def importance(context):
+    """Rank the points of every stroke for the LOD pyramid."""
+    journal = context.journal
+
+    def run():
+        rdp_importance(journal.positions, journal.lengths, 0.002)
+    return run, journal.point_count
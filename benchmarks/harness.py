@@ -0,0 +1,236 @@
+# benchmarks/harness.py
+"""Benchmark registry, timing and JSON reports."""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark.
+
+    `setup(context)` does the untimed preparation and returns a zero
+    argument callable to time plus the number of items it processes,
+    optionally followed by a cleanup callable.
+    """
+
+    name: str
+    group: str
+    setup: Callable
+    requires_gl: bool = False
+    max_points: Optional[int] = None  # Skipped above this journal size
+
+
+@dataclass
+class Result:
+    """Timings of one benchmark, in seconds."""
+
+    name: str
+    group: str
+    params: dict = field(default_factory=dict)
+    repeat: int = 0
+    items: int = 0
+    min: float = 0.0
+    median: float = 0.0
+    mean: float = 0.0
+    stdev: float = 0.0
+    ns_per_item: float = 0.0
+    skipped: Optional[str] = None
+
+
+class Context:
+    """Inputs shared by the benchmarks of one run."""
+
+    def __init__(self, points: int, seed: int, frames: int, workdir: Path):
+        self.points = points
+        self.seed = seed
+        self.frames = frames
+        self.workdir = Path(workdir)
+        self.gl_available = False
+        self.gl_error: Optional[str] = None
+        self.gl_renderer: Optional[str] = None
+        self._journal = None
+        self._counter = 0
+
+    @property
+    def journal(self):
+        """Get the synthetic journal, generated on first use."""
+        if self._journal is None:
+            from benchmarks.synthetic import make_journal
+            self._journal = make_journal(self.points, self.seed)
+        return self._journal
+
+    def new_directory(self, prefix: str) -> Path:
+        """Get a fresh, empty directory under the work directory."""
+        self._counter += 1
+        path = self.workdir / f"{prefix}_{self._counter}"
+        path.mkdir(parents=True)
+        return path
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, group: str, requires_gl: bool = False,
+              max_points: Optional[int] = None):
+    """Register a benchmark setup function."""
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS.append(Benchmark(name, group, setup, requires_gl, max_points))
+        return setup
+    return register
+
+
+def time_benchmark(bench: Benchmark, context, repeat: int, warmup: int) -> Result:
+    """Run one benchmark and collect its timings."""
+    params = {'points': context.points, 'seed': context.seed}
+    if bench.requires_gl and not context.gl_available:
+        return Result(bench.name, bench.group, params, skipped=context.gl_error or "no GL context")
+    if bench.max_points is not None and context.points > bench.max_points:
+        return Result(bench.name, bench.group, params,
+                      skipped=f"journal larger than {bench.max_points} points")
+
+    run, items, *rest = bench.setup(context)
+    cleanup = rest[0] if rest else None
+
+    # Collect garbage between runs, not during them
+    times = []
+    gc_enabled = gc.isenabled()
+    try:
+        for _ in range(warmup):
+            run()
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+            if gc_enabled:
+                gc.enable()
+    finally:
+        if gc_enabled:
+            gc.enable()
+        if cleanup is not None:
+            cleanup()
+
+    median = statistics.median(times)
+    return Result(
+        name=bench.name,
+        group=bench.group,
+        params=params,
+        repeat=repeat,
+        items=items,
+        min=min(times),
+        median=median,
+        mean=statistics.fmean(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.0,
+        ns_per_item=median / items * 1e9 if items else 0.0
+    )
+
+
+# ----------------------------------------------------------------
+# GL context
+# ----------------------------------------------------------------
+
+def create_gl_context(width: int = 640, height: int = 360) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Try to open a hidden GL 3.3 core window.
+
+    Works with a real display, Xvfb or a software renderer such as Mesa's
+    llvmpipe. Returns (available, error, renderer name).
+    """
+    try:
+        import pygame
+        from OpenGL.GL import GL_RENDERER, glGetString
+
+        pygame.init()
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK,
+                                        pygame.GL_CONTEXT_PROFILE_CORE)
+        pygame.display.gl_set_attribute(pygame.GL_DEPTH_SIZE, 24)
+        pygame.display.set_mode((width, height),
+                                pygame.OPENGL | pygame.DOUBLEBUF | pygame.HIDDEN)
+        renderer = glGetString(GL_RENDERER)
+        if not renderer:
+            return False, "GL context has no renderer", None
+        return True, None, renderer.decode()
+    except Exception as e:
+        return False, f"GL unavailable: {e}", None
+
+
+def destroy_gl_context():
+    """Close the hidden window."""
+    try:
+        import pygame
+        pygame.display.quit()
+    except Exception:
+        pass
+
+
+# ----------------------------------------------------------------
+# Reports
+# ----------------------------------------------------------------
+
+def environment(context) -> dict:
+    """Describe the machine and revision a run was made on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'gl_renderer': context.gl_renderer,
+        'points': context.points,
+        'seed': context.seed
+    }
+
+
+def write_report(path: Path, meta: dict, results: List[Result]):
+    """Write results as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': [asdict(result) for result in results]}, f, indent=2)
+
+
+def load_report(path: Path) -> Dict[str, dict]:
+    """Load a report as {name: result}."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {result['name']: result for result in data['results']}
+
+
+def compare(baseline: Dict[str, dict], results: List[Result],
+            threshold: float) -> List[Tuple[str, float, float, float]]:
+    """Find benchmarks whose median slowed down by more than `threshold`.
+
+    Returns (name, baseline median, new median, ratio) for each regression.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if result.skipped or previous is None or previous.get('skipped'):
+            continue
+        if previous['params'].get('points') != result.params['points']:
+            continue
+        ratio = result.median / previous['median'] if previous['median'] > 0 else 1.0
+        if ratio > 1.0 + threshold:
+            regressions.append((result.name, previous['median'], result.median, ratio))
+    return regressions
@@ -0,0 +1,150 @@
+# benchmarks/synthetic.py
+"""Deterministic synthetic journals and scripted camera paths."""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class Journal:
+    """Strokes in the flat layout used by StrokeStore.add_strokes."""
+
+    ids: np.ndarray        # (S,) int64
+    positions: np.ndarray  # (N, 3) float32
+    lengths: np.ndarray    # (S,) int64
+    pressures: np.ndarray  # (N,) float32
+    colors: np.ndarray     # (N, 4) float32
+    extent: float          # Strokes lie in [-extent, extent] on x and z
+
+    @property
+    def point_count(self) -> int:
+        """Get the total number of points."""
+        return len(self.positions)
+
+    @property
+    def stroke_count(self) -> int:
+        """Get the number of strokes."""
+        return len(self.ids)
+
+    def chunk_groups(self, chunk_size: float) -> Dict[Tuple[int, int, int], np.ndarray]:
+        """Get the stroke indices owned by each chunk.
+
+        Like ChunkManager.assign_stroke, a stroke belongs to the chunk
+        holding the center of its bounding box.
+        """
+        starts = np.cumsum(self.lengths) - self.lengths
+        mins = np.minimum.reduceat(self.positions, starts, axis=0)
+        maxs = np.maximum.reduceat(self.positions, starts, axis=0)
+        coords = np.floor((mins + maxs) * 0.5 / chunk_size).astype(np.int64)
+        groups: Dict[Tuple[int, int, int], List[int]] = {}
+        for index, coord in enumerate(map(tuple, coords.tolist())):
+            groups.setdefault(coord, []).append(index)
+        return {coord: np.array(indices, dtype=np.int64) for coord, indices in groups.items()}
+
+    def subset(self, indices: np.ndarray) -> tuple:
+        """Get (ids, positions, lengths, pressures, colors) for some strokes."""
+        starts = np.cumsum(self.lengths) - self.lengths
+        lengths = self.lengths[indices]
+        rows = np.repeat(starts[indices] - (np.cumsum(lengths) - lengths), lengths)
+        rows += np.arange(int(lengths.sum()))
+        return (self.ids[indices], self.positions[rows], lengths, self.pressures[rows],
+                self.colors[rows])
+
+
+def make_journal(points: int, seed: int = 0, mean_length: int = 120,
+                 density: float = 40.0) -> Journal:
+    """Generate strokes totalling about `points` points.
+
+    Strokes are smoothed random walks scattered over a square whose area
+    grows with the point count, so every size has the same density of
+    `density` points per square world unit.
+    """
+    rng = np.random.default_rng(seed)
+    extent = math.sqrt(points / density) * 0.5
+
+    # Stroke lengths, trimmed so the total matches exactly
+    count = max(1, points // mean_length)
+    lengths = rng.integers(max(2, mean_length // 4), mean_length * 2, count).astype(np.int64)
+    lengths = np.maximum(2, np.round(lengths * (points / lengths.sum()))).astype(np.int64)
+    lengths[-1] = max(2, lengths[-1] + points - int(lengths.sum()))
+    total = int(lengths.sum())
+    starts = np.cumsum(lengths) - lengths
+
+    # Random walk steps with a drifting heading, restarted at each stroke
+    heading = np.cumsum(rng.normal(0.0, 0.15, total))
+    steps = np.empty((total, 3), dtype=np.float32)
+    steps[:, 0] = np.cos(heading) * 0.05
+    steps[:, 1] = rng.normal(0.0, 0.01, total)
+    steps[:, 2] = np.sin(heading) * 0.05
+    origins = np.empty((count, 3), dtype=np.float32)
+    origins[:, 0] = rng.uniform(-extent, extent, count)
+    origins[:, 1] = rng.uniform(0.5, 3.0, count)
+    origins[:, 2] = rng.uniform(-extent, extent, count)
+    steps[starts] = origins
+    positions = np.cumsum(steps, axis=0, dtype=np.float64)
+    positions -= np.repeat(positions[starts] - origins, lengths, axis=0)
+
+    pressures = rng.uniform(0.3, 1.0, total).astype(np.float32)
+    stroke_colors = rng.uniform(0.2, 1.0, (count, 4)).astype(np.float32)
+    stroke_colors[:, 3] = 1.0
+
+    return Journal(
+        ids=np.arange(1, count + 1, dtype=np.int64),
+        positions=positions.astype(np.float32),
+        lengths=lengths,
+        pressures=pressures,
+        colors=np.repeat(stroke_colors, lengths, axis=0),
+        extent=extent
+    )
+
+
+@dataclass
+class CameraScript:
+    """Per-frame player input: held keys and mouse movement."""
+
+    name: str
+    keys: List[dict]
+    mouse: np.ndarray  # (F, 2) mouse deltas in pixels
+    delta_time: float
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def make_camera_script(kind: str, frames: int, delta_time: float = 1.0 / 60.0,
+                       seed: int = 0) -> CameraScript:
+    """Build a scripted camera path.
+
+    `walk` strolls forward while looking around, `sprint` runs straight
+    ahead, `orbit` circles while strafing and `look` stands still and pans.
+    """
+    rng = np.random.default_rng(seed)
+    mouse = np.zeros((frames, 2), dtype=np.float32)
+    if kind == 'walk':
+        keys = [{'w': True} for _ in range(frames)]
+        mouse[:, 0] = np.sin(np.arange(frames) * 0.02) * 6.0
+        mouse[:, 1] = rng.normal(0.0, 0.5, frames)
+    elif kind == 'sprint':
+        keys = [{'w': True, 'shift': True} for _ in range(frames)]
+    elif kind == 'orbit':
+        keys = [{'w': True, 'd': True} for _ in range(frames)]
+        mouse[:, 0] = -4.0
+    elif kind == 'look':
+        keys = [{} for _ in range(frames)]
+        mouse[:, 0] = 12.0
+        mouse[:, 1] = np.sin(np.arange(frames) * 0.05) * 3.0
+    else:
+        raise ValueError(f"Unknown camera script: {kind}")
+    return CameraScript(kind, keys, mouse, delta_time)
+
+
+def drive_player(player, script: CameraScript, frame: int):
+    """Apply one scripted frame of input to a PlayerController."""
+    keys = script.keys[frame]
+    player.keys_pressed = dict(keys)
+    player.is_sprinting = keys.get('shift', False)
+    player.mouse_captured = True
+    player.mouse_delta = script.mouse[frame].astype(np.float64)
@@ -1,32 +1,27 @@
 """Infinite Journal - A 3D infinite drawing application."""
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "Your Name"
 
-# ===================================
-
-# src/infinitejournal/backends/__init__.py
-"""Rendering backends for Infinite Journal."""
-
-from infinitejournal.backends.opengl.backend import Backend
-from infinitejournal.backends.opengl.backend import OpenGLBackend
-
-__all__ = ["Backend", "OpenGLBackend"]
-
-# ===================================
-
-# src/infinitejournal/interface/__init__.py
-"""User interface components."""
-
-from infinitejournal.interface.framework import Application
-
-__all__ = ["Application"]
-
-# ===================================
-
-# src/infinitejournal/utilities/__init__.py
-"""Utility modules."""
-
-from infinitejournal.utilities.logging import setup_logging
-
-__all__ = ["setup_logging"]
+# Public names and the modules that define them. They are imported on first
+# access, so importing the package does not load pygame, PyOpenGL or numpy.
+_EXPORTS = {
+    "Backend": "infinitejournal.backends.opengl.backend",
+    "OpenGLBackend": "infinitejournal.backends.opengl.backend",
+    "Application": "infinitejournal.interface.framework",
+    "setup_logging": "infinitejournal.utilities.logging",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import a public name on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -27,9 +27,9 @@ class Backend(ABC):
         pass
         
     @abstractmethod
-    def handle_events(self):
-        """Handle window and input events."""
-        pass
+    def handle_events(self) -> list:
+        """Handle window events and return the ones left for the application."""
+        return []
         
     @abstractmethod
     def get_delta_time(self):
@@ -1,14 +1,24 @@
 """OpenGL backend implementation."""
 
 import logging
+import time
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 
 from infinitejournal.backends.base import Backend
+from infinitejournal.backends.opengl import glcalls
+from infinitejournal.backends.opengl.options import select_mode
 from infinitejournal.config import Config
 
+DEBUG_SEVERITIES = {
+    GL_DEBUG_SEVERITY_HIGH: logging.ERROR,
+    GL_DEBUG_SEVERITY_MEDIUM: logging.WARNING,
+    GL_DEBUG_SEVERITY_LOW: logging.INFO,
+    GL_DEBUG_SEVERITY_NOTIFICATION: logging.DEBUG,
+}
+
 
 class OpenGLBackend(Backend):
     """OpenGL rendering backend using Pygame."""
@@ -20,6 +30,10 @@ class OpenGLBackend(Backend):
         self.screen = None
         self.clock = None
         self.running = False
+        self.vsync_enabled = False
+        self.gl_mode = select_mode(config.gl_performance_mode, config.gl_debug)
+        self._debug_callback = None
+        self._last_time = None
         
     def initialize(self):
         """Initialize Pygame and OpenGL context."""
@@ -34,16 +48,11 @@ class OpenGLBackend(Backend):
         pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
         pygame.display.gl_set_attribute(pygame.GL_DOUBLEBUFFER, 1)
         pygame.display.gl_set_attribute(pygame.GL_DEPTH_SIZE, 24)
+        if self.gl_mode == "debug":
+            pygame.display.gl_set_attribute(pygame.GL_CONTEXT_FLAGS, pygame.GL_CONTEXT_DEBUG_FLAG)
         
         # Create window
-        flags = pygame.OPENGL | pygame.DOUBLEBUF
-        if self.config.fullscreen:
-            flags |= pygame.FULLSCREEN
-        
-        self.screen = pygame.display.set_mode(
-            (self.config.window_width, self.config.window_height),
-            flags
-        )
+        self._create_window()
         
         pygame.display.set_caption(self.config.window_title)
         
@@ -63,43 +72,103 @@ class OpenGLBackend(Backend):
         self.logger.info(f"OpenGL Version: {glGetString(GL_VERSION).decode()}")
         self.logger.info(f"OpenGL Renderer: {glGetString(GL_RENDERER).decode()}")
         
+        if self.gl_mode == "debug":
+            self._enable_debug_output()
+        elif self.gl_mode == "performance":
+            glcalls.use_direct_calls()
+        self.logger.info(f"GL mode: {self.gl_mode}"
+                         f"{' (direct calls)' if glcalls.direct else ''}")
+        
+    def _enable_debug_output(self):
+        """Log driver debug messages through a GL_KHR_debug callback.
+        
+        Synchronous output makes the driver report a message from inside
+        the call that caused it.
+        """
+        extensions = {glGetStringi(GL_EXTENSIONS, i).decode()
+                      for i in range(glGetIntegerv(GL_NUM_EXTENSIONS))}
+        version = glGetIntegerv(GL_MAJOR_VERSION) * 10 + glGetIntegerv(GL_MINOR_VERSION)
+        if version < 43 and 'GL_KHR_debug' not in extensions:
+            self.logger.warning("GL_KHR_debug is not supported; GL debug output is unavailable")
+            return
+            
+        logger = logging.getLogger("infinitejournal.gl")
+        
+        def callback(source, message_type, message_id, severity, length, message, user_param):
+            text = message.decode(errors='replace') if message else ''
+            logger.log(DEBUG_SEVERITIES.get(severity, logging.INFO),
+                       f"GL debug message {message_id}: {text}")
+            
+        # The callback must outlive the context, so keep a reference
+        self._debug_callback = GLDEBUGPROC(callback)
+        glEnable(GL_DEBUG_OUTPUT)
+        glEnable(GL_DEBUG_OUTPUT_SYNCHRONOUS)
+        glDebugMessageCallback(self._debug_callback, None)
+        
+    def _create_window(self):
+        """Create or recreate the window, with vsync if configured and supported."""
+        flags = pygame.OPENGL | pygame.DOUBLEBUF
+        if self.config.fullscreen:
+            flags |= pygame.FULLSCREEN
+        size = (self.config.window_width, self.config.window_height)
+        
+        vsync = self.config.vsync and not self.config.uncapped
+        if vsync:
+            try:
+                self.screen = pygame.display.set_mode(size, flags, vsync=1)
+                self.vsync_enabled = True
+                return
+            except (pygame.error, TypeError) as e:
+                self.logger.warning(f"VSync unavailable, pacing with target_fps instead: {e}")
+        self.screen = pygame.display.set_mode(size, flags)
+        self.vsync_enabled = False
+        
     def clear(self):
         """Clear the screen."""
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glcalls.clear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         
     def present(self):
         """Present the rendered frame."""
         pygame.display.flip()
         
-    def handle_events(self):
-        """Handle window events."""
+    def handle_events(self) -> list:
+        """Handle window events and return the ones left for the application."""
+        unhandled = []
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.running = False
-                elif event.key == pygame.K_F11:
-                    self.toggle_fullscreen()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+                self.toggle_fullscreen()
+            else:
+                unhandled.append(event)
+        return unhandled
     
     def toggle_fullscreen(self):
         """Toggle fullscreen mode."""
         self.config.fullscreen = not self.config.fullscreen
-        flags = pygame.OPENGL | pygame.DOUBLEBUF
-        if self.config.fullscreen:
-            flags |= pygame.FULLSCREEN
-        
-        self.screen = pygame.display.set_mode(
-            (self.config.window_width, self.config.window_height),
-            flags
-        )
+        self._create_window()
         
         # Reset viewport
         glViewport(0, 0, self.config.window_width, self.config.window_height)
         
     def get_delta_time(self):
-        """Get time since last frame in seconds."""
-        return self.clock.tick(self.config.target_fps) / 1000.0
+        """Pace the frame and get the time since the last one in seconds.
+        
+        Frames are capped at target_fps unless vsync paces them or
+        rendering is uncapped.
+        """
+        if self.config.uncapped or self.vsync_enabled:
+            self.clock.tick()
+        else:
+            self.clock.tick(self.config.target_fps)
+            
+        # clock.tick only has millisecond resolution
+        now = time.perf_counter()
+        delta_time = now - self._last_time if self._last_time is not None else 0.0
+        self._last_time = now
+        return delta_time
         
     def shutdown(self):
         """Shutdown the backend."""
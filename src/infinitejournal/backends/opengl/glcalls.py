@@ -0,0 +1,161 @@
+# src/infinitejournal/backends/opengl/glcalls.py
+"""GL calls made every frame, with an optional direct path.
+
+By default these go through PyOpenGL's wrappers, which look up an array
+handler for each argument and convert it. use_direct_calls() rebinds them
+to ctypes functions built once over the same driver entry points, taking
+plain integers and the data addresses of NumPy arrays. Callers pass
+C-contiguous arrays of the GL type (int32 firsts/counts, float32 data),
+which is what the wrappers expect anyway.
+
+Call these through the module (glcalls.draw_arrays(...)) so the rebinding
+is seen.
+"""
+
+import ctypes
+import logging
+
+from OpenGL import platform
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION import GL_1_0, GL_1_1, GL_1_4, GL_1_5, GL_2_0, GL_3_0
+
+logger = logging.getLogger(__name__)
+
+# Array arguments of the direct functions: the data address as an integer.
+# Not c_void_p, which PyOpenGL would turn back into an array argument.
+ADDRESS = ctypes.c_size_t
+
+direct = False
+
+
+def use_program(program: int):
+    glUseProgram(program)
+
+
+def bind_vertex_array(vao: int):
+    glBindVertexArray(vao)
+
+
+def bind_buffer(target: int, buffer: int):
+    glBindBuffer(target, buffer)
+
+
+def buffer_sub_data(target: int, offset: int, data):
+    """Upload a contiguous array into the bound buffer at a byte offset."""
+    glBufferSubData(target, offset, data.nbytes, data)
+
+
+def draw_arrays(mode: int, first: int, count: int):
+    glDrawArrays(mode, first, count)
+
+
+def multi_draw_arrays(mode: int, firsts, counts):
+    """Draw len(firsts) ranges given as int32 arrays."""
+    glMultiDrawArrays(mode, firsts, counts, len(firsts))
+
+
+def uniform_1f(location: int, value: float):
+    glUniform1f(location, value)
+
+
+def uniform_3fv(location: int, value):
+    """Set a vec3 uniform from a float32 array."""
+    glUniform3fv(location, 1, value)
+
+
+def uniform_matrix4fv(location: int, value):
+    """Set a mat4 uniform from a column-major float32 array."""
+    glUniformMatrix4fv(location, 1, GL_FALSE, value)
+
+
+def clear(mask: int):
+    glClear(mask)
+
+
+def enable(capability: int):
+    glEnable(capability)
+
+
+def disable(capability: int):
+    glDisable(capability)
+
+
+def _build(function, *argtypes):
+    """Build a plain ctypes function for a PyOpenGL raw GL function.
+
+    Resolution goes through PyOpenGL's platform, so the entry point is
+    the one its wrapper calls. Returns None if it cannot be resolved.
+    """
+    try:
+        return platform.PLATFORM.constructFunction(
+            function.__name__, function.DLL,
+            resultType=function.restype,
+            argTypes=argtypes or function.argtypes,
+            extension=function.extension,
+            force_extension=getattr(function, 'force_extension', False),
+        )
+    except (AttributeError, TypeError) as e:
+        logger.debug(f"No direct entry point for {function.__name__}: {e}")
+        return None
+
+
+def use_direct_calls() -> bool:
+    """Route the calls above through direct ctypes functions.
+
+    Needs a current context. Functions that cannot be resolved keep their
+    PyOpenGL wrappers. Returns True if every call was rebound.
+    """
+    global direct, use_program, bind_vertex_array, bind_buffer, buffer_sub_data
+    global draw_arrays, multi_draw_arrays, uniform_1f, uniform_3fv, uniform_matrix4fv
+    global clear, enable, disable
+
+    c_use_program = _build(GL_2_0.glUseProgram)
+    c_bind_vertex_array = _build(GL_3_0.glBindVertexArray)
+    c_bind_buffer = _build(GL_1_5.glBindBuffer)
+    c_buffer_sub_data = _build(GL_1_5.glBufferSubData, ctypes.c_uint, ctypes.c_ssize_t,
+                               ctypes.c_ssize_t, ADDRESS)
+    c_draw_arrays = _build(GL_1_1.glDrawArrays)
+    c_multi_draw_arrays = _build(GL_1_4.glMultiDrawArrays, ctypes.c_uint, ADDRESS, ADDRESS,
+                                 ctypes.c_int)
+    c_uniform_1f = _build(GL_2_0.glUniform1f)
+    c_uniform_3fv = _build(GL_2_0.glUniform3fv, ctypes.c_int, ctypes.c_int, ADDRESS)
+    c_uniform_matrix4fv = _build(GL_2_0.glUniformMatrix4fv, ctypes.c_int, ctypes.c_int,
+                                 ctypes.c_ubyte, ADDRESS)
+    c_clear = _build(GL_1_0.glClear)
+    c_enable = _build(GL_1_0.glEnable)
+    c_disable = _build(GL_1_0.glDisable)
+
+    # Plain functions can be used as they are; array arguments pass the
+    # array's data address
+    use_program = c_use_program or use_program
+    bind_vertex_array = c_bind_vertex_array or bind_vertex_array
+    bind_buffer = c_bind_buffer or bind_buffer
+    draw_arrays = c_draw_arrays or draw_arrays
+    uniform_1f = c_uniform_1f or uniform_1f
+    clear = c_clear or clear
+    enable = c_enable or enable
+    disable = c_disable or disable
+
+    if c_buffer_sub_data:
+        def buffer_sub_data(target, offset, data):
+            c_buffer_sub_data(target, offset, data.nbytes, data.ctypes.data)
+
+    if c_multi_draw_arrays:
+        def multi_draw_arrays(mode, firsts, counts):
+            c_multi_draw_arrays(mode, firsts.ctypes.data, counts.ctypes.data, len(firsts))
+
+    if c_uniform_3fv:
+        def uniform_3fv(location, value):
+            c_uniform_3fv(location, 1, value.ctypes.data)
+
+    if c_uniform_matrix4fv:
+        def uniform_matrix4fv(location, value):
+            c_uniform_matrix4fv(location, 1, GL_FALSE, value.ctypes.data)
+
+    built = (c_use_program, c_bind_vertex_array, c_bind_buffer, c_buffer_sub_data,
+             c_draw_arrays, c_multi_draw_arrays, c_uniform_1f, c_uniform_3fv,
+             c_uniform_matrix4fv, c_clear, c_enable, c_disable)
+    direct = all(built)
+    if not direct:
+        logger.info(f"{sum(1 for f in built if not f)} hot GL calls keep their PyOpenGL wrappers")
+    return direct
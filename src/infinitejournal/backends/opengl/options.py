@@ -0,0 +1,49 @@
+# src/infinitejournal/backends/opengl/options.py
+"""PyOpenGL global flags for the performance and debug modes.
+
+PyOpenGL reads its flags while OpenGL.GL is first imported, when it
+builds its function wrappers, so configure_pyopengl() must run before
+anything imports OpenGL.GL. This module only imports the top-level
+OpenGL package for that reason.
+"""
+
+import logging
+import sys
+
+import OpenGL
+
+logger = logging.getLogger(__name__)
+
+
+def select_mode(performance: bool, debug: bool) -> str:
+    """Get the GL mode for the config flags; debug wins over performance."""
+    if debug:
+        return "debug"
+    if performance:
+        return "performance"
+    return "default"
+
+
+def configure_pyopengl(performance: bool, debug: bool = False) -> str:
+    """Set PyOpenGL's global flags; returns the selected mode.
+
+    performance: no glGetError after every call, no error logging and no
+        array size checks. GL errors are then only reported by a debug
+        context, so this is the release setting.
+    debug: PyOpenGL's per-call error checking is kept and the backend
+        also logs driver messages through GL_KHR_debug.
+    default: PyOpenGL's own defaults.
+    """
+    mode = select_mode(performance, debug)
+    if 'OpenGL.GL' in sys.modules:
+        logger.warning(f"OpenGL.GL was imported before configuring PyOpenGL; "
+                       f"the {mode} mode may only partly apply")
+
+    if mode == "performance":
+        OpenGL.ERROR_CHECKING = False
+        OpenGL.ERROR_LOGGING = False
+        OpenGL.CONTEXT_CHECKING = False
+        OpenGL.ARRAY_SIZE_CHECKING = False
+    elif mode == "debug":
+        OpenGL.ERROR_CHECKING = True
+    return mode
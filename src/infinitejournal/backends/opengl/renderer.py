@@ -0,0 +1,645 @@
+# src/infinitejournal/backends/opengl/renderer.py
+"""Batched stroke renderer using persistent per-chunk vertex buffers."""
+
+import bisect
+import ctypes
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from OpenGL.GL import *
+
+from infinitejournal.backends.opengl import glcalls
+from infinitejournal.backends.opengl.shaders import ShaderManager
+from infinitejournal.drawing.models.lod import LODSelector, build_levels, level_tolerances, rdp_importance
+from infinitejournal.drawing.strokes import StrokeStore
+from infinitejournal.world.chunks import ChunkCoord, ChunkManager
+
+
+class ChunkVertices:
+    """Vertex data of many strokes prepared for a single upload.
+    
+    Strokes are laid out back to back, each as its LOD pyramid levels back
+    to back. Built off the GL thread by `build_chunk_vertices`.
+    """
+    
+    __slots__ = ('stroke_ids', 'positions', 'colors', 'firsts', 'level_counts', 'spheres')
+    
+    def __init__(self, stroke_ids: np.ndarray, positions: np.ndarray, colors: np.ndarray,
+                 firsts: np.ndarray, level_counts: np.ndarray, spheres: np.ndarray):
+        self.stroke_ids = stroke_ids
+        self.positions = positions
+        self.colors = colors
+        self.firsts = firsts  # (n,) first vertex of each stroke
+        self.level_counts = level_counts  # (n, levels) vertices per level
+        self.spheres = spheres  # (n, 4) bounding sphere center and radius
+        
+    @property
+    def nbytes(self) -> int:
+        """Get the size of the vertex data."""
+        return self.positions.nbytes + self.colors.nbytes
+
+
+def build_chunk_vertices(stroke_ids: np.ndarray, positions: np.ndarray, lengths: np.ndarray,
+                         colors: np.ndarray, tolerances: np.ndarray) -> ChunkVertices:
+    """Build the LOD vertex layout of many strokes without touching OpenGL.
+    
+    Pure NumPy, so it can run on a loader thread.
+    """
+    stroke_ids = np.asarray(stroke_ids, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    colors = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    count = len(stroke_ids)
+    levels = len(tolerances)
+    if count == 0:
+        return ChunkVertices(stroke_ids, positions[:0], colors[:0], np.zeros(0, dtype=np.int64),
+                             np.zeros((0, levels), dtype=np.int64),
+                             np.zeros((0, 4), dtype=np.float32))
+                             
+    starts = np.cumsum(lengths) - lengths
+    owners = np.repeat(np.arange(count), lengths)
+    
+    # Points kept at each level
+    keeps = [np.ones(len(positions), dtype=bool)]
+    if levels > 1:
+        importance = rdp_importance(positions, lengths, tolerances[1])
+        keeps += [importance > tolerance for tolerance in tolerances[1:]]
+        
+    level_counts = np.stack([np.add.reduceat(keep.astype(np.int64), starts) for keep in keeps],
+                            axis=1)
+    totals = level_counts.sum(axis=1)
+    firsts = np.cumsum(totals) - totals
+    level_firsts = firsts[:, None] + np.cumsum(level_counts, axis=1) - level_counts
+    
+    # Scatter every kept point to its slot in its stroke's level
+    index = np.empty(int(totals.sum()), dtype=np.int64)
+    for level, keep in enumerate(keeps):
+        kept = np.flatnonzero(keep)
+        running = np.cumsum(keep)
+        before = running[starts] - keep[starts]
+        stroke = owners[kept]
+        index[level_firsts[stroke, level] + running[kept] - 1 - before[stroke]] = kept
+        
+    bounds_min = np.minimum.reduceat(positions, starts, axis=0)
+    bounds_max = np.maximum.reduceat(positions, starts, axis=0)
+    extent = (bounds_max - bounds_min) * 0.5
+    spheres = np.empty((count, 4), dtype=np.float32)
+    spheres[:, :3] = (bounds_min + bounds_max) * 0.5
+    spheres[:, 3] = np.sqrt(extent[:, 0] ** 2 + extent[:, 1] ** 2 + extent[:, 2] ** 2)
+    
+    return ChunkVertices(stroke_ids, positions[index], colors[index], firsts, level_counts,
+                         spheres)
+
+
+class StrokeBatch:
+    """Packs the strokes of one chunk into a pair of large vertex buffers.
+    
+    Positions and colors live in separate VBOs so a stroke's slices of the
+    stroke store can be uploaded as they are, without interleaving. Each
+    stroke occupies a [first, first + reserved) range of vertices, handed
+    out first-fit from a free list. Changes are written with sub-range
+    uploads, and the buffers are only reallocated (and copied on the GPU)
+    when they run out of room.
+    
+    A stroke's range holds every level of its decimation pyramid back to
+    back, so drawing at a coarser level only changes which sub-range is
+    submitted.
+    """
+    
+    POSITION_STRIDE = 3 * 4
+    COLOR_STRIDE = 4 * 4
+    
+    def __init__(self, capacity: int = 4096, levels: int = 1):
+        """Initialize an empty batch; GL objects are created lazily."""
+        self.capacity = max(1, capacity)
+        self.levels = max(1, levels)
+        self.vao = None
+        self.position_vbo = None
+        self.color_vbo = None
+        
+        self._top = 0  # End of the highest allocated range
+        self._free: List[List[int]] = []  # Sorted [first, count] holes below _top
+        self._entries: Dict[int, Tuple] = {}  # id -> (first, reserved, level counts, sphere)
+        
+        # Sorted lookup arrays for vectorized draws, rebuilt on demand
+        self._lookup_ids = np.zeros(0, dtype=np.int64)
+        self._lookup_firsts = np.zeros((0, self.levels), dtype=np.int32)
+        self._lookup_counts = np.zeros((0, self.levels), dtype=np.int32)
+        self._lookup_spheres = np.zeros((0, 4), dtype=np.float32)
+        self._lookup_dirty = False
+        
+    @property
+    def nbytes(self) -> int:
+        """Get the GPU memory held by the batch's buffers."""
+        return self.capacity * (self.POSITION_STRIDE + self.COLOR_STRIDE)
+        
+    def __contains__(self, stroke_id: int) -> bool:
+        return stroke_id in self._entries
+        
+    def __len__(self) -> int:
+        return len(self._entries)
+        
+    def stroke_ids(self) -> List[int]:
+        """Get the ids of all strokes in the batch."""
+        return list(self._entries)
+        
+    def create(self):
+        """Create the VAO and vertex buffers."""
+        self.vao = glGenVertexArrays(1)
+        self.position_vbo, self.color_vbo = self._allocate_buffers(self.capacity)
+        self._bind_attributes()
+        
+    def upload(self, stroke_id: int, positions: np.ndarray, colors: np.ndarray,
+               level_counts: Optional[np.ndarray] = None, slack: float = 0.0) -> int:
+        """Write a stroke's vertices, reusing its range if it still fits.
+        
+        `positions` and `colors` hold the pyramid levels back to back with
+        `level_counts` points each; without counts the stroke has a single
+        level used at every distance. `slack` reserves extra room for
+        strokes that are still growing. Returns the number of bytes
+        uploaded.
+        """
+        count = len(positions)
+        if level_counts is None:
+            level_counts = np.array([count], dtype=np.int64)
+            
+        entry = self._entries.get(stroke_id)
+        if entry is not None and count <= entry[1]:
+            first, reserved = entry[0], entry[1]
+        else:
+            if entry is not None:
+                self._release(entry[0], entry[1])
+            reserved = count + int(count * slack)
+            first = self._allocate(reserved)
+            
+        # Bounding sphere of the finest level, for level selection
+        bounds_min = positions[:level_counts[0]].min(axis=0)
+        bounds_max = positions[:level_counts[0]].max(axis=0)
+        center = (bounds_min + bounds_max) * 0.5
+        radius = float(np.linalg.norm(bounds_max - center))
+        
+        self._entries[stroke_id] = (first, reserved, level_counts, (*center, radius))
+        self._lookup_dirty = True
+        return self._write_vertices(first, positions, colors)
+        
+    def upload_block(self, vertices: ChunkVertices) -> int:
+        """Write many prepared strokes with one upload per buffer.
+        
+        Returns the number of bytes uploaded.
+        """
+        for stroke_id in vertices.stroke_ids.tolist():
+            self.remove(stroke_id)
+        total = len(vertices.positions)
+        if total == 0:
+            return 0
+            
+        base = self._allocate(total)
+        reserved = np.diff(np.append(vertices.firsts, total))
+        for stroke_id, first, size, counts, sphere in zip(
+                vertices.stroke_ids.tolist(), (vertices.firsts + base).tolist(),
+                reserved.tolist(), vertices.level_counts, vertices.spheres.tolist()):
+            self._entries[stroke_id] = (first, size, counts, tuple(sphere))
+        self._lookup_dirty = True
+        return self._write_vertices(base, vertices.positions, vertices.colors)
+        
+    def remove(self, stroke_id: int):
+        """Free a stroke's vertex range."""
+        entry = self._entries.pop(stroke_id, None)
+        if entry is not None:
+            self._release(entry[0], entry[1])
+            self._lookup_dirty = True
+            
+    def draw(self, stroke_ids: np.ndarray, lod: Optional[LODSelector] = None,
+             mode=GL_LINE_STRIP) -> int:
+        """Draw the given strokes with a single multi-draw call.
+        
+        With a selector each stroke is drawn at the level matching its
+        screen size, otherwise at full detail. Returns the number of
+        strokes drawn.
+        """
+        firsts, counts, spheres = self._lookup(stroke_ids)
+        if len(firsts) == 0:
+            return 0
+            
+        if lod is not None and self.levels > 1:
+            levels = np.minimum(lod.select(spheres[:, :3], spheres[:, 3]), self.levels - 1)
+            rows = np.arange(len(levels))
+            firsts = np.ascontiguousarray(firsts[rows, levels])
+            counts = np.ascontiguousarray(counts[rows, levels])
+        else:
+            firsts = np.ascontiguousarray(firsts[:, 0])
+            counts = np.ascontiguousarray(counts[:, 0])
+            
+        glcalls.bind_vertex_array(self.vao)
+        glcalls.multi_draw_arrays(mode, firsts, counts)
+        glcalls.bind_vertex_array(0)
+        return len(firsts)
+        
+    def delete(self):
+        """Delete the batch's GL objects."""
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+        if self.position_vbo:
+            glDeleteBuffers(2, [self.position_vbo, self.color_vbo])
+        self.vao = self.position_vbo = self.color_vbo = None
+        self._entries.clear()
+        
+    def _lookup(self, stroke_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Map stroke ids to per-level (firsts, counts) and bounding spheres.
+        
+        Unknown and empty strokes are skipped.
+        """
+        if self._lookup_dirty:
+            self._rebuild_lookup()
+            
+        if len(self._lookup_ids) == 0:
+            return self._lookup_firsts, self._lookup_counts, self._lookup_spheres
+        index = np.searchsorted(self._lookup_ids, stroke_ids)
+        index = np.minimum(index, len(self._lookup_ids) - 1)
+        found = (self._lookup_ids[index] == stroke_ids) & (self._lookup_counts[index, 0] > 0)
+        index = index[found]
+        return self._lookup_firsts[index], self._lookup_counts[index], self._lookup_spheres[index]
+        
+    def _rebuild_lookup(self):
+        """Rebuild the sorted lookup arrays from the entries."""
+        n = len(self._entries)
+        ids = np.fromiter(self._entries, dtype=np.int64, count=n)
+        firsts = np.zeros((n, self.levels), dtype=np.int32)
+        counts = np.zeros((n, self.levels), dtype=np.int32)
+        spheres = np.zeros((n, 4), dtype=np.float32)
+        
+        for row, (first, _, level_counts, sphere) in enumerate(self._entries.values()):
+            # Strokes with fewer levels reuse their coarsest one
+            level_counts = level_counts[:self.levels]
+            offsets = first + np.cumsum(level_counts) - level_counts
+            firsts[row, :len(offsets)] = offsets
+            firsts[row, len(offsets):] = offsets[-1]
+            counts[row, :len(level_counts)] = level_counts
+            counts[row, len(level_counts):] = level_counts[-1]
+            spheres[row] = sphere
+            
+        order = np.argsort(ids)
+        self._lookup_ids = ids[order]
+        self._lookup_firsts = firsts[order]
+        self._lookup_counts = counts[order]
+        self._lookup_spheres = spheres[order]
+        self._lookup_dirty = False
+        
+    def _write_vertices(self, first: int, positions: np.ndarray, colors: np.ndarray) -> int:
+        """Upload vertex data starting at a vertex index."""
+        positions = np.ascontiguousarray(positions, dtype=np.float32)
+        colors = np.ascontiguousarray(colors, dtype=np.float32)
+        glcalls.bind_buffer(GL_ARRAY_BUFFER, self.position_vbo)
+        glcalls.buffer_sub_data(GL_ARRAY_BUFFER, first * self.POSITION_STRIDE, positions)
+        glcalls.bind_buffer(GL_ARRAY_BUFFER, self.color_vbo)
+        glcalls.buffer_sub_data(GL_ARRAY_BUFFER, first * self.COLOR_STRIDE, colors)
+        glcalls.bind_buffer(GL_ARRAY_BUFFER, 0)
+        return positions.nbytes + colors.nbytes
+        
+    def _allocate(self, count: int) -> int:
+        """Reserve `count` vertices, growing the buffers if needed."""
+        for i, (first, size) in enumerate(self._free):
+            if size >= count:
+                if size == count:
+                    del self._free[i]
+                else:
+                    self._free[i] = [first + count, size - count]
+                return first
+                
+        if self._top + count > self.capacity:
+            capacity = self.capacity
+            while capacity < self._top + count:
+                capacity *= 2
+            self._grow(capacity)
+            
+        first = self._top
+        self._top += count
+        return first
+        
+    def _release(self, first: int, count: int):
+        """Return a vertex range to the free list, merging neighbours."""
+        if count == 0:
+            return
+        if first + count == self._top:
+            self._top = first
+        else:
+            index = bisect.bisect(self._free, [first, count])
+            self._free.insert(index, [first, count])
+            # Merge with the following hole, then the preceding one
+            if index + 1 < len(self._free) and first + count == self._free[index + 1][0]:
+                self._free[index][1] += self._free.pop(index + 1)[1]
+            if index > 0 and self._free[index - 1][0] + self._free[index - 1][1] == first:
+                self._free[index - 1][1] += self._free.pop(index)[1]
+                
+        # Holes that now touch the top are not holes anymore
+        while self._free and self._free[-1][0] + self._free[-1][1] == self._top:
+            self._top = self._free.pop()[0]
+            
+    def _grow(self, capacity: int):
+        """Reallocate the buffers with a larger capacity, copying on the GPU."""
+        old_position, old_color = self.position_vbo, self.color_vbo
+        new_position, new_color = self._allocate_buffers(capacity)
+        
+        for source, target, stride in ((old_position, new_position, self.POSITION_STRIDE),
+                                       (old_color, new_color, self.COLOR_STRIDE)):
+            glBindBuffer(GL_COPY_READ_BUFFER, source)
+            glBindBuffer(GL_COPY_WRITE_BUFFER, target)
+            glCopyBufferSubData(GL_COPY_READ_BUFFER, GL_COPY_WRITE_BUFFER, 0, 0,
+                                self._top * stride)
+        glBindBuffer(GL_COPY_READ_BUFFER, 0)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, 0)
+        glDeleteBuffers(2, [old_position, old_color])
+        
+        self.position_vbo, self.color_vbo = new_position, new_color
+        self.capacity = capacity
+        self._bind_attributes()
+        
+    def _allocate_buffers(self, capacity: int) -> Tuple[int, int]:
+        """Create uninitialized position and color buffers."""
+        position_vbo, color_vbo = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, position_vbo)
+        glBufferData(GL_ARRAY_BUFFER, capacity * self.POSITION_STRIDE, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, color_vbo)
+        glBufferData(GL_ARRAY_BUFFER, capacity * self.COLOR_STRIDE, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return int(position_vbo), int(color_vbo)
+        
+    def _bind_attributes(self):
+        """Point the VAO's attributes at the current buffers."""
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.position_vbo)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_vbo)
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+
+class StrokeRenderer:
+    """Draws strokes from per-chunk batches, one multi-draw call per chunk."""
+    
+    VERTEX_SHADER = """
+    #version 330 core
+    
+    layout(location = 0) in vec3 aPos;
+    layout(location = 1) in vec4 aColor;
+    
+    uniform mat4 viewProjection;
+    
+    out vec4 vertexColor;
+    
+    void main() {
+        vertexColor = aColor;
+        gl_Position = viewProjection * vec4(aPos, 1.0);
+    }
+    """
+    
+    FRAGMENT_SHADER = """
+    #version 330 core
+    
+    in vec4 vertexColor;
+    
+    out vec4 FragColor;
+    
+    void main() {
+        FragColor = vertexColor;
+    }
+    """
+    
+    def __init__(self, batch_capacity: int = 16384, lod_levels: int = 4,
+                 lod_tolerance: float = 0.002, lod_pixel_error: float = 1.0,
+                 shaders: Optional[ShaderManager] = None):
+        """Initialize the renderer; GL objects are created in initialize()."""
+        self.logger = logging.getLogger(__name__)
+        self.shaders = shaders if shaders is not None else ShaderManager()
+        self.batch_capacity = batch_capacity
+        
+        # Level of detail: each level quadruples the tolerance of the last
+        self.lod = LODSelector(level_tolerances(lod_levels, lod_tolerance), lod_pixel_error)
+        self.viewport_height = 720
+        
+        self.shader_program = None
+        self.uniforms = None
+        
+        self._batches: Dict[ChunkCoord, StrokeBatch] = {}
+        self._stroke_chunks: Dict[int, ChunkCoord] = {}
+        self._adopted: Dict[int, int] = {}  # Stroke id -> revision already on the GPU
+        self._synced_revision = -1
+        
+        # Statistics of the current frame
+        self.draw_calls = 0
+        self.strokes_drawn = 0
+        self.bytes_uploaded = 0
+        
+        self._initialized = False
+        
+    def initialize(self):
+        """Initialize OpenGL resources."""
+        if self._initialized:
+            return
+            
+        try:
+            self.shader_program = self.shaders.get_program(self.VERTEX_SHADER, self.FRAGMENT_SHADER)
+            self.uniforms = self.shaders.get_uniforms(self.shader_program, ['viewProjection'])
+            self._initialized = True
+            self.logger.info("Stroke renderer initialized successfully")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to initialize stroke renderer: {e}")
+            raise
+            
+    def sync(self, store: StrokeStore, chunk_manager: ChunkManager):
+        """Upload strokes that changed in the store since the last sync."""
+        if store.revision == self._synced_revision:
+            return
+        if not self._initialized:
+            self.initialize()
+            
+        removed = store.removed_since(self._synced_revision)
+        if removed is None:
+            # Too far behind to catch up incrementally; start over
+            for batch in self._batches.values():
+                for stroke_id in batch.stroke_ids():
+                    batch.remove(stroke_id)
+            self._stroke_chunks.clear()
+            self._adopted.clear()
+            removed = np.zeros(0, dtype=np.int64)
+            changed = store.stroke_ids()
+        else:
+            changed = store.changed_since(self._synced_revision)
+            
+        for stroke_id in removed.tolist():
+            if stroke_id in self._adopted and stroke_id in store:
+                continue
+            coord = self._stroke_chunks.pop(stroke_id, None)
+            if coord is not None and coord in self._batches:
+                self._batches[coord].remove(stroke_id)
+                
+        # Strokes of adopted batches are on the GPU already
+        changed = changed.tolist()
+        if self._adopted:
+            changed = [stroke_id for stroke_id in changed
+                       if self._adopted.get(stroke_id) != store.get_revision(stroke_id)]
+            self._adopted.clear()
+            
+        # Strokes still being drawn are shown by the live preview and only
+        # enter the batches once they end. Rank the points of finished
+        # strokes for their LOD pyramids in one pass.
+        finished = [stroke_id for stroke_id in changed if not store.is_open(stroke_id)]
+        importance = {}
+        if finished and self.lod.levels > 1:
+            positions, lengths, _, _ = store.gather(np.array(finished, dtype=np.int64))
+            starts = np.cumsum(lengths) - lengths
+            ranks = rdp_importance(positions, lengths, self.lod.tolerances[1])
+            for stroke_id, start, length in zip(finished, starts.tolist(), lengths.tolist()):
+                importance[stroke_id] = ranks[start:start + length]
+                
+        for stroke_id in finished:
+            self._upload_stroke(store, chunk_manager, stroke_id, importance.get(stroke_id))
+            
+        self._synced_revision = store.revision
+        
+    def render(self, camera, visible_strokes: Dict[ChunkCoord, np.ndarray]):
+        """Draw the visible strokes of every chunk."""
+        if not visible_strokes:
+            return
+        if not self._initialized:
+            self.initialize()
+            
+        glcalls.use_program(self.shader_program)
+        self.uniforms.set_matrix4('viewProjection', camera.get_view_projection_matrix())
+        self.lod.update(camera, self.viewport_height)
+        
+        for coord, stroke_ids in visible_strokes.items():
+            batch = self._batches.get(coord)
+            if batch is None:
+                continue
+            drawn = batch.draw(stroke_ids, self.lod)
+            if drawn:
+                self.draw_calls += 1
+                self.strokes_drawn += drawn
+                
+        glcalls.use_program(0)
+        
+    def begin_frame(self):
+        """Reset the per-frame statistics."""
+        self.draw_calls = 0
+        self.strokes_drawn = 0
+        self.bytes_uploaded = 0
+        
+    def adopt_vertices(self, coord: ChunkCoord, vertices: ChunkVertices, store: StrokeStore):
+        """Upload a chunk's prepared vertices in one go.
+        
+        The strokes must already be in the store; they are not uploaded
+        again on the next sync unless edited before it.
+        """
+        if not self._initialized:
+            self.initialize()
+            
+        batch = self._batches.get(coord)
+        if batch is None:
+            batch = StrokeBatch(max(self.batch_capacity, len(vertices.positions)), self.lod.levels)
+            batch.create()
+            self._batches[coord] = batch
+            
+        for stroke_id in vertices.stroke_ids.tolist():
+            previous = self._stroke_chunks.get(stroke_id)
+            if previous is not None and previous != coord:
+                self._batches[previous].remove(stroke_id)
+            self._stroke_chunks[stroke_id] = coord
+            self._adopted[stroke_id] = store.get_revision(stroke_id)
+            
+        self.bytes_uploaded += batch.upload_block(vertices)
+        
+    def release_chunk(self, coord: ChunkCoord):
+        """Free the GPU buffers of an unloaded chunk."""
+        batch = self.retire_chunk(coord)
+        if batch is not None:
+            batch.delete()
+            
+    def retire_chunk(self, coord: ChunkCoord) -> Optional[StrokeBatch]:
+        """Detach an unloaded chunk's batch without freeing it, e.g. for caching."""
+        batch = self._batches.pop(coord, None)
+        if batch is None:
+            return None
+        for stroke_id in batch.stroke_ids():
+            self._stroke_chunks.pop(stroke_id, None)
+            self._adopted.pop(stroke_id, None)
+        return batch
+        
+    def adopt_chunk(self, coord: ChunkCoord, batch: StrokeBatch, store: StrokeStore):
+        """Reattach a retired batch whose strokes were reloaded unchanged.
+        
+        Strokes are not uploaded again on the next sync unless they are
+        edited before it.
+        """
+        self.release_chunk(coord)
+        self._batches[coord] = batch
+        for stroke_id in batch.stroke_ids():
+            self._stroke_chunks[stroke_id] = coord
+            if stroke_id in store:
+                self._adopted[stroke_id] = store.get_revision(stroke_id)
+                
+    def set_viewport(self, width: int, height: int):
+        """Set the framebuffer size used to project LOD errors to pixels."""
+        self.viewport_height = max(1, height)
+        
+    def get_batch(self, coord: ChunkCoord) -> Optional[StrokeBatch]:
+        """Get the batch holding a chunk's strokes."""
+        return self._batches.get(coord)
+        
+    @property
+    def nbytes(self) -> int:
+        """Get the GPU memory held by all batches."""
+        return sum(batch.nbytes for batch in self._batches.values())
+        
+    def cleanup(self):
+        """Clean up OpenGL resources."""
+        for batch in self._batches.values():
+            batch.delete()
+        self._batches.clear()
+        self._stroke_chunks.clear()
+        self._synced_revision = -1
+        if self.shader_program:
+            self.shaders.release(self.shader_program)
+            self.shader_program = None
+        self._initialized = False
+        
+    def _upload_stroke(self, store: StrokeStore, chunk_manager: ChunkManager, stroke_id: int,
+                       importance: Optional[np.ndarray] = None):
+        """Move a stroke's vertices into the batch of its current chunk.
+        
+        Strokes with point importance are uploaded with their full LOD
+        pyramid; others with their raw points only.
+        """
+        previous = self._stroke_chunks.get(stroke_id)
+        if store.get_length(stroke_id) == 0:
+            if previous is not None:
+                self._batches[previous].remove(stroke_id)
+                del self._stroke_chunks[stroke_id]
+            return
+            
+        bounds_min, bounds_max = store.get_bounds(stroke_id)
+        coord = chunk_manager.chunk_coord((bounds_min + bounds_max) * 0.5)
+        if previous is not None and previous != coord:
+            self._batches[previous].remove(stroke_id)
+            
+        batch = self._batches.get(coord)
+        if batch is None:
+            batch = StrokeBatch(self.batch_capacity, self.lod.levels)
+            batch.create()
+            self._batches[coord] = batch
+            
+        positions = store.get_points(stroke_id)
+        colors = store.get_colors(stroke_id)
+        level_counts = None
+        if importance is not None:
+            indices, level_counts = build_levels(importance, self.lod.tolerances)
+            positions = positions[indices]
+            colors = colors[indices]
+            
+        self.bytes_uploaded += batch.upload(stroke_id, positions, colors, level_counts)
+        self._stroke_chunks[stroke_id] = coord
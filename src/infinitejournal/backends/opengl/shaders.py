@@ -0,0 +1,283 @@
+# src/infinitejournal/backends/opengl/shaders.py
+"""Shared shader compilation helpers."""
+
+import hashlib
+import logging
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.error import GLError
+
+from infinitejournal.backends.opengl import glcalls
+from infinitejournal.storage.files import write_atomic
+
+BINARY_MAGIC = b"IJPB"
+BINARY_HEADER = struct.Struct("<4sI")  # magic, binary format
+
+
+def compile_program(vertex_source: str, fragment_source: str, retrievable: bool = False) -> int:
+    """Compile and link a shader program from GLSL sources.
+    
+    `retrievable` asks the driver to keep the linked binary available for
+    glGetProgramBinary.
+    """
+    # Create vertex shader
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)
+    glShaderSource(vertex_shader, vertex_source)
+    glCompileShader(vertex_shader)
+    
+    # Check vertex shader compilation
+    if not glGetShaderiv(vertex_shader, GL_COMPILE_STATUS):
+        error = glGetShaderInfoLog(vertex_shader).decode()
+        glDeleteShader(vertex_shader)
+        raise RuntimeError(f"Vertex shader compilation failed: {error}")
+    
+    # Create fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)
+    glShaderSource(fragment_shader, fragment_source)
+    glCompileShader(fragment_shader)
+    
+    # Check fragment shader compilation
+    if not glGetShaderiv(fragment_shader, GL_COMPILE_STATUS):
+        error = glGetShaderInfoLog(fragment_shader).decode()
+        glDeleteShader(vertex_shader)
+        glDeleteShader(fragment_shader)
+        raise RuntimeError(f"Fragment shader compilation failed: {error}")
+    
+    # Create and link program
+    program = glCreateProgram()
+    glAttachShader(program, vertex_shader)
+    glAttachShader(program, fragment_shader)
+    if retrievable:
+        glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+    glLinkProgram(program)
+    
+    # Check linking
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        error = glGetProgramInfoLog(program).decode()
+        glDeleteShader(vertex_shader)
+        glDeleteShader(fragment_shader)
+        glDeleteProgram(program)
+        raise RuntimeError(f"Shader program linking failed: {error}")
+    
+    # Clean up shaders (they're linked to the program now)
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+    
+    return program
+
+
+class UniformCache:
+    """Uniform locations of a program and the values last uploaded to them.
+    
+    Setters skip the GL call when a uniform already holds the value, so
+    per-frame code can set everything unconditionally. They must be called
+    while the program is in use.
+    """
+    
+    def __init__(self, program: int, names: Iterable[str]):
+        """Look up the locations of the named uniforms."""
+        self.logger = logging.getLogger(__name__)
+        self.program = program
+        self.locations = {}
+        self._values = {}
+        self.locate(names)
+        
+    def locate(self, names: Iterable[str]):
+        """Look up the locations of uniforms not known yet."""
+        for name in names:
+            if name in self.locations:
+                continue
+            location = glGetUniformLocation(self.program, name)
+            if location == -1:
+                self.logger.warning(f"Uniform '{name}' not found in shader")
+            self.locations[name] = location
+            
+    def __getitem__(self, name: str) -> int:
+        """Get the location of a uniform."""
+        return self.locations[name]
+        
+    def set_float(self, name: str, value: float):
+        """Set a float uniform."""
+        value = float(value)
+        if self._values.get(name) != value:
+            self._values[name] = value
+            glcalls.uniform_1f(self.locations[name], value)
+            
+    def set_vec3(self, name: str, value: np.ndarray):
+        """Set a vec3 uniform."""
+        if self._changed(name, value):
+            glcalls.uniform_3fv(self.locations[name], self._values[name])
+            
+    def set_matrix4(self, name: str, value: np.ndarray):
+        """Set a mat4 uniform from a column-major matrix."""
+        if self._changed(name, value):
+            glcalls.uniform_matrix4fv(self.locations[name], self._values[name])
+            
+    def invalidate(self):
+        """Forget the uploaded values, e.g. after the program was relinked."""
+        self._values.clear()
+        
+    def _changed(self, name: str, value: np.ndarray) -> bool:
+        """Store an array value; returns False if it was already current."""
+        cached = self._values.get(name)
+        if cached is None:
+            self._values[name] = np.array(value, dtype=np.float32, order='C')
+            return True
+        if np.array_equal(cached, value):
+            return False
+        cached[...] = value
+        return True
+
+
+class ShaderManager:
+    """Shares shader programs between renderers and caches their binaries.
+    
+    Programs are keyed by their sources, so renderers asking for the same
+    shaders get the same program and uniform cache. With a cache directory,
+    linked programs are saved there as driver binaries (program binaries,
+    GL 4.1 / GL_ARB_get_program_binary), keyed by the driver and a hash of
+    the sources. Later runs load them instead of compiling. A binary the
+    driver rejects is deleted and the program is compiled again.
+    """
+    
+    def __init__(self, cache_directory: Optional[Path] = None):
+        """Initialize the manager; programs are created on first request."""
+        self.logger = logging.getLogger(__name__)
+        self.cache_directory = Path(cache_directory) if cache_directory is not None else None
+        self._programs: Dict[str, int] = {}  # Source hash -> program
+        self._keys: Dict[int, str] = {}
+        self._references: Dict[int, int] = {}
+        self._uniforms: Dict[int, UniformCache] = {}
+        self._driver: Optional[str] = None
+        self._binaries_supported: Optional[bool] = None
+        
+        # Statistics
+        self.compiled = 0
+        self.loaded = 0
+        
+    def get_program(self, vertex_source: str, fragment_source: str) -> int:
+        """Get a linked program for the sources; release() it when done."""
+        key = hashlib.sha256(f"{vertex_source}\0{fragment_source}".encode()).hexdigest()
+        program = self._programs.get(key)
+        if program is None:
+            program = self._load_binary(key)
+            if program is None:
+                program = compile_program(vertex_source, fragment_source,
+                                          retrievable=self._use_binaries())
+                self.compiled += 1
+                self._save_binary(key, program)
+            self._programs[key] = program
+            self._keys[program] = key
+            self._references[program] = 0
+        self._references[program] += 1
+        return program
+        
+    def get_uniforms(self, program: int, names: Iterable[str]) -> UniformCache:
+        """Get the uniform cache shared by the users of a program."""
+        uniforms = self._uniforms.get(program)
+        if uniforms is None:
+            uniforms = UniformCache(program, names)
+            self._uniforms[program] = uniforms
+        else:
+            uniforms.locate(names)
+        return uniforms
+        
+    def release(self, program: int):
+        """Drop a reference to a program; it is deleted with the last one."""
+        if program not in self._references:
+            return
+        self._references[program] -= 1
+        if self._references[program] <= 0:
+            self._delete(program)
+            
+    def cleanup(self):
+        """Delete every program."""
+        for program in list(self._references):
+            self._delete(program)
+            
+    def _delete(self, program: int):
+        """Delete a program and forget it."""
+        glDeleteProgram(program)
+        del self._programs[self._keys.pop(program)]
+        del self._references[program]
+        self._uniforms.pop(program, None)
+        
+    def _use_binaries(self) -> bool:
+        """Check if program binaries can be cached with this driver."""
+        if self._binaries_supported is None:
+            self._binaries_supported = False
+            if self.cache_directory is not None:
+                try:
+                    self._binaries_supported = (bool(glGetProgramBinary) and
+                                                glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS) > 0)
+                except GLError:
+                    pass
+                if not self._binaries_supported:
+                    self.logger.info("Program binaries unsupported; shaders are compiled every run")
+        return self._binaries_supported
+        
+    def _binary_path(self, key: str) -> Path:
+        """Get the cache file of a program binary for the current driver."""
+        if self._driver is None:
+            self._driver = "|".join(glGetString(name).decode(errors='replace')
+                                    for name in (GL_VENDOR, GL_RENDERER, GL_VERSION))
+        name = hashlib.sha256(f"{self._driver}\0{key}".encode()).hexdigest()[:32]
+        return self.cache_directory / f"{name}.bin"
+        
+    def _load_binary(self, key: str) -> Optional[int]:
+        """Create a program from its cached binary, if there is a usable one."""
+        if not self._use_binaries():
+            return None
+        path = self._binary_path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.warning(f"Failed to read program binary {path}: {e}")
+            return None
+        if len(data) <= BINARY_HEADER.size:
+            return None
+        magic, binary_format = BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC:
+            return None
+            
+        program = glCreateProgram()
+        binary = np.frombuffer(data, dtype=np.uint8, offset=BINARY_HEADER.size)
+        try:
+            glProgramBinary(program, binary_format, binary, len(binary))
+            linked = glGetProgramiv(program, GL_LINK_STATUS)
+        except GLError:
+            linked = False
+        if not linked:
+            # Drivers reject binaries from other versions or settings
+            glDeleteProgram(program)
+            path.unlink(missing_ok=True)
+            self.logger.info(f"Discarded stale program binary {path.name}")
+            return None
+        self.loaded += 1
+        return program
+        
+    def _save_binary(self, key: str, program: int):
+        """Write a linked program's binary to the cache."""
+        if not self._use_binaries():
+            return
+        path = self._binary_path(key)
+        try:
+            length = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+            if length <= 0:
+                return
+            binary = np.empty(length, dtype=np.uint8)
+            written = np.zeros(1, dtype=np.int32)
+            binary_format = np.zeros(1, dtype=np.uint32)
+            glGetProgramBinary(program, length, written, binary_format, binary)
+            
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, BINARY_HEADER.pack(BINARY_MAGIC, int(binary_format[0])) +
+                         binary[:int(written[0])].tobytes())
+        except (GLError, OSError) as e:
+            self.logger.warning(f"Failed to cache program binary: {e}")
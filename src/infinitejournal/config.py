@@ -21,27 +21,68 @@ class Config:
     gl_version: tuple = (3, 3)
     gl_profile: str = "core"
     clear_color: tuple = (0.0, 0.0, 0.0, 1.0)  # Black background
+    gl_performance_mode: bool = True  # No per-call PyOpenGL error checks; hot calls go direct
+    gl_debug: bool = False  # Keep error checks and log driver messages (GL_KHR_debug)
     
     # Performance settings
-    target_fps: int = 60
+    target_fps: int = 60  # Frame cap when vsync is off
+    uncapped: bool = False  # Render as fast as possible, ignoring vsync and target_fps
+    update_rate: int = 120  # Fixed simulation steps per second
+    max_updates_per_frame: int = 8
     show_fps: bool = True
+    profiler_enabled: bool = True
+    profiler_history: int = 300  # Frames kept for percentiles
+    profile_gpu: bool = True
+    profile_trace_on_exit: bool = False  # Write a Chrome trace of the last frames on exit
+    
+    # Input recording settings
+    record_input_path: str = ""  # Record input to this file
+    playback_input_path: str = ""  # Replay input from this file instead of the devices
+    playback_timestep: float = 0.0  # Fixed delta per replayed frame; 0 replays the recorded ones
     
     # Camera settings
     fov: float = 45.0
     near_plane: float = 0.1
     far_plane: float = 1000.0
+    reversed_z: bool = True  # Reversed depth with an infinite far plane
     
     # Input settings
     mouse_sensitivity: float = 0.002
     move_speed: float = 5.0
     
+    # Brush settings
+    brush_color: tuple = (1.0, 1.0, 1.0, 1.0)
+    brush_distance: float = 2.0  # Distance of the drawing plane in front of the camera
+    brush_width: float = 0.004  # Width of the live stroke's ribbon at full pressure
+    brush_subdivisions: int = 4  # Smoothed samples per segment between input points
+    eraser_radius: float = 0.02  # Erases on the drawing plane, with the right button
+    
+    # World settings
+    chunk_size: float = 32.0
+    chunk_load_radius: int = 4
+    chunk_vertical_radius: int = 1
+    
+    # Level of detail settings
+    lod_levels: int = 4
+    lod_tolerance: float = 0.002  # World units at the first simplified level
+    lod_pixel_error: float = 1.0
+    
+    # Shader settings
+    shader_binary_cache: bool = True  # Reuse linked program binaries across runs
+    
+    # Memory settings
+    cache_memory_mb: int = 512  # Ceiling for cached chunk data and GPU buffers
+    
+    # Streaming settings
+    stream_workers: int = 2
+    stream_budget_ms: float = 4.0  # Frame time spent applying loaded chunks
+    prefetch_horizon_ms: float = 800.0  # How far ahead to load along the predicted path (0 disables)
+    
     # Storage settings
+    # Created by whatever first writes into it, so constructing a Config
+    # does not touch the filesystem
     save_directory: Path = field(default_factory=lambda: Path.home() / ".infinitejournal")
     
-    def __post_init__(self):
-        """Ensure save directory exists."""
-        self.save_directory.mkdir(parents=True, exist_ok=True)
-    
     @classmethod
     def load_from_file(cls, config_path: Path) -> "Config":
         """Load configuration from JSON file."""
@@ -62,15 +103,45 @@ class Config:
             'gl_version': list(self.gl_version),
             'gl_profile': self.gl_profile,
             'clear_color': list(self.clear_color),
+            'gl_performance_mode': self.gl_performance_mode,
+            'gl_debug': self.gl_debug,
             'target_fps': self.target_fps,
+            'uncapped': self.uncapped,
+            'update_rate': self.update_rate,
+            'max_updates_per_frame': self.max_updates_per_frame,
             'show_fps': self.show_fps,
+            'profiler_enabled': self.profiler_enabled,
+            'profiler_history': self.profiler_history,
+            'profile_gpu': self.profile_gpu,
+            'profile_trace_on_exit': self.profile_trace_on_exit,
+            'record_input_path': self.record_input_path,
+            'playback_input_path': self.playback_input_path,
+            'playback_timestep': self.playback_timestep,
             'fov': self.fov,
             'near_plane': self.near_plane,
             'far_plane': self.far_plane,
+            'reversed_z': self.reversed_z,
             'mouse_sensitivity': self.mouse_sensitivity,
             'move_speed': self.move_speed,
+            'brush_color': list(self.brush_color),
+            'brush_distance': self.brush_distance,
+            'brush_width': self.brush_width,
+            'brush_subdivisions': self.brush_subdivisions,
+            'eraser_radius': self.eraser_radius,
+            'chunk_size': self.chunk_size,
+            'chunk_load_radius': self.chunk_load_radius,
+            'chunk_vertical_radius': self.chunk_vertical_radius,
+            'lod_levels': self.lod_levels,
+            'lod_tolerance': self.lod_tolerance,
+            'lod_pixel_error': self.lod_pixel_error,
+            'shader_binary_cache': self.shader_binary_cache,
+            'cache_memory_mb': self.cache_memory_mb,
+            'stream_workers': self.stream_workers,
+            'stream_budget_ms': self.stream_budget_ms,
+            'prefetch_horizon_ms': self.prefetch_horizon_ms,
             'save_directory': str(self.save_directory)
         }
         
+        Path(config_path).parent.mkdir(parents=True, exist_ok=True)
         with open(config_path, 'w') as f:
             json.dump(data, f, indent=2)
@@ -0,0 +1,265 @@
+# src/infinitejournal/drawing/models/curves.py
+"""Streaming Catmull-Rom smoothing and ribbon tessellation of strokes."""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def catmull_rom_basis(subdivisions: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the uniform Catmull-Rom weights for `subdivisions` samples per segment.
+    
+    Returns (weights, derivative weights), each (subdivisions, 4), for
+    t = 0, 1/s, ..., (s-1)/s against the control points P0..P3 of a
+    segment running from P1 to P2.
+    """
+    t = np.arange(subdivisions, dtype=np.float32) / subdivisions
+    t2 = t * t
+    t3 = t2 * t
+    weights = 0.5 * np.stack([
+        -t3 + 2.0 * t2 - t,
+        3.0 * t3 - 5.0 * t2 + 2.0,
+        -3.0 * t3 + 4.0 * t2 + t,
+        t3 - t2,
+    ], axis=1)
+    derivatives = 0.5 * np.stack([
+        -3.0 * t2 + 4.0 * t - 1.0,
+        9.0 * t2 - 10.0 * t,
+        -9.0 * t2 + 8.0 * t + 1.0,
+        3.0 * t2 - 2.0 * t,
+    ], axis=1)
+    return weights.astype(np.float32), derivatives.astype(np.float32)
+
+
+def ribbon(centers: np.ndarray, tangents: np.ndarray, widths: np.ndarray,
+           normal: np.ndarray) -> np.ndarray:
+    """Tessellate a centerline into triangle-strip vertices.
+    
+    Each sample becomes a pair of vertices offset by half its width,
+    perpendicular to its tangent within the plane of `normal`. Returns
+    (2N, 3) vertices, left and right interleaved.
+    """
+    # tangent x normal, written out; np.cross costs more than the math here
+    nx, ny, nz = (float(v) for v in normal)
+    sides = np.empty((len(tangents), 3), dtype=np.float32)
+    sides[:, 0] = tangents[:, 1] * nz - tangents[:, 2] * ny
+    sides[:, 1] = tangents[:, 2] * nx - tangents[:, 0] * nz
+    sides[:, 2] = tangents[:, 0] * ny - tangents[:, 1] * nx
+    lengths = np.sqrt(np.einsum('ij,ij->i', sides, sides))
+    
+    # Samples without a direction (repeated points) get no width
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(lengths > 1e-12, 0.5 * widths / lengths, 0.0)
+    sides *= scale[:, None]
+    
+    vertices = np.empty((2 * len(centers), 3), dtype=np.float32)
+    vertices[0::2] = centers - sides
+    vertices[1::2] = centers + sides
+    return vertices
+
+
+class StrokeCurve:
+    """Smooths a stroke and tessellates it into a ribbon as points arrive.
+    
+    Points are joined by uniform Catmull-Rom segments sampled
+    `subdivisions` times each. A segment depends on the points on either
+    side of it, so once the point after its end arrives it can no longer
+    change: its samples are appended to the stable geometry and never
+    computed again. Only the last segment (the tail), which still lacks
+    that point, is recomputed on every append, so the work per point is
+    constant however long the stroke gets.
+    
+    finish() turns the tail into final geometry once the stroke ends.
+    Consumers that mirror the curve upload the stable samples past
+    `stable_count` and replace the tail.
+    """
+    
+    def __init__(self, normal: np.ndarray, width: float = 0.004, subdivisions: int = 4,
+                 capacity: int = 256):
+        """Start an empty curve.
+        
+        The ribbon lies in the plane with the given `normal`; `width` is
+        scaled by each point's pressure.
+        """
+        self.normal = np.array(normal, dtype=np.float32)
+        self.width = width
+        self.subdivisions = max(1, int(subdivisions))
+        self._weights, self._derivatives = catmull_rom_basis(self.subdivisions)
+        self.finished = False
+        
+        # Input points
+        self._points = np.zeros((max(4, capacity), 3), dtype=np.float32)
+        self._pressures = np.zeros(max(4, capacity), dtype=np.float32)
+        self._count = 0
+        
+        # Stable samples: centers, pressures and two strip vertices each
+        samples = max(4, capacity) * self.subdivisions
+        self._centers = np.zeros((samples, 3), dtype=np.float32)
+        self._sample_pressures = np.zeros(samples, dtype=np.float32)
+        self._strip = np.zeros((2 * samples, 3), dtype=np.float32)
+        self._stable = 0
+        self._segments = 0  # Segments whose samples are stable
+        
+        # Samples of the last segment and the end point
+        self._tail_centers = np.zeros((0, 3), dtype=np.float32)
+        self._tail_pressures = np.zeros(0, dtype=np.float32)
+        self._tail_strip = np.zeros((0, 3), dtype=np.float32)
+        
+    def append(self, points: np.ndarray, pressures: Optional[np.ndarray] = None) -> int:
+        """Add input points; returns the number of samples that became stable."""
+        if self.finished:
+            raise ValueError("Cannot append to a finished curve")
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        count = len(points)
+        if count == 0:
+            return 0
+            
+        end = self._count + count
+        if end > len(self._points):
+            capacity = max(2 * len(self._points), end)
+            self._points = self._grown(self._points, capacity)
+            self._pressures = self._grown(self._pressures, capacity)
+        self._points[self._count:end] = points
+        self._pressures[self._count:end] = 1.0 if pressures is None else pressures
+        self._count = end
+        
+        # Segment i (P_i to P_i+1) is final once P_i+2 exists
+        before = self._stable
+        self._emit(self._count - 2)
+        self._update_tail()
+        return self._stable - before
+        
+    def finish(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """End the stroke and get its final geometry.
+        
+        The tail becomes stable. Returns copies of the (centers, pressures,
+        strip vertices) of the whole curve.
+        """
+        if not self.finished:
+            self._emit(self._count - 1)
+            self._append_stable(self._tail_centers[-1:], self._tail_pressures[-1:],
+                                self._tail_strip[-2:])
+            self.finished = True
+            self._update_tail()
+        return (self._centers[:self._stable].copy(), self._sample_pressures[:self._stable].copy(),
+                self._strip[:2 * self._stable].copy())
+                
+    @property
+    def point_count(self) -> int:
+        """Get the number of input points."""
+        return self._count
+        
+    @property
+    def stable_count(self) -> int:
+        """Get the number of samples that will not change any more."""
+        return self._stable
+        
+    @property
+    def stable_centers(self) -> np.ndarray:
+        """Get a view of the stable centerline samples."""
+        return self._centers[:self._stable]
+        
+    @property
+    def stable_pressures(self) -> np.ndarray:
+        """Get a view of the pressures of the stable samples."""
+        return self._sample_pressures[:self._stable]
+        
+    @property
+    def stable_strip(self) -> np.ndarray:
+        """Get a view of the stable strip vertices, two per sample."""
+        return self._strip[:2 * self._stable]
+        
+    @property
+    def tail_centers(self) -> np.ndarray:
+        """Get the centerline samples after the stable ones."""
+        return self._tail_centers
+        
+    @property
+    def tail_strip(self) -> np.ndarray:
+        """Get the strip vertices after the stable ones."""
+        return self._tail_strip
+        
+    def _emit(self, segments: int):
+        """Make the samples of segments up to `segments` stable."""
+        first = self._segments
+        if segments <= first:
+            return
+        centers, pressures, tangents = self._sample(first, segments)
+        strip = ribbon(centers, tangents, self.width * pressures, self.normal)
+        self._append_stable(centers, pressures, strip)
+        self._segments = segments
+        
+    def _update_tail(self):
+        """Recompute the samples that may still change."""
+        if self.finished or self._count == 0:
+            self._tail_centers = self._tail_centers[:0]
+            self._tail_pressures = self._tail_pressures[:0]
+            self._tail_strip = self._tail_strip[:0]
+            return
+            
+        last = self._count - 1
+        if self._segments < last:
+            centers, pressures, tangents = self._sample(self._segments, last)
+        else:
+            centers = np.zeros((0, 3), dtype=np.float32)
+            pressures = np.zeros(0, dtype=np.float32)
+            tangents = np.zeros((0, 3), dtype=np.float32)
+            
+        # The end point itself, heading along the last segment
+        end_tangent = (self._points[last] - self._points[last - 1] if last > 0
+                       else np.zeros(3, dtype=np.float32))
+        self._tail_centers = np.concatenate([centers, self._points[last:last + 1]])
+        self._tail_pressures = np.concatenate([pressures, self._pressures[last:last + 1]])
+        tangents = np.concatenate([tangents, end_tangent[None, :]])
+        self._tail_strip = ribbon(self._tail_centers, tangents, self.width * self._tail_pressures,
+                                  self.normal)
+                                  
+    def _sample(self, first: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sample segments [first, end) in one pass.
+        
+        Returns (centers, pressures, tangents) with `subdivisions` samples
+        per segment. The points before the first and after the last input
+        point are mirrored from their neighbours.
+        """
+        count = self._count
+        points = self._points
+        segments = np.arange(first, end)
+        indices = segments[:, None] + np.arange(-1, 3)[None, :]
+        controls = points[np.minimum(np.maximum(indices, 0), count - 1)]
+        
+        # Mirror the missing neighbours of the first and last point
+        before = indices[:, 0] < 0
+        controls[before, 0] = 2.0 * points[0] - points[min(1, count - 1)]
+        after = indices[:, 3] > count - 1
+        controls[after, 3] = 2.0 * points[count - 1] - points[max(count - 2, 0)]
+        
+        centers = np.matmul(self._weights, controls).reshape(-1, 3)
+        tangents = np.matmul(self._derivatives, controls).reshape(-1, 3)
+        
+        # Pressure is interpolated linearly along each segment
+        t = np.arange(self.subdivisions, dtype=np.float32) / self.subdivisions
+        start_pressure = self._pressures[segments][:, None]
+        end_pressure = self._pressures[segments + 1][:, None]
+        pressures = (start_pressure + (end_pressure - start_pressure) * t[None, :]).reshape(-1)
+        return centers, pressures, tangents
+        
+    def _append_stable(self, centers: np.ndarray, pressures: np.ndarray, strip: np.ndarray):
+        """Append samples to the stable geometry."""
+        count = len(centers)
+        end = self._stable + count
+        if end > len(self._centers):
+            capacity = max(2 * len(self._centers), end)
+            self._centers = self._grown(self._centers, capacity)
+            self._sample_pressures = self._grown(self._sample_pressures, capacity)
+            self._strip = self._grown(self._strip, 2 * capacity)
+        self._centers[self._stable:end] = centers
+        self._sample_pressures[self._stable:end] = pressures
+        self._strip[2 * self._stable:2 * end] = strip
+        self._stable = end
+        
+    @staticmethod
+    def _grown(array: np.ndarray, capacity: int) -> np.ndarray:
+        """Return a copy of array with its first dimension enlarged to capacity."""
+        grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
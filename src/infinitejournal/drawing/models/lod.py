@@ -0,0 +1,150 @@
+# src/infinitejournal/drawing/models/lod.py
+"""Level-of-detail simplification of strokes."""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+
+def _segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Get the distance from each point to the matching segment a-b."""
+    ab = b - a
+    ap = points - a
+    length_sq = ab[:, 0] * ab[:, 0] + ab[:, 1] * ab[:, 1] + ab[:, 2] * ab[:, 2]
+    projection = ap[:, 0] * ab[:, 0] + ap[:, 1] * ab[:, 1] + ap[:, 2] * ab[:, 2]
+    
+    # Degenerate segments (closed loops) measure distance to the endpoint
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(length_sq > 0.0, projection / length_sq, 0.0)
+    t = np.clip(t, 0.0, 1.0)[:, None]
+    
+    delta = ap - ab * t
+    delta *= delta
+    return np.sqrt(delta[:, 0] + delta[:, 1] + delta[:, 2])
+
+
+def rdp_importance(points: np.ndarray, lengths: np.ndarray,
+                   min_tolerance: float = 0.0) -> np.ndarray:
+    """Rank the points of many strokes by Ramer-Douglas-Peucker error.
+    
+    `points` holds the strokes back to back, `lengths` their point counts.
+    The returned importance of a point is the largest tolerance at which
+    RDP still keeps it (endpoints are infinite), so simplifying a stroke
+    at any tolerance is just `importance > tolerance`. All strokes are
+    split in lockstep, one vectorized pass per recursion depth. Segments
+    whose error drops to `min_tolerance` are not subdivided further.
+    """
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    lengths = np.asarray(lengths, dtype=np.int64).reshape(-1)
+    importance = np.zeros(len(points), dtype=np.float32)
+    
+    starts = np.cumsum(lengths) - lengths
+    ends = starts + lengths - 1
+    nonempty = lengths > 0
+    importance[starts[nonempty]] = np.inf
+    importance[ends[nonempty]] = np.inf
+    
+    splittable = lengths > 2
+    seg_start = starts[splittable]
+    seg_end = ends[splittable]
+    seg_limit = np.full(len(seg_start), np.inf, dtype=np.float32)
+    
+    while len(seg_start):
+        # Distances of every interior point to its segment's chord
+        counts = seg_end - seg_start - 1
+        group_starts = np.cumsum(counts) - counts
+        segment_of = np.repeat(np.arange(len(counts)), counts)
+        rows = np.repeat(seg_start + 1 - group_starts, counts) + np.arange(int(counts.sum()))
+        distances = _segment_distances(points[rows], points[seg_start][segment_of],
+                                       points[seg_end][segment_of])
+                                       
+        # Farthest point per segment (first one on ties)
+        seg_max = np.maximum.reduceat(distances, group_starts)
+        hits = np.flatnonzero(distances == seg_max[segment_of])
+        hit_segments = segment_of[hits]
+        first = hits[np.concatenate(([True], hit_segments[1:] != hit_segments[:-1]))]
+        split = rows[first]
+        
+        # A point never outlives the split that exposed it
+        value = np.minimum(seg_max, seg_limit)
+        importance[split] = value
+        
+        refine = value > min_tolerance
+        split = split[refine]
+        value = value[refine]
+        seg_start, seg_end = (np.concatenate([seg_start[refine], split]),
+                              np.concatenate([split, seg_end[refine]]))
+        seg_limit = np.concatenate([value, value])
+        
+        interior = seg_end - seg_start > 1
+        seg_start = seg_start[interior]
+        seg_end = seg_end[interior]
+        seg_limit = seg_limit[interior]
+        
+    return importance
+
+
+def simplify(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Simplify a single stroke with Ramer-Douglas-Peucker."""
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    importance = rdp_importance(points, [len(points)], tolerance)
+    return points[importance > tolerance]
+
+
+def level_tolerances(levels: int, base_tolerance: float, ratio: float = 4.0) -> np.ndarray:
+    """Get the world-space tolerance of each level; level 0 is lossless."""
+    if levels < 1:
+        raise ValueError(f"LOD level count must be at least 1, got {levels}")
+    tolerances = np.zeros(levels, dtype=np.float32)
+    tolerances[1:] = base_tolerance * ratio ** np.arange(levels - 1)
+    return tolerances
+
+
+def build_levels(importance: np.ndarray, tolerances: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Build a stroke's decimation pyramid.
+    
+    Returns the point indices of every level back to back, finest first,
+    and the number of points in each level.
+    """
+    levels = [np.arange(len(importance))]
+    for tolerance in tolerances[1:]:
+        levels.append(np.flatnonzero(importance > tolerance))
+    counts = np.array([len(level) for level in levels], dtype=np.int64)
+    return np.concatenate(levels), counts
+
+
+class LODSelector:
+    """Picks a pyramid level per stroke from its projected screen error.
+    
+    A level is acceptable when its world tolerance, projected at the
+    stroke's distance from the camera, stays below `max_pixel_error`
+    pixels. The coarsest acceptable level is chosen.
+    """
+    
+    def __init__(self, tolerances: np.ndarray, max_pixel_error: float = 1.0):
+        """Initialize the selector."""
+        self.tolerances = np.asarray(tolerances, dtype=np.float32)
+        self.max_pixel_error = max_pixel_error
+        self.position = np.zeros(3, dtype=np.float32)
+        self.pixels_per_unit = 1.0
+        
+    @property
+    def levels(self) -> int:
+        """Get the number of pyramid levels."""
+        return len(self.tolerances)
+        
+    def update(self, camera, viewport_height: int):
+        """Capture the camera state for this frame."""
+        self.position[:] = camera.position
+        fov = getattr(camera, 'fov', 45.0)
+        self.pixels_per_unit = viewport_height / (2.0 * math.tan(math.radians(fov) * 0.5))
+        
+    def select(self, centers: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """Get the level for strokes with the given bounding spheres."""
+        delta = centers - self.position
+        delta *= delta
+        distance = np.sqrt(delta[:, 0] + delta[:, 1] + delta[:, 2]) - radii
+        allowed = self.max_pixel_error * np.maximum(distance, 1e-3) / self.pixels_per_unit
+        levels = np.searchsorted(self.tolerances, allowed, side='right') - 1
+        return np.clip(levels, 0, len(self.tolerances) - 1)
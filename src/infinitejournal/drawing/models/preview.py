@@ -0,0 +1,157 @@
+# src/infinitejournal/drawing/models/preview.py
+"""Live preview of the stroke being drawn."""
+
+import ctypes
+import logging
+from typing import Optional
+
+import numpy as np
+from OpenGL.GL import *
+
+from infinitejournal.backends.opengl import glcalls
+from infinitejournal.backends.opengl.renderer import StrokeRenderer
+from infinitejournal.backends.opengl.shaders import ShaderManager
+from infinitejournal.drawing.models.curves import StrokeCurve
+
+
+class StrokePreview:
+    """Draws the stroke in progress from a small streaming vertex buffer.
+    
+    The chunk batches are large, shared buffers, so the stroke being drawn
+    stays out of them until it ends and is handed over in one upload.
+    Until then its curve's ribbon is mirrored into a buffer of its own:
+    each frame uploads only the strip vertices that became stable since
+    the last frame and rewrites the short tail after them, so the
+    per-frame cost does not grow with the stroke. Input handled at the
+    start of a frame is on screen at its end.
+    
+    The ribbon is drawn as a triangle strip after the scene, with the
+    stroke shader and the stroke's color; its width follows the pressure.
+    """
+    
+    POSITION_STRIDE = 12
+    
+    def __init__(self, shaders: Optional[ShaderManager] = None, capacity: int = 8192):
+        """Initialize the preview; GL objects are created in initialize().
+        
+        `capacity` is the initial size of the buffer in strip vertices,
+        two per curve sample.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.shaders = shaders if shaders is not None else ShaderManager()
+        self.capacity = capacity
+        
+        self.shader_program = None
+        self.uniforms = None
+        self.vao = None
+        self.vbo = None
+        
+        # The curve being mirrored
+        self._curve: Optional[StrokeCurve] = None
+        self._color = np.ones(4, dtype=np.float32)
+        self._uploaded = 0  # Stable strip vertices already in the buffer
+        self.vertex_count = 0
+        
+        # Statistics of the last update
+        self.bytes_uploaded = 0
+        
+        self._initialized = False
+        
+    def initialize(self):
+        """Initialize OpenGL resources."""
+        if self._initialized:
+            return
+            
+        try:
+            # Same sources as the stroke renderer, so the program is shared
+            self.shader_program = self.shaders.get_program(StrokeRenderer.VERTEX_SHADER,
+                                                           StrokeRenderer.FRAGMENT_SHADER)
+            self.uniforms = self.shaders.get_uniforms(self.shader_program, ['viewProjection'])
+            
+            self.vao = glGenVertexArrays(1)
+            self.vbo = glGenBuffers(1)
+            self._allocate(self.capacity)
+            glBindVertexArray(self.vao)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glEnableVertexAttribArray(0)
+            glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+            glBindVertexArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            
+            self._initialized = True
+            self.logger.info("Stroke preview initialized successfully")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to initialize stroke preview: {e}")
+            raise
+            
+    def update(self, curve: Optional[StrokeCurve], color: tuple = (1.0, 1.0, 1.0, 1.0)):
+        """Mirror the curve being drawn; None or a finished curve clears the preview."""
+        self.bytes_uploaded = 0
+        if curve is None or curve.finished:
+            self._curve = None
+            self.vertex_count = 0
+            return
+        if not self._initialized:
+            self.initialize()
+            
+        if curve is not self._curve:
+            self._curve = curve
+            self._color[:] = color
+            self._uploaded = 0
+            
+        strip = curve.stable_strip
+        stable = len(strip)
+        tail = curve.tail_strip
+        total = stable + len(tail)
+        if total > self.capacity:
+            self._allocate(max(2 * self.capacity, total))
+            self._uploaded = 0
+            
+        glcalls.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+        if stable > self._uploaded:
+            fresh = strip[self._uploaded:]
+            glcalls.buffer_sub_data(GL_ARRAY_BUFFER, self._uploaded * self.POSITION_STRIDE, fresh)
+            self.bytes_uploaded += fresh.nbytes
+        if len(tail):
+            glcalls.buffer_sub_data(GL_ARRAY_BUFFER, stable * self.POSITION_STRIDE, tail)
+            self.bytes_uploaded += tail.nbytes
+        glcalls.bind_buffer(GL_ARRAY_BUFFER, 0)
+        
+        self._uploaded = stable
+        self.vertex_count = total
+        
+    def render(self, camera):
+        """Draw the stroke in progress, if any."""
+        if self.vertex_count == 0:
+            return
+            
+        glcalls.use_program(self.shader_program)
+        self.uniforms.set_matrix4('viewProjection', camera.get_view_projection_matrix())
+        
+        # Color comes from the constant attribute value; the array is off
+        glVertexAttrib4fv(1, self._color)
+        glcalls.bind_vertex_array(self.vao)
+        glcalls.draw_arrays(GL_TRIANGLE_STRIP, 0, self.vertex_count)
+        glcalls.bind_vertex_array(0)
+        glcalls.use_program(0)
+        
+    def cleanup(self):
+        """Clean up OpenGL resources."""
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+        if self.vbo:
+            glDeleteBuffers(1, [self.vbo])
+        if self.shader_program:
+            self.shaders.release(self.shader_program)
+        self.vao = self.vbo = self.shader_program = None
+        self._curve = None
+        self.vertex_count = 0
+        self._initialized = False
+        
+    def _allocate(self, capacity: int):
+        """Create or enlarge the vertex buffer; its contents are lost."""
+        self.capacity = capacity
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, capacity * self.POSITION_STRIDE, None, GL_STREAM_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
@@ -0,0 +1,470 @@
+# src/infinitejournal/drawing/models/spatial.py
+"""Spatial hash grid over stroke bounding boxes."""
+
+import logging
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from infinitejournal.utilities.spatial import (
+    aabb_overlaps,
+    point_aabb_distance,
+    ray_aabb_intersect,
+)
+
+
+CellKey = Tuple[int, int, int]
+
+
+class SpatialHashGrid:
+    """Uniform hash grid answering "which strokes are near here" queries.
+    
+    Each stroke's bounding box is registered in every grid cell it
+    overlaps. Boxes spanning more than `max_cells_per_entry` cells are kept
+    in a small oversized list that every query tests directly, so a few
+    huge strokes cannot flood the grid. Box corners are also kept in dense
+    arrays, which lets every query refine its candidates with one
+    vectorized NumPy test instead of a Python loop.
+    """
+    
+    # Queries touching more cells than this fall back to a dense scan
+    MAX_QUERY_CELLS = 4096
+    
+    # Rings searched by nearest() before it falls back to a dense scan
+    MAX_NEAREST_RINGS = 4
+    
+    def __init__(self, cell_size: float = 4.0, max_cells_per_entry: int = 64,
+                 capacity: int = 1024):
+        """Initialize an empty index."""
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive, got {cell_size}")
+            
+        self.logger = logging.getLogger(__name__)
+        self.cell_size = float(cell_size)
+        self.max_cells_per_entry = max(1, int(max_cells_per_entry))
+        
+        # Dense entry storage, addressed by slot
+        capacity = max(1, capacity)
+        self._mins = np.zeros((capacity, 3), dtype=np.float32)
+        self._maxs = np.zeros((capacity, 3), dtype=np.float32)
+        self._slot_ids = np.full(capacity, -1, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._slot_count = 0
+        self._free_slots: List[int] = []
+        self._slots: Dict[int, int] = {}  # stroke id -> slot
+        
+        # Grid storage
+        self._cells: Dict[CellKey, Set[int]] = {}
+        self._entry_ranges: Dict[int, Tuple[CellKey, CellKey]] = {}
+        self._oversized: Set[int] = set()
+        
+        # Conservative bounds of everything ever inserted since the last clear
+        self._world_min = np.full(3, np.inf, dtype=np.float32)
+        self._world_max = np.full(3, -np.inf, dtype=np.float32)
+        
+    # ----------------------------------------------------------------
+    # Construction
+    # ----------------------------------------------------------------
+    
+    @classmethod
+    def from_store(cls, store, cell_size: float = 4.0, **kwargs) -> "SpatialHashGrid":
+        """Build an index over every stroke in a StrokeStore."""
+        ids, mins, maxs = store.get_all_bounds()
+        index = cls(cell_size=cell_size, capacity=max(1, len(ids)), **kwargs)
+        index.bulk_insert(ids, mins, maxs)
+        return index
+        
+    def bulk_insert(self, stroke_ids: np.ndarray, mins: np.ndarray, maxs: np.ndarray):
+        """Insert many boxes at once, grouping single-cell boxes by cell."""
+        stroke_ids = np.asarray(stroke_ids, dtype=np.int64)
+        count = len(stroke_ids)
+        if count == 0:
+            return
+            
+        for stroke_id in stroke_ids:
+            if int(stroke_id) in self._slots:
+                self.remove(int(stroke_id))
+                
+        slots = np.array([self._allocate_slot(int(i)) for i in stroke_ids], dtype=np.int64)
+        self._mins[slots] = mins
+        self._maxs[slots] = maxs
+        np.minimum(self._world_min, np.min(mins, axis=0), out=self._world_min)
+        np.maximum(self._world_max, np.max(maxs, axis=0), out=self._world_max)
+        
+        lo = self._cells_of(np.asarray(mins))
+        hi = self._cells_of(np.asarray(maxs))
+        single = np.all(lo == hi, axis=1)
+        
+        # Boxes inside one cell: one dict update per distinct cell
+        single_slots = slots[single]
+        if len(single_slots):
+            cells, inverse = np.unique(lo[single], axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            order = np.argsort(inverse, kind='stable')
+            splits = np.flatnonzero(np.diff(inverse[order])) + 1
+            for cell, group in zip(cells, np.split(single_slots[order], splits)):
+                key = (int(cell[0]), int(cell[1]), int(cell[2]))
+                self._cells.setdefault(key, set()).update(group.tolist())
+            for slot, cell in zip(single_slots.tolist(), lo[single].tolist()):
+                key = tuple(cell)
+                self._entry_ranges[slot] = (key, key)
+                
+        # Boxes spanning several cells go through the regular path
+        for slot, cell_lo, cell_hi in zip(slots[~single].tolist(), lo[~single].tolist(),
+                                          hi[~single].tolist()):
+            self._register(slot, tuple(cell_lo), tuple(cell_hi))
+            
+    # ----------------------------------------------------------------
+    # Editing
+    # ----------------------------------------------------------------
+    
+    def insert(self, stroke_id: int, bounds_min: np.ndarray, bounds_max: np.ndarray):
+        """Insert a stroke's bounding box, replacing any previous entry."""
+        if stroke_id in self._slots:
+            self.move(stroke_id, bounds_min, bounds_max)
+            return
+            
+        slot = self._allocate_slot(stroke_id)
+        self._mins[slot] = bounds_min
+        self._maxs[slot] = bounds_max
+        self._expand_world(bounds_min, bounds_max)
+        self._register(slot, self._cell_of(bounds_min), self._cell_of(bounds_max))
+        
+    def remove(self, stroke_id: int):
+        """Remove a stroke from the index; unknown ids are ignored."""
+        slot = self._slots.pop(stroke_id, None)
+        if slot is None:
+            return
+        self._unregister(slot)
+        self._alive[slot] = False
+        self._slot_ids[slot] = -1
+        self._free_slots.append(slot)
+        
+    def move(self, stroke_id: int, bounds_min: np.ndarray, bounds_max: np.ndarray):
+        """Update a stroke's bounding box after it changed."""
+        slot = self._slots.get(stroke_id)
+        if slot is None:
+            self.insert(stroke_id, bounds_min, bounds_max)
+            return
+            
+        self._mins[slot] = bounds_min
+        self._maxs[slot] = bounds_max
+        self._expand_world(bounds_min, bounds_max)
+        cell_range = (self._cell_of(bounds_min), self._cell_of(bounds_max))
+        if cell_range != self._entry_ranges.get(slot):
+            self._unregister(slot)
+            self._register(slot, *cell_range)
+            
+    def clear(self):
+        """Remove every entry."""
+        self._alive[:] = False
+        self._slot_ids[:] = -1
+        self._slot_count = 0
+        self._free_slots = []
+        self._slots.clear()
+        self._cells.clear()
+        self._entry_ranges.clear()
+        self._oversized.clear()
+        self._world_min[:] = np.inf
+        self._world_max[:] = -np.inf
+        
+    # ----------------------------------------------------------------
+    # Queries
+    # ----------------------------------------------------------------
+    
+    def query_aabb(self, query_min: np.ndarray, query_max: np.ndarray) -> np.ndarray:
+        """Get the ids of strokes whose boxes overlap a query box."""
+        query_min = np.asarray(query_min, dtype=np.float32)
+        query_max = np.asarray(query_max, dtype=np.float32)
+        lo = self._cell_of(query_min)
+        hi = self._cell_of(query_max)
+        
+        cell_count = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+        if cell_count > min(self.MAX_QUERY_CELLS, len(self._slots)):
+            slots = self._live_slots()
+        else:
+            candidates = set(self._oversized)
+            for key in self._iter_cells(lo, hi):
+                bucket = self._cells.get(key)
+                if bucket:
+                    candidates.update(bucket)
+            slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            
+        if len(slots) == 0:
+            return np.zeros(0, dtype=np.int64)
+        mask = aabb_overlaps(self._mins[slots], self._maxs[slots], query_min, query_max)
+        return self._slot_ids[slots[mask]]
+        
+    def query_sphere(self, center: np.ndarray, radius: float) -> np.ndarray:
+        """Get the ids of strokes whose boxes come within radius of a point."""
+        center = np.asarray(center, dtype=np.float32)
+        slots = self._query_slots(center - radius, center + radius)
+        if len(slots) == 0:
+            return np.zeros(0, dtype=np.int64)
+        mask = point_aabb_distance(center, self._mins[slots], self._maxs[slots]) <= radius
+        return self._slot_ids[slots[mask]]
+        
+    def raycast(self, origin: np.ndarray, direction: np.ndarray,
+                max_distance: float = math.inf) -> Optional[Tuple[int, float]]:
+        """Find the first stroke box hit by a ray.
+        
+        Returns (stroke_id, distance) or None. Distances are in units of
+        `direction`'s length. Cells are walked front to back with a 3D DDA,
+        so the walk stops at the first cell that already contains the
+        nearest hit.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        if not self._slots or not np.any(direction):
+            return None
+            
+        # Clip the ray to the bounds of everything in the index
+        hit, t_enter = ray_aabb_intersect(origin, direction, self._world_min[None],
+                                          self._world_max[None])
+        if not hit[0] or t_enter[0] > max_distance:
+            return None
+        t_exit = self._ray_exit(origin, direction, self._world_min, self._world_max)
+        t_end = min(t_exit, max_distance)
+        
+        best = self._nearest_hit(origin, direction, np.fromiter(
+            self._oversized, dtype=np.int64, count=len(self._oversized)), t_end)
+            
+        # Long walks through sparse space are cheaper as one dense test
+        span = (t_end - t_enter[0]) * np.abs(direction) / self.cell_size
+        if span.sum() > self.MAX_QUERY_CELLS:
+            best = self._better(best, self._nearest_hit(origin, direction, self._live_slots(),
+                                                        t_end))
+            return None if best is None else (int(self._slot_ids[best[0]]), best[1])
+            
+        visited: Set[int] = set()
+        for key, cell_exit in self._walk_cells(origin, direction, t_enter[0], t_end):
+            bucket = self._cells.get(key)
+            if bucket:
+                fresh = bucket - visited
+                visited.update(fresh)
+                slots = np.fromiter(fresh, dtype=np.int64, count=len(fresh))
+                best = self._better(best, self._nearest_hit(origin, direction, slots, t_end))
+            if best is not None and best[1] <= cell_exit:
+                break
+                
+        return None if best is None else (int(self._slot_ids[best[0]]), best[1])
+        
+    def nearest(self, point: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the k strokes whose boxes are closest to a point.
+        
+        Returns (ids, distances) sorted by distance. Grid rings around the
+        point are searched outwards until the k-th candidate is closer than
+        any unsearched cell can be.
+        """
+        point = np.asarray(point, dtype=np.float32)
+        if k <= 0 or not self._slots:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+            
+        center = self._cell_of(point)
+        local = point / self.cell_size - np.array(center, dtype=np.float32)
+        # Distance from the point to the faces of its own cell
+        margin = float(min(local.min(), (1.0 - local).min())) * self.cell_size
+        
+        candidates: Set[int] = set(self._oversized)
+        for ring in range(self.MAX_NEAREST_RINGS + 1):
+            for key in self._iter_ring(center, ring):
+                bucket = self._cells.get(key)
+                if bucket:
+                    candidates.update(bucket)
+            if len(candidates) >= k:
+                slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                distances = point_aabb_distance(point, self._mins[slots], self._maxs[slots])
+                kth = np.partition(distances, k - 1)[k - 1]
+                if kth <= margin + ring * self.cell_size:
+                    return self._take_nearest(slots, distances, k)
+                    
+        # Too sparse around the point; scan everything instead
+        slots = self._live_slots()
+        distances = point_aabb_distance(point, self._mins[slots], self._maxs[slots])
+        return self._take_nearest(slots, distances, k)
+        
+    def get_bounds(self, stroke_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the box stored for a stroke."""
+        slot = self._slots[stroke_id]
+        return self._mins[slot].copy(), self._maxs[slot].copy()
+        
+    def __contains__(self, stroke_id: int) -> bool:
+        return stroke_id in self._slots
+        
+    def __len__(self) -> int:
+        return len(self._slots)
+        
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+    
+    def _cell_of(self, position: np.ndarray) -> CellKey:
+        """Get the grid cell containing a position."""
+        size = self.cell_size
+        return (
+            int(math.floor(position[0] / size)),
+            int(math.floor(position[1] / size)),
+            int(math.floor(position[2] / size)),
+        )
+        
+    def _cells_of(self, positions: np.ndarray) -> np.ndarray:
+        """Get the (N, 3) grid cells of many positions."""
+        return np.floor(positions / self.cell_size).astype(np.int64)
+        
+    @staticmethod
+    def _iter_cells(lo: CellKey, hi: CellKey):
+        """Iterate the cell keys of an inclusive cell range."""
+        for x in range(lo[0], hi[0] + 1):
+            for y in range(lo[1], hi[1] + 1):
+                for z in range(lo[2], hi[2] + 1):
+                    yield (x, y, z)
+                    
+    @staticmethod
+    def _iter_ring(center: CellKey, ring: int):
+        """Iterate the cells at Chebyshev distance `ring` from a cell."""
+        cx, cy, cz = center
+        if ring == 0:
+            yield center
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            for y in range(cy - ring, cy + ring + 1):
+                on_shell = abs(x - cx) == ring or abs(y - cy) == ring
+                if on_shell:
+                    for z in range(cz - ring, cz + ring + 1):
+                        yield (x, y, z)
+                else:
+                    yield (x, y, cz - ring)
+                    yield (x, y, cz + ring)
+                    
+    def _expand_world(self, bounds_min: np.ndarray, bounds_max: np.ndarray):
+        """Grow the cached world bounds to include a box."""
+        np.minimum(self._world_min, bounds_min, out=self._world_min)
+        np.maximum(self._world_max, bounds_max, out=self._world_max)
+        
+    def _live_slots(self) -> np.ndarray:
+        """Get every occupied slot."""
+        return np.flatnonzero(self._alive[:self._slot_count])
+        
+    def _query_slots(self, query_min: np.ndarray, query_max: np.ndarray) -> np.ndarray:
+        """Get the slots overlapping a box."""
+        ids = self.query_aabb(query_min, query_max)
+        return np.fromiter((self._slots[int(i)] for i in ids), dtype=np.int64, count=len(ids))
+        
+    def _allocate_slot(self, stroke_id: int) -> int:
+        """Reserve a dense slot for a stroke."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._slot_count == len(self._alive):
+                self._grow(2 * len(self._alive))
+            slot = self._slot_count
+            self._slot_count += 1
+        self._slot_ids[slot] = stroke_id
+        self._alive[slot] = True
+        self._slots[stroke_id] = slot
+        return slot
+        
+    def _grow(self, capacity: int):
+        """Enlarge the dense entry arrays."""
+        extra = capacity - len(self._alive)
+        self._mins = np.concatenate([self._mins, np.zeros((extra, 3), dtype=np.float32)])
+        self._maxs = np.concatenate([self._maxs, np.zeros((extra, 3), dtype=np.float32)])
+        self._slot_ids = np.concatenate([self._slot_ids, np.full(extra, -1, dtype=np.int64)])
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        
+    def _register(self, slot: int, lo: CellKey, hi: CellKey):
+        """Add a slot to the cells of its cell range."""
+        self._entry_ranges[slot] = (lo, hi)
+        cell_count = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+        if cell_count > self.max_cells_per_entry:
+            self._oversized.add(slot)
+            return
+        for key in self._iter_cells(lo, hi):
+            self._cells.setdefault(key, set()).add(slot)
+            
+    def _unregister(self, slot: int):
+        """Remove a slot from the cells it was registered in."""
+        lo, hi = self._entry_ranges.pop(slot)
+        if slot in self._oversized:
+            self._oversized.discard(slot)
+            return
+        for key in self._iter_cells(lo, hi):
+            bucket = self._cells.get(key)
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del self._cells[key]
+                    
+    def _nearest_hit(self, origin: np.ndarray, direction: np.ndarray, slots: np.ndarray,
+                     t_end: float) -> Optional[Tuple[int, float]]:
+        """Get the (slot, distance) of the closest box hit among slots."""
+        if len(slots) == 0:
+            return None
+        hit, t_near = ray_aabb_intersect(origin, direction, self._mins[slots], self._maxs[slots])
+        hit &= t_near <= t_end
+        if not np.any(hit):
+            return None
+        candidates = np.flatnonzero(hit)
+        best = candidates[np.argmin(t_near[candidates])]
+        return int(slots[best]), float(t_near[best])
+        
+    @staticmethod
+    def _better(a: Optional[Tuple[int, float]],
+                b: Optional[Tuple[int, float]]) -> Optional[Tuple[int, float]]:
+        """Pick the closer of two ray hits."""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return a if a[1] <= b[1] else b
+        
+    @staticmethod
+    def _ray_exit(origin: np.ndarray, direction: np.ndarray, box_min: np.ndarray,
+                  box_max: np.ndarray) -> float:
+        """Get the distance at which a ray leaves a box it intersects."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t1 = (box_min - origin) / direction
+            t2 = (box_max - origin) / direction
+        t_far = np.where(direction == 0.0, np.inf, np.maximum(t1, t2))
+        return float(t_far.min())
+        
+    def _walk_cells(self, origin: np.ndarray, direction: np.ndarray, t_start: float,
+                    t_end: float):
+        """Yield (cell, exit distance) for the cells a ray segment passes through."""
+        size = self.cell_size
+        start = origin + direction * t_start
+        cell = [int(math.floor(start[i] / size)) for i in range(3)]
+        
+        step = [0, 0, 0]
+        t_max = [math.inf, math.inf, math.inf]
+        t_delta = [math.inf, math.inf, math.inf]
+        for axis in range(3):
+            d = direction[axis]
+            if d > 0.0:
+                step[axis] = 1
+                t_max[axis] = t_start + ((cell[axis] + 1) * size - start[axis]) / d
+                t_delta[axis] = size / d
+            elif d < 0.0:
+                step[axis] = -1
+                t_max[axis] = t_start + (cell[axis] * size - start[axis]) / d
+                t_delta[axis] = -size / d
+                
+        t = t_start
+        while t <= t_end:
+            axis = t_max.index(min(t_max))
+            cell_exit = t_max[axis]
+            yield (cell[0], cell[1], cell[2]), cell_exit
+            t = cell_exit
+            cell[axis] += step[axis]
+            t_max[axis] += t_delta[axis]
+            
+    def _take_nearest(self, slots: np.ndarray, distances: np.ndarray,
+                      k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the ids and distances of the k closest slots, sorted."""
+        k = min(k, len(slots))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        closest = np.argpartition(distances, k - 1)[:k]
+        closest = closest[np.argsort(distances[closest])]
+        return self._slot_ids[slots[closest]], distances[closest]
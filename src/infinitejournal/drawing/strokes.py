@@ -0,0 +1,568 @@
+# src/infinitejournal/drawing/strokes.py
+"""Columnar stroke storage backed by shared NumPy point buffers."""
+
+import logging
+from collections import deque
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+DEFAULT_COLOR = (1.0, 1.0, 1.0, 1.0)
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    """Return a copy of array with its first dimension enlarged to capacity."""
+    grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class Stroke:
+    """Lightweight handle to a stroke living inside a StrokeStore.
+    
+    Handles hold no point data themselves. Every accessor resolves the
+    stroke's current offset in the store, so the returned arrays are views
+    into the shared buffers and stay valid until the store next grows or
+    compacts.
+    """
+    
+    __slots__ = ('store', 'stroke_id')
+    
+    def __init__(self, store: "StrokeStore", stroke_id: int):
+        self.store = store
+        self.stroke_id = stroke_id
+        
+    @property
+    def points(self) -> np.ndarray:
+        """Get the (N, 3) position view of this stroke."""
+        return self.store.get_points(self.stroke_id)
+        
+    @property
+    def pressures(self) -> np.ndarray:
+        """Get the (N,) pressure view of this stroke."""
+        return self.store.get_pressures(self.stroke_id)
+        
+    @property
+    def colors(self) -> np.ndarray:
+        """Get the (N, 4) color view of this stroke."""
+        return self.store.get_colors(self.stroke_id)
+        
+    @property
+    def bounds(self) -> tuple:
+        """Get the (min, max) bounding box corners of this stroke."""
+        return self.store.get_bounds(self.stroke_id)
+        
+    @property
+    def is_open(self) -> bool:
+        """Check if the stroke is still being drawn."""
+        return self.store.is_open(self.stroke_id)
+        
+    @property
+    def revision(self) -> int:
+        """Get the stroke's modification counter."""
+        return self.store.get_revision(self.stroke_id)
+        
+    def __len__(self) -> int:
+        return self.store.get_length(self.stroke_id)
+        
+    def __repr__(self) -> str:
+        return f"Stroke(id={self.stroke_id}, points={len(self)})"
+
+
+class StrokeStore:
+    """Stores every stroke's points in shared, growable float32 arrays.
+    
+    Point data is columnar: one (capacity, 3) array for positions, one
+    (capacity,) array for pressure and one (capacity, 4) array for color.
+    Each stroke owns a contiguous [offset, offset + length) slice of those
+    arrays. Per-stroke metadata (offset, length, bounds, ...) lives in a
+    second set of row arrays, so bulk queries over all strokes are plain
+    vectorized NumPy operations.
+    
+    Consumers that mirror the store (GPU buffers, indices) track changes
+    through `revision`, `changed_since` and `removed_since`.
+    """
+    
+    # Number of removals remembered for removed_since
+    REMOVAL_LOG_SIZE = 65536
+    
+    def __init__(self, point_capacity: int = 4096, stroke_capacity: int = 256):
+        """Initialize an empty store."""
+        self.logger = logging.getLogger(__name__)
+        
+        # Point buffers
+        self._positions = np.zeros((max(1, point_capacity), 3), dtype=np.float32)
+        self._pressures = np.zeros(max(1, point_capacity), dtype=np.float32)
+        self._colors = np.zeros((max(1, point_capacity), 4), dtype=np.float32)
+        self._point_count = 0  # High-water mark of used point slots
+        self._garbage = 0  # Point slots owned by removed or relocated strokes
+        
+        # Stroke rows
+        capacity = max(1, stroke_capacity)
+        self._ids = np.full(capacity, -1, dtype=np.int64)
+        self._offsets = np.zeros(capacity, dtype=np.int64)
+        self._lengths = np.zeros(capacity, dtype=np.int64)
+        self._capacities = np.zeros(capacity, dtype=np.int64)
+        self._bounds_min = np.zeros((capacity, 3), dtype=np.float32)
+        self._bounds_max = np.zeros((capacity, 3), dtype=np.float32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._open = np.zeros(capacity, dtype=bool)
+        self._revisions = np.zeros(capacity, dtype=np.int64)
+        self._row_count = 0
+        self._free_rows = []
+        self._rows = {}  # stroke id -> row
+        
+        self._next_id = 0
+        self.revision = 0  # Bumped on every change to any stroke
+        
+        # Recent removals as (revision, stroke id), for incremental consumers
+        self._removals = deque(maxlen=self.REMOVAL_LOG_SIZE)
+        self._removal_floor = 0  # Removals at or before this are forgotten
+        
+    # ----------------------------------------------------------------
+    # Stroke creation and editing
+    # ----------------------------------------------------------------
+    
+    def add_stroke(self, points: np.ndarray, pressures: Optional[np.ndarray] = None,
+                   colors: Optional[np.ndarray] = None, color: tuple = DEFAULT_COLOR,
+                   stroke_id: Optional[int] = None) -> Stroke:
+        """Add a finished stroke and return its handle."""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        count = len(points)
+        if count == 0:
+            raise ValueError("Cannot add a stroke without points")
+            
+        row = self._allocate_row(stroke_id)
+        offset = self._allocate_points(count)
+        self._write_points(offset, points, pressures, colors, color, count)
+        
+        self._offsets[row] = offset
+        self._lengths[row] = count
+        self._capacities[row] = count
+        self._bounds_min[row] = points.min(axis=0)
+        self._bounds_max[row] = points.max(axis=0)
+        self._touch(row)
+        return Stroke(self, int(self._ids[row]))
+        
+    def add_strokes(self, positions: np.ndarray, lengths: np.ndarray,
+                    pressures: Optional[np.ndarray] = None,
+                    colors: Optional[np.ndarray] = None,
+                    stroke_ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Bulk-add many finished strokes from concatenated point arrays.
+        
+        `positions` holds the points of all strokes back to back and
+        `lengths` the point count of each stroke. Returns the new stroke ids.
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        total = int(lengths.sum())
+        if total != len(positions):
+            raise ValueError(f"Stroke lengths sum to {total}, got {len(positions)} points")
+        if np.any(lengths <= 0):
+            raise ValueError("Cannot add a stroke without points")
+        stroke_count = len(lengths)
+        if stroke_count == 0:
+            return np.zeros(0, dtype=np.int64)
+            
+        if stroke_ids is None:
+            ids = np.arange(self._next_id, self._next_id + stroke_count, dtype=np.int64)
+        else:
+            ids = np.asarray(stroke_ids, dtype=np.int64).reshape(-1)
+            if len(ids) != stroke_count:
+                raise ValueError(f"Got {len(ids)} stroke ids for {stroke_count} strokes")
+            unique, counts = np.unique(ids, return_counts=True)
+            if np.any(counts > 1):
+                raise ValueError(f"Stroke ids repeated: {unique[counts > 1][:5].tolist()}")
+            clashes = [int(i) for i in ids if int(i) in self._rows]
+            if clashes:
+                raise ValueError(f"Stroke ids already in use: {clashes[:5]}")
+                
+        # Reserve point slots in one block
+        base = self._allocate_points(total)
+        self._write_points(base, positions, pressures, colors, DEFAULT_COLOR, total)
+        starts = np.zeros(stroke_count, dtype=np.int64)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        
+        # Reserve rows
+        rows = np.array([self._allocate_row(int(i)) for i in ids], dtype=np.int64)
+        
+        self._offsets[rows] = base + starts
+        self._lengths[rows] = lengths
+        self._capacities[rows] = lengths
+        self._bounds_min[rows] = np.minimum.reduceat(positions, starts, axis=0)
+        self._bounds_max[rows] = np.maximum.reduceat(positions, starts, axis=0)
+        self.revision += 1
+        self._revisions[rows] = self.revision
+        return ids
+        
+    def begin_stroke(self, color: tuple = DEFAULT_COLOR, stroke_id: Optional[int] = None,
+                     reserve: int = 64) -> Stroke:
+        """Start an open stroke that grows through append_points."""
+        reserve = max(1, reserve)
+        row = self._allocate_row(stroke_id)
+        offset = self._allocate_points(reserve)
+        self._colors[offset:offset + reserve] = color
+        
+        self._offsets[row] = offset
+        self._lengths[row] = 0
+        self._capacities[row] = reserve
+        self._bounds_min[row] = np.inf
+        self._bounds_max[row] = -np.inf
+        self._open[row] = True
+        self._touch(row)
+        return Stroke(self, int(self._ids[row]))
+        
+    def append_points(self, stroke_id: int, points: np.ndarray,
+                      pressures: Optional[np.ndarray] = None):
+        """Append points to an open stroke, relocating it if it runs out of room."""
+        row = self._row(stroke_id)
+        if not self._open[row]:
+            raise ValueError(f"Stroke {stroke_id} is not open")
+            
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        count = len(points)
+        if count == 0:
+            return
+            
+        # The stroke color lives in its reserved slots; read it before a
+        # relocation, which only carries over the points written so far
+        length = int(self._lengths[row])
+        color = self._colors[int(self._offsets[row])].copy()
+        if length + count > self._capacities[row]:
+            self._relocate(row, max(2 * int(self._capacities[row]), length + count))
+            
+        start = int(self._offsets[row]) + length
+        self._write_points(start, points, pressures, None, color, count)
+        
+        self._lengths[row] = length + count
+        np.minimum(self._bounds_min[row], points.min(axis=0), out=self._bounds_min[row])
+        np.maximum(self._bounds_max[row], points.max(axis=0), out=self._bounds_max[row])
+        self._touch(row)
+        
+    def end_stroke(self, stroke_id: int):
+        """Close an open stroke, removing it again if it never received points."""
+        row = self._row(stroke_id)
+        self._open[row] = False
+        if self._lengths[row] == 0:
+            self.remove_stroke(stroke_id)
+            return
+            
+        # Release the unused part of the reservation
+        unused = int(self._capacities[row] - self._lengths[row])
+        if self._offsets[row] + self._capacities[row] == self._point_count:
+            self._point_count -= unused
+        else:
+            self._garbage += unused
+        self._capacities[row] = self._lengths[row]
+        self._touch(row)
+        
+    def remove_stroke(self, stroke_id: int):
+        """Remove a stroke from the store."""
+        row = self._row(stroke_id)
+        self._garbage += int(self._capacities[row])
+        self._alive[row] = False
+        self._open[row] = False
+        self._ids[row] = -1
+        del self._rows[int(stroke_id)]
+        self._free_rows.append(row)
+        self.revision += 1
+        if len(self._removals) == self._removals.maxlen:
+            self._removal_floor = self._removals[0][0]
+        self._removals.append((self.revision, int(stroke_id)))
+        
+    def remove_strokes(self, stroke_ids):
+        """Remove several strokes from the store."""
+        for stroke_id in stroke_ids:
+            self.remove_stroke(int(stroke_id))
+            
+    def clear(self):
+        """Remove every stroke and release the point buffers' contents."""
+        self._alive[:] = False
+        self._open[:] = False
+        self._ids[:] = -1
+        self._rows.clear()
+        self._free_rows = []
+        self._row_count = 0
+        self._point_count = 0
+        self._garbage = 0
+        self.revision += 1
+        self._removals.clear()
+        self._removal_floor = self.revision
+        
+    def reserve_ids(self, next_id: int):
+        """Make sure ids handed out from now on are at least next_id."""
+        self._next_id = max(self._next_id, int(next_id))
+        
+    @property
+    def next_id(self) -> int:
+        """Get the id the next new stroke will receive."""
+        return self._next_id
+        
+    # ----------------------------------------------------------------
+    # Access
+    # ----------------------------------------------------------------
+    
+    def get(self, stroke_id: int) -> Stroke:
+        """Get a handle to an existing stroke."""
+        self._row(stroke_id)
+        return Stroke(self, stroke_id)
+        
+    def get_points(self, stroke_id: int) -> np.ndarray:
+        """Get a view of a stroke's positions."""
+        start, end = self._span(stroke_id)
+        return self._positions[start:end]
+        
+    def get_pressures(self, stroke_id: int) -> np.ndarray:
+        """Get a view of a stroke's pressures."""
+        start, end = self._span(stroke_id)
+        return self._pressures[start:end]
+        
+    def get_colors(self, stroke_id: int) -> np.ndarray:
+        """Get a view of a stroke's colors."""
+        start, end = self._span(stroke_id)
+        return self._colors[start:end]
+        
+    def get_bounds(self, stroke_id: int) -> tuple:
+        """Get copies of a stroke's bounding box corners."""
+        row = self._row(stroke_id)
+        return self._bounds_min[row].copy(), self._bounds_max[row].copy()
+        
+    def get_length(self, stroke_id: int) -> int:
+        """Get the number of points in a stroke."""
+        return int(self._lengths[self._row(stroke_id)])
+        
+    def get_revision(self, stroke_id: int) -> int:
+        """Get the revision at which a stroke last changed."""
+        return int(self._revisions[self._row(stroke_id)])
+        
+    def is_open(self, stroke_id: int) -> bool:
+        """Check if a stroke is still being drawn."""
+        return bool(self._open[self._row(stroke_id)])
+        
+    def stroke_ids(self) -> np.ndarray:
+        """Get the ids of all live strokes."""
+        rows = self._live_rows()
+        return self._ids[rows].copy()
+        
+    def get_all_bounds(self) -> tuple:
+        """Get (ids, mins, maxs) for every live stroke with at least one point."""
+        rows = self._live_rows()
+        rows = rows[self._lengths[rows] > 0]
+        return self._ids[rows].copy(), self._bounds_min[rows], self._bounds_max[rows]
+        
+    def get_spans(self, stroke_ids: np.ndarray) -> tuple:
+        """Get (offsets, lengths) of several strokes for vectorized gathers."""
+        rows = np.fromiter((self._rows[int(i)] for i in stroke_ids), dtype=np.int64,
+                           count=len(stroke_ids))
+        return self._offsets[rows].copy(), self._lengths[rows].copy()
+        
+    def gather(self, stroke_ids: np.ndarray) -> tuple:
+        """Copy several strokes' points into concatenated arrays.
+        
+        Returns (positions, lengths, pressures, colors) with the strokes back
+        to back in the given order, ready for add_strokes.
+        """
+        offsets, lengths = self.get_spans(stroke_ids)
+        starts = np.cumsum(lengths) - lengths
+        rows = np.repeat(offsets - starts, lengths) + np.arange(int(lengths.sum()))
+        return self._positions[rows], lengths, self._pressures[rows], self._colors[rows]
+        
+    def changed_since(self, revision: int) -> np.ndarray:
+        """Get the ids of live strokes added or modified after a revision."""
+        rows = self._live_rows()
+        return self._ids[rows[self._revisions[rows] > revision]]
+        
+    def removed_since(self, revision: int) -> Optional[np.ndarray]:
+        """Get the ids of strokes removed after a revision.
+        
+        Returns None if the removal log no longer reaches back that far, in
+        which case the caller has to resynchronize from scratch.
+        """
+        if revision < self._removal_floor:
+            return None
+        ids = []
+        for rev, stroke_id in reversed(self._removals):
+            if rev <= revision:
+                break
+            ids.append(stroke_id)
+        return np.array(ids, dtype=np.int64)
+        
+    @property
+    def positions(self) -> np.ndarray:
+        """Get the used part of the shared position buffer."""
+        return self._positions[:self._point_count]
+        
+    @property
+    def pressures(self) -> np.ndarray:
+        """Get the used part of the shared pressure buffer."""
+        return self._pressures[:self._point_count]
+        
+    @property
+    def colors(self) -> np.ndarray:
+        """Get the used part of the shared color buffer."""
+        return self._colors[:self._point_count]
+        
+    @property
+    def point_count(self) -> int:
+        """Get the number of points held by live strokes."""
+        return self._point_count - self._garbage
+        
+    @property
+    def nbytes(self) -> int:
+        """Get the memory held by the point and row buffers."""
+        return sum(array.nbytes for array in (
+            self._positions, self._pressures, self._colors, self._ids, self._offsets,
+            self._lengths, self._capacities, self._bounds_min, self._bounds_max,
+            self._alive, self._open, self._revisions
+        ))
+        
+    def __contains__(self, stroke_id: int) -> bool:
+        return stroke_id in self._rows
+        
+    def __len__(self) -> int:
+        return len(self._rows)
+        
+    def __iter__(self) -> Iterator[Stroke]:
+        for stroke_id in self.stroke_ids():
+            yield Stroke(self, int(stroke_id))
+            
+    # ----------------------------------------------------------------
+    # Maintenance
+    # ----------------------------------------------------------------
+    
+    def compact(self):
+        """Pack live stroke points together, dropping holes left by removals."""
+        rows = self._live_rows()
+        if self._garbage == 0:
+            return
+            
+        lengths = self._lengths[rows]
+        capacities = np.where(self._open[rows], self._capacities[rows], lengths)
+        total = int(capacities.sum())
+        new_offsets = np.zeros(len(rows), dtype=np.int64)
+        if len(rows) > 1:
+            np.cumsum(capacities[:-1], out=new_offsets[1:])
+            
+        # Gather every live slot (including open strokes' reserve) in one pass
+        source = np.repeat(self._offsets[rows] - new_offsets, capacities) + np.arange(total)
+        self._positions[:total] = self._positions[source]
+        self._pressures[:total] = self._pressures[source]
+        self._colors[:total] = self._colors[source]
+        
+        self._offsets[rows] = new_offsets
+        self._capacities[rows] = capacities
+        reclaimed = self._point_count - total
+        self._point_count = total
+        self._garbage = 0
+        self.revision += 1
+        self.logger.debug(f"Compacted stroke store, reclaimed {reclaimed} point slots")
+        
+    def maybe_compact(self, threshold: float = 0.5):
+        """Compact when more than `threshold` of used point slots are garbage."""
+        if self._point_count and self._garbage / self._point_count > threshold:
+            self.compact()
+            
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+    
+    def _row(self, stroke_id: int) -> int:
+        """Resolve a stroke id to its row."""
+        try:
+            return self._rows[stroke_id]
+        except KeyError:
+            raise KeyError(f"Unknown stroke id {stroke_id}") from None
+            
+    def _span(self, stroke_id: int) -> tuple:
+        """Get the [start, end) point range of a stroke."""
+        row = self._row(stroke_id)
+        start = int(self._offsets[row])
+        return start, start + int(self._lengths[row])
+        
+    def _live_rows(self) -> np.ndarray:
+        """Get the rows of all live strokes."""
+        return np.flatnonzero(self._alive[:self._row_count])
+        
+    def _touch(self, row: int):
+        """Record a modification of a stroke."""
+        self.revision += 1
+        self._revisions[row] = self.revision
+        
+    def _allocate_row(self, stroke_id: Optional[int]) -> int:
+        """Reserve a metadata row for a new stroke."""
+        if stroke_id is None:
+            stroke_id = self._next_id
+        elif stroke_id in self._rows:
+            raise ValueError(f"Stroke id {stroke_id} already in use")
+        self._next_id = max(self._next_id, stroke_id + 1)
+        
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            if self._row_count == len(self._ids):
+                self._grow_rows(2 * len(self._ids))
+            row = self._row_count
+            self._row_count += 1
+            
+        self._ids[row] = stroke_id
+        self._alive[row] = True
+        self._open[row] = False
+        self._rows[stroke_id] = row
+        return row
+        
+    def _allocate_points(self, count: int) -> int:
+        """Reserve `count` contiguous point slots at the end of the buffers."""
+        required = self._point_count + count
+        if required > len(self._positions):
+            capacity = len(self._positions)
+            while capacity < required:
+                capacity *= 2
+            self._positions = _grow(self._positions[:self._point_count], capacity)
+            self._pressures = _grow(self._pressures[:self._point_count], capacity)
+            self._colors = _grow(self._colors[:self._point_count], capacity)
+            
+        offset = self._point_count
+        self._point_count = required
+        return offset
+        
+    def _write_points(self, offset: int, points: np.ndarray, pressures, colors, color,
+                      count: int):
+        """Copy point attributes into the shared buffers."""
+        end = offset + count
+        self._positions[offset:end] = points
+        self._pressures[offset:end] = 1.0 if pressures is None else pressures
+        self._colors[offset:end] = color if colors is None else colors
+        
+    def _relocate(self, row: int, capacity: int):
+        """Move a stroke to the end of the buffers with a larger reservation."""
+        offset = int(self._offsets[row])
+        length = int(self._lengths[row])
+        old_capacity = int(self._capacities[row])
+        
+        if offset + old_capacity == self._point_count:
+            # Already the last block; just extend it in place
+            self._allocate_points(capacity - old_capacity)
+        else:
+            new_offset = self._allocate_points(capacity)
+            end = new_offset + length
+            self._positions[new_offset:end] = self._positions[offset:offset + length]
+            self._pressures[new_offset:end] = self._pressures[offset:offset + length]
+            self._colors[new_offset:end] = self._colors[offset:offset + length]
+            self._offsets[row] = new_offset
+            self._garbage += old_capacity
+            
+        self._capacities[row] = capacity
+        
+    def _grow_rows(self, capacity: int):
+        """Enlarge all per-stroke row arrays."""
+        self._ids = np.concatenate([self._ids, np.full(capacity - len(self._ids), -1,
+                                                       dtype=np.int64)])
+        self._offsets = _grow(self._offsets, capacity)
+        self._lengths = _grow(self._lengths, capacity)
+        self._capacities = _grow(self._capacities, capacity)
+        self._bounds_min = _grow(self._bounds_min, capacity)
+        self._bounds_max = _grow(self._bounds_max, capacity)
+        self._alive = _grow(self._alive, capacity)
+        self._open = _grow(self._open, capacity)
+        self._revisions = _grow(self._revisions, capacity)
@@ -2,44 +2,104 @@
 
 import logging
 import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Optional
 from infinitejournal.backends.base import Backend
 from infinitejournal.config import Config
+from infinitejournal.interface.recording import InputPlayback, InputRecorder
+from infinitejournal.utilities.logging import StartupTimer
 
 
 class Application:
     """Main application class."""
     
-    def __init__(self, backend: Backend, config: Config):
-        """Initialize application."""
+    def __init__(self, backend: Backend, config: Config, world_loader: Optional[Future] = None,
+                 startup: Optional[StartupTimer] = None):
+        """Initialize application.
+        
+        `world_loader` is a future for world storage already being opened
+        in the background; `startup` times the startup phases.
+        """
         self.backend = backend
         self.config = config
+        self.world_loader = world_loader
+        self.startup = startup if startup is not None else StartupTimer()
         self.logger = logging.getLogger(__name__)
         self.frame_count = 0
         self.fps_update_time = 0
         self.current_fps = 0
+        self.scene = None
+        self.recorder = None
+        self.playback = None
         
     def run(self):
         """Run the main application loop."""
         try:
-            # Initialize backend
-            self.backend.initialize()
-            self.backend.start()
+            startup = self.startup
+            with startup.phase("window"):
+                # Initialize backend
+                self.backend.initialize()
+                self.backend.start()
+                
+                # Show the window before the world is ready
+                self.backend.clear()
+                self.backend.present()
+                
+            # Wait for the journal index, if it is still being read
+            storage = None
+            if self.world_loader is not None:
+                with startup.phase("journal"):
+                    storage = self.world_loader.result()
+                    
+            with startup.phase("scene"):
+                # The scene modules are only needed once the window is up
+                from infinitejournal.world.scene import Scene
+                
+                # Create the world once the GL context exists
+                self.scene = Scene(self.config, storage)
+                self.scene.initialize()
+                self.scene.resize(self.config.window_width, self.config.window_height)
+                self._open_input_session()
+            startup.log_summary()
             
             self.logger.info("Starting main loop...")
             
-            # Main loop
+            # Main loop: fixed simulation steps, rendering as often as the pacing allows
+            profiler = self.scene.profiler
+            step = 1.0 / self.config.update_rate
+            max_frame_time = step * self.config.max_updates_per_frame
+            accumulator = 0.0
             while self.backend.is_running():
                 # Get delta time
                 delta_time = self.backend.get_delta_time()
+                profiler.begin_frame()
                 
                 # Handle events
-                self.backend.handle_events()
-                
-                # Update
-                self.update(delta_time)
-                
-                # Render
-                self.render()
+                with profiler.scope("events"):
+                    events = self.backend.handle_events()
+                    if self.playback is not None:
+                        # Live input is ignored; the window still handles quit
+                        if self.playback.finished:
+                            self.logger.info("Input playback finished")
+                            break
+                        delta_time, events = self.playback.next_frame()
+                    if self.recorder is not None:
+                        self.recorder.begin_frame(delta_time)
+                        for event in events:
+                            self.recorder.record_event(event)
+                    self.scene.handle_events(events)
+                        
+                # Update in fixed steps; after a long stall, drop time
+                # rather than running a burst of catch-up steps
+                accumulator += min(delta_time, max_frame_time)
+                while accumulator >= step:
+                    self.update(step)
+                    accumulator -= step
+                    
+                # Render between the last two steps
+                self.render(accumulator / step)
+                profiler.end_frame()
                 
                 # Update FPS counter
                 self.update_fps(delta_time)
@@ -47,32 +107,77 @@ class Application:
         except Exception as e:
             self.logger.error(f"Error in main loop: {e}", exc_info=True)
         finally:
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.scene is not None:
+                if self.config.profile_trace_on_exit:
+                    self.export_trace()
+                self.scene.cleanup()
+            else:
+                self._release_preloaded_storage()
             self.backend.shutdown()
             
+    def _release_preloaded_storage(self):
+        """Close the preloaded world storage when no scene took it over.
+        
+        A storage still being opened is closed once it is ready.
+        """
+        if self.world_loader is None:
+            return
+            
+        def close(future):
+            if not future.cancelled() and future.exception() is None:
+                future.result().close()
+                
+        # Runs right away if the storage is already open
+        self.world_loader.add_done_callback(close)
+            
+    def _open_input_session(self):
+        """Start recording or playing back input if configured."""
+        if self.config.playback_input_path:
+            self.playback = InputPlayback(self.config.playback_input_path,
+                                          self.config.playback_timestep)
+            self.scene.player.replaying = True
+        elif self.config.record_input_path:
+            self.recorder = InputRecorder(self.config.record_input_path)
+            
     def update(self, delta_time: float):
         """Update application state."""
-        # TODO: Update camera, world, etc.
-        pass
+        self.scene.update(delta_time)
         
-    def render(self):
+    def render(self, alpha: float = 1.0):
         """Render the frame."""
-        # Clear screen
-        self.backend.clear()
+        # Render world
+        self.scene.render(alpha)
         
-        # TODO: Render world, UI, etc.
+        # TODO: Render UI, etc.
         
         # Show FPS if enabled
         if self.config.show_fps:
             self.render_fps()
-        
+            
         # Present frame
-        self.backend.present()
-        
+        with self.scene.profiler.scope("present"):
+            self.backend.present()
+            
     def render_fps(self):
         """Render FPS counter."""
         # For now, just log it
         if self.current_fps > 0:
-            self.logger.debug(f"FPS: {self.current_fps:.1f}")
+            percentiles = self.scene.profiler.frame_time_percentiles()
+            self.logger.debug(
+                f"FPS: {self.current_fps:.1f} "
+                f"(p50 {percentiles['p50']:.2f} ms, p99 {percentiles['p99']:.2f} ms)"
+            )
+            
+    def export_trace(self):
+        """Write the recent frames as a Chrome trace to the save directory."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = self.config.save_directory / "traces" / f"trace_{timestamp}.json"
+        try:
+            self.scene.profiler.export_chrome_trace(path)
+        except OSError as e:
+            self.logger.error(f"Failed to write trace: {e}")
             
     def update_fps(self, delta_time: float):
         """Update FPS counter."""
@@ -0,0 +1,199 @@
+# src/infinitejournal/interface/recording.py
+"""Input recording and deterministic playback.
+
+A recording holds, for every frame, the delta time and the input events
+the application received. Files are gzip-compressed binary: a header
+followed by one record per frame, each listing its events as a type, a
+timestamp and a few integer fields.
+"""
+
+import gzip
+import logging
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pygame
+
+RECORDING_MAGIC = b"IJIR"
+RECORDING_VERSION = 1
+RECORDING_EXTENSION = ".ijr"
+
+HEADER = struct.Struct("<4sHH")     # magic, version, reserved
+FRAME = struct.Struct("<dH")        # delta_time, event count
+EVENT = struct.Struct("<HBI")       # type, field count, milliseconds since start
+
+# Integer fields saved per event type; tuple-valued attributes are flattened
+EVENT_FIELDS = {
+    pygame.KEYDOWN: (('key', 1), ('mod', 1), ('scancode', 1)),
+    pygame.KEYUP: (('key', 1), ('mod', 1), ('scancode', 1)),
+    pygame.MOUSEMOTION: (('pos', 2), ('rel', 2), ('buttons', 3)),
+    pygame.MOUSEBUTTONDOWN: (('pos', 2), ('button', 1)),
+    pygame.MOUSEBUTTONUP: (('pos', 2), ('button', 1)),
+    pygame.MOUSEWHEEL: (('x', 1), ('y', 1)),
+    pygame.VIDEORESIZE: (('w', 1), ('h', 1)),
+}
+
+
+def encode_event(event) -> Optional[Tuple[int, List[int]]]:
+    """Flatten an event to (type, fields), or None if it is not recorded."""
+    layout = EVENT_FIELDS.get(event.type)
+    if layout is None:
+        return None
+    values = []
+    for name, size in layout:
+        value = getattr(event, name, 0)
+        if size == 1:
+            values.append(int(value))
+        else:
+            values.extend(int(v) for v in value)
+    return event.type, values
+
+
+def decode_event(event_type: int, values: List[int]):
+    """Rebuild a pygame event from its flattened fields."""
+    attributes = {}
+    index = 0
+    for name, size in EVENT_FIELDS.get(event_type, ()):
+        if size == 1:
+            attributes[name] = values[index]
+        else:
+            attributes[name] = tuple(values[index:index + size])
+        index += size
+    return pygame.event.Event(event_type, attributes)
+
+
+class InputRecorder:
+    """Writes the frames and input events of a session to a file.
+    
+    The compressed stream is flushed every FLUSH_INTERVAL frames, so a
+    session that is killed without closing the file loses at most the
+    frames since the last flush.
+    """
+    
+    FLUSH_INTERVAL = 60
+    
+    def __init__(self, path: Path):
+        """Open a recording file for writing."""
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.path, 'wb')
+        self._file.write(HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, 0))
+        self._start = time.perf_counter()
+        self._delta_time = None
+        self._events: List[bytes] = []
+        self.frame_count = 0
+        self.event_count = 0
+        
+    def begin_frame(self, delta_time: float):
+        """Start a frame; events recorded next belong to it."""
+        self._flush_frame()
+        self._delta_time = delta_time
+        
+    def record_event(self, event):
+        """Record an event of the current frame; unsupported types are ignored."""
+        encoded = encode_event(event)
+        if encoded is None:
+            return
+        event_type, values = encoded
+        millis = int((time.perf_counter() - self._start) * 1000.0) & 0xFFFFFFFF
+        self._events.append(EVENT.pack(event_type, len(values), millis) +
+                            struct.pack(f"<{len(values)}i", *values))
+    
+    def close(self):
+        """Write the last frame and close the file."""
+        if self._file is None:
+            return
+        self._flush_frame()
+        self._file.close()
+        self._file = None
+        self.logger.info(f"Recorded {self.frame_count} frames and {self.event_count} events "
+                         f"to {self.path}")
+    
+    def _flush_frame(self):
+        """Write the pending frame."""
+        if self._delta_time is None:
+            return
+        self._file.write(FRAME.pack(self._delta_time, len(self._events)))
+        self._file.write(b"".join(self._events))
+        self.frame_count += 1
+        self.event_count += len(self._events)
+        self._delta_time = None
+        self._events = []
+        if self.frame_count % self.FLUSH_INTERVAL == 0:
+            self._file.flush()
+
+
+class InputPlayback:
+    """Feeds a recording back one frame at a time.
+    
+    Each frame replays its recorded delta time, or `timestep` when it is
+    positive, so playback does not depend on how fast frames are drawn.
+    """
+    
+    def __init__(self, path: Path, timestep: float = 0.0):
+        """Load a recording."""
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.timestep = timestep
+        self.frames = self._read(self.path)
+        self.frame_index = 0
+        self.logger.info(f"Loaded {len(self.frames)} frames from {self.path}")
+        
+    @property
+    def finished(self) -> bool:
+        """Check if every frame has been played."""
+        return self.frame_index >= len(self.frames)
+        
+    def next_frame(self) -> Tuple[float, list]:
+        """Get the delta time and events of the next frame."""
+        if self.finished:
+            raise RuntimeError("Input playback has no frames left")
+        delta_time, events = self.frames[self.frame_index]
+        self.frame_index += 1
+        if self.timestep > 0:
+            delta_time = self.timestep
+        return delta_time, [decode_event(event_type, values) for event_type, values in events]
+        
+    def rewind(self):
+        """Start playing from the first frame again."""
+        self.frame_index = 0
+        
+    @staticmethod
+    def _read(path: Path) -> List[Tuple[float, List[Tuple[int, List[int]]]]]:
+        """Parse a recording file; a truncated last frame is dropped."""
+        # A session that ended without closing the file leaves a stream with
+        # no gzip trailer; a raw decompressor keeps everything written so far
+        data = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(path.read_bytes())
+        if len(data) < HEADER.size:
+            raise ValueError(f"Recording is too short: {path}")
+        magic, version, _ = HEADER.unpack_from(data, 0)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"Not an input recording: {path}")
+        if version != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {version}: {path}")
+            
+        frames = []
+        position = HEADER.size
+        while position + FRAME.size <= len(data):
+            delta_time, count = FRAME.unpack_from(data, position)
+            cursor = position + FRAME.size
+            events = []
+            for _ in range(count):
+                if cursor + EVENT.size > len(data):
+                    break
+                event_type, field_count, _ = EVENT.unpack_from(data, cursor)
+                cursor += EVENT.size
+                end = cursor + 4 * field_count
+                if end > len(data):
+                    break
+                events.append((event_type, list(struct.unpack_from(f"<{field_count}i", data, cursor))))
+                cursor = end
+            if len(events) < count:
+                break
+            frames.append((delta_time, events))
+            position = cursor
+        return frames
@@ -1,20 +1,59 @@
 """Main entry point for the Infinite Journal application."""
 
 import sys
+import argparse
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 # Add the src directory to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Only light modules are imported here; pygame, PyOpenGL and numpy are
+# imported by the startup phases that need them
 from infinitejournal.config import Config
-from infinitejournal.backends.opengl.backend import OpenGLBackend
-from infinitejournal.interface.framework import Application
-from infinitejournal.utilities.logging import setup_logging
+from infinitejournal.utilities.logging import StartupTimer, setup_logging
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Infinite Journal")
+    parser.add_argument('--record', metavar='PATH', help="record input to a file")
+    parser.add_argument('--playback', metavar='PATH', help="replay recorded input")
+    parser.add_argument('--timestep', type=float, default=0.0,
+                        help="fixed delta time per replayed frame (default: as recorded)")
+    parser.add_argument('--uncapped', action='store_true',
+                        help="render as fast as possible, ignoring vsync and the FPS cap")
+    parser.add_argument('--trace', action='store_true',
+                        help="write a Chrome trace of the last frames on exit")
+    parser.add_argument('--gl-debug', action='store_true',
+                        help="check every GL call and log driver debug messages")
+    return parser.parse_args(argv)
+
+
+def start_world_preload(config: Config) -> Future:
+    """Open the world storage on a background thread.
+    
+    Reading the checkpoint and replaying the edit log then overlaps with
+    importing the GL stack and creating the window.
+    """
+    def load():
+        from infinitejournal.storage.world import WorldStorage
+        storage = WorldStorage(config.save_directory / "world")
+        storage.open()
+        return storage
+        
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="world-preload")
+    future = executor.submit(load)
+    executor.shutdown(wait=False)
+    return future
 
 
 def main():
     """Main entry point for the application."""
+    startup = StartupTimer()
+    args = parse_args()
+    
     # Setup logging
     setup_logging()
     logger = logging.getLogger(__name__)
@@ -23,13 +62,30 @@ def main():
     
     try:
         # Load configuration
-        config = Config()
+        with startup.phase("config"):
+            config = Config()
+            config.record_input_path = args.record or ""
+            config.playback_input_path = args.playback or ""
+            config.playback_timestep = args.timestep
+            config.profile_trace_on_exit = config.profile_trace_on_exit or args.trace
+            config.uncapped = config.uncapped or args.uncapped
+            config.gl_debug = config.gl_debug or args.gl_debug
+            
+        # Start reading the journal index while the window comes up
+        world_loader = start_world_preload(config)
         
+        with startup.phase("imports"):
+            # PyOpenGL reads its flags when OpenGL.GL is first imported
+            from infinitejournal.backends.opengl.options import configure_pyopengl
+            configure_pyopengl(config.gl_performance_mode, config.gl_debug)
+            from infinitejournal.backends.opengl.backend import OpenGLBackend
+            from infinitejournal.interface.framework import Application
+            
         # Initialize backend
         backend = OpenGLBackend(config)
         
         # Create and run application
-        app = Application(backend, config)
+        app = Application(backend, config, world_loader, startup)
         app.run()
         
     except Exception as e:
@@ -0,0 +1,160 @@
+# src/infinitejournal/storage/cache.py
+"""Least-recently-used cache bounded by a memory budget."""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class ByteBudgetCache:
+    """LRU cache whose entries are weighed by their size in bytes.
+    
+    Each entry carries its own size and an optional callback run when the
+    cache evicts it, so one cache can hold decoded chunk data and GPU
+    buffers alike and free either the right way. Taking an entry out with
+    `pop` hands ownership back to the caller without running the callback.
+    """
+    
+    # Bookkeeping cost charged to every entry, so empty payloads still count
+    ENTRY_OVERHEAD = 256
+    
+    def __init__(self, budget_bytes: int, name: str = "cache"):
+        """Initialize an empty cache."""
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self._budget = max(0, int(budget_bytes))
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, nbytes, on_evict)
+        self._nbytes = 0
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        
+    # ----------------------------------------------------------------
+    # Access
+    # ----------------------------------------------------------------
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get an entry and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+        
+    def pop(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        """Take an entry out of the cache; the caller now owns it.
+        
+        With `count` False the lookup is left out of the hit statistics,
+        for secondary entries fetched alongside a counted one.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            if count:
+                self.misses += 1
+            return default
+        if count:
+            self.hits += 1
+        self._nbytes -= entry[1]
+        return entry[0]
+        
+    def put(self, key: Hashable, value: Any, nbytes: int,
+            on_evict: Optional[Callable[[], None]] = None):
+        """Insert or replace an entry, evicting old ones to stay in budget.
+        
+        Entries larger than the whole budget are evicted right away.
+        """
+        self.discard(key)
+        nbytes = max(0, int(nbytes)) + self.ENTRY_OVERHEAD
+        self._entries[key] = (value, nbytes, on_evict)
+        self._nbytes += nbytes
+        self._shrink(self._budget)
+        
+    def discard(self, key: Hashable):
+        """Drop an entry, running its eviction callback."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[1]
+            self._release(key, entry)
+            
+    def clear(self):
+        """Evict every entry."""
+        self._shrink(0)
+        
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+        
+    def __len__(self) -> int:
+        return len(self._entries)
+        
+    # ----------------------------------------------------------------
+    # Budget and statistics
+    # ----------------------------------------------------------------
+    
+    @property
+    def budget(self) -> int:
+        """Get the memory budget in bytes."""
+        return self._budget
+        
+    def set_budget(self, budget_bytes: int):
+        """Change the memory budget, evicting entries if it shrank."""
+        self._budget = max(0, int(budget_bytes))
+        self._shrink(self._budget)
+        
+    @property
+    def nbytes(self) -> int:
+        """Get the total size of the cached entries."""
+        return self._nbytes
+        
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+        
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            'entries': len(self._entries),
+            'bytes': self._nbytes,
+            'budget': self._budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'evicted_bytes': self.evicted_bytes
+        }
+        
+    def reset_stats(self):
+        """Reset the hit, miss and eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+    
+    def _shrink(self, limit: int):
+        """Evict least recently used entries until the total fits limit."""
+        while self._entries and self._nbytes > limit:
+            key, entry = self._entries.popitem(last=False)
+            self._nbytes -= entry[1]
+            self.evictions += 1
+            self.evicted_bytes += entry[1]
+            self._release(key, entry)
+            
+    def _release(self, key: Hashable, entry: tuple):
+        """Run an entry's eviction callback."""
+        on_evict = entry[2]
+        if on_evict is None:
+            return
+        try:
+            on_evict()
+        except Exception as e:
+            self.logger.error(f"Failed to release {self.name} entry {key}: {e}")
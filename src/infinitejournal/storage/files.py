@@ -0,0 +1,136 @@
+# src/infinitejournal/storage/files.py
+"""Chunk file access with memory-mapped, zero-copy loading."""
+
+import logging
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+from infinitejournal.storage.formats import CHUNK_EXTENSION, ChunkData, decode_chunk
+from infinitejournal.world.chunks import ChunkCoord
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write a file so readers only ever see the old or the new content.
+    
+    The temporary file has a unique name, so concurrent writers (other
+    threads or processes) never write into each other's copy.
+    """
+    path = Path(path)
+    descriptor, temporary = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp",
+                                             dir=path.parent)
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        raise
+
+
+class MappedChunk:
+    """A chunk file mapped into memory.
+    
+    The arrays of `data` are views into the mapping, so opening a chunk
+    only touches the pages that are actually read. The mapping stays open
+    while those views are alive.
+    """
+    
+    def __init__(self, path: Path):
+        """Map a chunk file and parse it."""
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size == 0:
+                raise ValueError(f"Chunk file is empty: {self.path}")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data: Optional[ChunkData] = decode_chunk(memoryview(self._mmap))
+        except Exception:
+            self.close()
+            raise
+            
+    @property
+    def nbytes(self) -> int:
+        """Get the size of the mapped file."""
+        return len(self._mmap) if self._mmap is not None else 0
+        
+    def close(self):
+        """Unmap the file.
+        
+        Views handed out earlier keep the mapping alive; in that case it is
+        released once they are garbage collected.
+        """
+        self.data = None
+        mapping = getattr(self, '_mmap', None)
+        self._mmap = None
+        if mapping is not None:
+            try:
+                mapping.close()
+            except BufferError:
+                pass
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            
+    def __enter__(self) -> "MappedChunk":
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ChunkFiles:
+    """Directory of chunk files named by chunk coordinate."""
+    
+    def __init__(self, directory: Path):
+        """Initialize; the directory is created on first write."""
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        
+    def path(self, coord: ChunkCoord) -> Path:
+        """Get the file path of a chunk."""
+        x, y, z = coord
+        return self.directory / f"{x}_{y}_{z}{CHUNK_EXTENSION}"
+        
+    def exists(self, coord: ChunkCoord) -> bool:
+        """Check if a chunk has been saved."""
+        return self.path(coord).exists()
+        
+    def load(self, coord: ChunkCoord) -> Optional[MappedChunk]:
+        """Map a chunk file, or return None if it does not exist."""
+        path = self.path(coord)
+        if not path.exists():
+            return None
+        return MappedChunk(path)
+        
+    def save(self, coord: ChunkCoord, data: bytes):
+        """Atomically replace a chunk file with encoded chunk data."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path(coord), data)
+        
+    def delete(self, coord: ChunkCoord):
+        """Remove a chunk file if present."""
+        try:
+            self.path(coord).unlink()
+        except FileNotFoundError:
+            pass
+            
+    def coords(self) -> Iterator[ChunkCoord]:
+        """Iterate over the coordinates of all saved chunks."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob(f"*{CHUNK_EXTENSION}"):
+            try:
+                x, y, z = (int(part) for part in path.stem.split('_'))
+            except ValueError:
+                self.logger.warning(f"Ignoring unexpected file in chunk directory: {path.name}")
+                continue
+            yield (x, y, z)
@@ -0,0 +1,319 @@
+# src/infinitejournal/storage/formats.py
+"""Binary on-disk format for world chunks.
+
+A chunk file is laid out as:
+
+    header          fixed-size, see CHUNK_HEADER
+    stroke table    one STROKE_TABLE_DTYPE record per stroke
+    positions       (N, 3) float32, or uint16 when quantized
+    pressures       (N,) float32, or uint8 when quantized
+    colors          (N, 4) float32, or uint8 when quantized
+
+All values are little-endian and every block starts on a 16-byte
+boundary, so an unquantized file can be viewed in place with
+np.frombuffer, e.g. straight from a memory map.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+CHUNK_MAGIC = b"IJCK"
+CHUNK_VERSION = 1
+CHUNK_EXTENSION = ".ijc"
+
+# Header flags
+FLAG_QUANTIZED = 0x1
+
+# magic, version, flags, chunk coord, stroke count, point count,
+# quantization origin and scale, block offsets
+CHUNK_HEADER = struct.Struct("<4sHH3iIQ3f3f4Q")
+BLOCK_ALIGNMENT = 16
+
+STROKE_TABLE_DTYPE = np.dtype([
+    ('id', '<i8'),
+    ('offset', '<u8'),
+    ('length', '<u4'),
+    ('flags', '<u4'),
+    ('bounds_min', '<f4', (3,)),
+    ('bounds_max', '<f4', (3,)),
+])
+
+QUANTIZED_LEVELS = 65535
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the block alignment."""
+    return (offset + BLOCK_ALIGNMENT - 1) // BLOCK_ALIGNMENT * BLOCK_ALIGNMENT
+
+
+@dataclass
+class ChunkHeader:
+    """Fixed-size header at the start of every chunk file."""
+    
+    coord: Tuple[int, int, int]
+    stroke_count: int
+    point_count: int
+    flags: int = 0
+    origin: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    scale: Tuple[float, float, float] = (1.0, 1.0, 1.0)
+    table_offset: int = 0
+    positions_offset: int = 0
+    pressures_offset: int = 0
+    colors_offset: int = 0
+    version: int = CHUNK_VERSION
+    
+    @property
+    def quantized(self) -> bool:
+        """Check if the point blocks are quantized."""
+        return bool(self.flags & FLAG_QUANTIZED)
+        
+    def pack(self) -> bytes:
+        """Serialize the header."""
+        return CHUNK_HEADER.pack(
+            CHUNK_MAGIC, self.version, self.flags, *self.coord,
+            self.stroke_count, self.point_count, *self.origin, *self.scale,
+            self.table_offset, self.positions_offset, self.pressures_offset,
+            self.colors_offset
+        )
+        
+    @classmethod
+    def unpack(cls, buffer) -> "ChunkHeader":
+        """Parse and validate a header from the start of a buffer."""
+        if len(buffer) < CHUNK_HEADER.size:
+            raise ValueError(f"Chunk data too short for header: {len(buffer)} bytes")
+            
+        fields = CHUNK_HEADER.unpack_from(buffer, 0)
+        magic, version, flags = fields[0:3]
+        if magic != CHUNK_MAGIC:
+            raise ValueError(f"Not a chunk file (magic {magic!r})")
+        if version > CHUNK_VERSION:
+            raise ValueError(f"Unsupported chunk format version {version}")
+            
+        return cls(
+            coord=tuple(fields[3:6]),
+            stroke_count=fields[6],
+            point_count=fields[7],
+            flags=flags,
+            origin=tuple(fields[8:11]),
+            scale=tuple(fields[11:14]),
+            table_offset=fields[14],
+            positions_offset=fields[15],
+            pressures_offset=fields[16],
+            colors_offset=fields[17],
+            version=version
+        )
+
+
+class ChunkData:
+    """Decoded view of a chunk's strokes.
+    
+    For unquantized data every array is a view into the source buffer, so
+    nothing is copied until the points are handed to a StrokeStore.
+    Quantized blocks are dequantized on first access.
+    """
+    
+    def __init__(self, header: ChunkHeader, table: np.ndarray, raw_positions: np.ndarray,
+                 raw_pressures: np.ndarray, raw_colors: np.ndarray):
+        """Initialize from already-parsed blocks."""
+        self.header = header
+        self.table = table
+        self._raw_positions = raw_positions
+        self._raw_pressures = raw_pressures
+        self._raw_colors = raw_colors
+        self._positions: Optional[np.ndarray] = None
+        self._pressures: Optional[np.ndarray] = None
+        self._colors: Optional[np.ndarray] = None
+        
+    @property
+    def coord(self) -> Tuple[int, int, int]:
+        """Get the chunk coordinate."""
+        return self.header.coord
+        
+    @property
+    def stroke_ids(self) -> np.ndarray:
+        """Get the stroke ids."""
+        return self.table['id']
+        
+    @property
+    def offsets(self) -> np.ndarray:
+        """Get each stroke's first point index."""
+        return self.table['offset']
+        
+    @property
+    def lengths(self) -> np.ndarray:
+        """Get each stroke's point count."""
+        return self.table['length']
+        
+    @property
+    def positions(self) -> np.ndarray:
+        """Get the (N, 3) float32 positions of all strokes."""
+        if self._positions is None:
+            if self.header.quantized:
+                origin = np.array(self.header.origin, dtype=np.float32)
+                scale = np.array(self.header.scale, dtype=np.float32)
+                self._positions = self._raw_positions.astype(np.float32) * scale + origin
+            else:
+                self._positions = self._raw_positions
+        return self._positions
+        
+    @property
+    def pressures(self) -> np.ndarray:
+        """Get the (N,) float32 pressures of all strokes."""
+        if self._pressures is None:
+            if self.header.quantized:
+                self._pressures = self._raw_pressures.astype(np.float32) / 255.0
+            else:
+                self._pressures = self._raw_pressures
+        return self._pressures
+        
+    @property
+    def colors(self) -> np.ndarray:
+        """Get the (N, 4) float32 colors of all strokes."""
+        if self._colors is None:
+            if self.header.quantized:
+                self._colors = self._raw_colors.astype(np.float32) / 255.0
+            else:
+                self._colors = self._raw_colors
+        return self._colors
+        
+    def get_points(self, index: int) -> np.ndarray:
+        """Get the points of the stroke at a table index."""
+        offset = int(self.table['offset'][index])
+        return self.positions[offset:offset + int(self.table['length'][index])]
+        
+    def add_to(self, store) -> np.ndarray:
+        """Bulk-add every stroke to a StrokeStore, keeping their ids."""
+        if len(self.table) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return store.add_strokes(self.positions, self.lengths.astype(np.int64),
+                                 self.pressures, self.colors, self.stroke_ids)
+                                 
+    def __len__(self) -> int:
+        return len(self.table)
+        
+    def __repr__(self) -> str:
+        return (f"ChunkData({self.coord}, strokes={len(self.table)}, "
+                f"points={self.header.point_count}, quantized={self.header.quantized})")
+
+
+def encode_chunk(coord: Tuple[int, int, int], stroke_ids: np.ndarray, positions: np.ndarray,
+                 lengths: np.ndarray, pressures: np.ndarray, colors: np.ndarray,
+                 quantize: bool = False) -> bytes:
+    """Serialize strokes given as concatenated point arrays.
+    
+    Quantizing stores positions as 16-bit fixed point over the chunk's
+    bounding box, and pressures and colors as 8-bit values, roughly
+    halving the file size.
+    """
+    stroke_ids = np.asarray(stroke_ids, dtype=np.int64).reshape(-1)
+    lengths = np.asarray(lengths, dtype=np.int64).reshape(-1)
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    pressures = np.asarray(pressures, dtype=np.float32).reshape(-1)
+    colors = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+    
+    stroke_count = len(stroke_ids)
+    point_count = len(positions)
+    if len(lengths) != stroke_count:
+        raise ValueError(f"Got {len(lengths)} lengths for {stroke_count} strokes")
+    if int(lengths.sum()) != point_count:
+        raise ValueError(f"Stroke lengths sum to {int(lengths.sum())}, got {point_count} points")
+    if len(pressures) != point_count or len(colors) != point_count:
+        raise ValueError("Pressures and colors must have one entry per point")
+        
+    # Stroke table
+    table = np.zeros(stroke_count, dtype=STROKE_TABLE_DTYPE)
+    starts = np.cumsum(lengths) - lengths
+    table['id'] = stroke_ids
+    table['offset'] = starts
+    table['length'] = lengths
+    if stroke_count:
+        nonempty = lengths > 0
+        table['bounds_min'][nonempty] = np.minimum.reduceat(positions, starts[nonempty], axis=0)
+        table['bounds_max'][nonempty] = np.maximum.reduceat(positions, starts[nonempty], axis=0)
+        
+    # Point blocks
+    flags = 0
+    origin = (0.0, 0.0, 0.0)
+    scale = (1.0, 1.0, 1.0)
+    if quantize:
+        flags |= FLAG_QUANTIZED
+        if point_count:
+            lower = positions.min(axis=0)
+            step = (positions.max(axis=0) - lower) / QUANTIZED_LEVELS
+            step[step == 0.0] = 1.0
+            origin = tuple(float(v) for v in lower)
+            scale = tuple(float(v) for v in step)
+            positions = np.round((positions - lower) / step).astype('<u2')
+        else:
+            positions = positions.astype('<u2')
+        pressures = np.round(np.clip(pressures, 0.0, 1.0) * 255.0).astype(np.uint8)
+        colors = np.round(np.clip(colors, 0.0, 1.0) * 255.0).astype(np.uint8)
+    else:
+        positions = positions.astype('<f4', copy=False)
+        pressures = pressures.astype('<f4', copy=False)
+        colors = colors.astype('<f4', copy=False)
+        
+    # Lay the blocks out on aligned offsets
+    table_offset = _align(CHUNK_HEADER.size)
+    positions_offset = _align(table_offset + table.nbytes)
+    pressures_offset = _align(positions_offset + positions.nbytes)
+    colors_offset = _align(pressures_offset + pressures.nbytes)
+    size = colors_offset + colors.nbytes
+    
+    header = ChunkHeader(
+        coord=tuple(int(c) for c in coord),
+        stroke_count=stroke_count,
+        point_count=point_count,
+        flags=flags,
+        origin=origin,
+        scale=scale,
+        table_offset=table_offset,
+        positions_offset=positions_offset,
+        pressures_offset=pressures_offset,
+        colors_offset=colors_offset
+    )
+    
+    buffer = bytearray(size)
+    buffer[:CHUNK_HEADER.size] = header.pack()
+    for offset, block in ((table_offset, table), (positions_offset, positions),
+                          (pressures_offset, pressures), (colors_offset, colors)):
+        buffer[offset:offset + block.nbytes] = block.tobytes()
+    return bytes(buffer)
+
+
+def encode_store_chunk(store, coord: Tuple[int, int, int], stroke_ids,
+                       quantize: bool = False) -> bytes:
+    """Serialize strokes straight from a StrokeStore."""
+    stroke_ids = np.asarray(list(stroke_ids), dtype=np.int64)
+    positions, lengths, pressures, colors = store.gather(stroke_ids)
+    return encode_chunk(coord, stroke_ids, positions, lengths, pressures, colors, quantize)
+
+
+def decode_chunk(buffer) -> ChunkData:
+    """Parse a chunk from any buffer without copying its blocks."""
+    header = ChunkHeader.unpack(buffer)
+    position_type, pressure_type, color_type = (
+        ('<u2', np.uint8, np.uint8) if header.quantized else ('<f4', '<f4', '<f4')
+    )
+    
+    def block(offset, dtype, count, width=None):
+        dtype = np.dtype(dtype)
+        items = count * (width or 1)
+        end = offset + items * dtype.itemsize
+        if end > len(buffer):
+            raise ValueError(f"Chunk data truncated: block ends at {end}, size {len(buffer)}")
+        array = np.frombuffer(buffer, dtype=dtype, count=items, offset=offset)
+        return array.reshape(-1, width) if width else array
+        
+    table = block(header.table_offset, STROKE_TABLE_DTYPE, header.stroke_count)
+    positions = block(header.positions_offset, position_type, header.point_count, 3)
+    pressures = block(header.pressures_offset, pressure_type, header.point_count)
+    colors = block(header.colors_offset, color_type, header.point_count, 4)
+    
+    if header.stroke_count and int(table['offset'][-1]) + int(table['length'][-1]) > header.point_count:
+        raise ValueError("Chunk stroke table references points past the end of the file")
+    return ChunkData(header, table, positions, pressures, colors)
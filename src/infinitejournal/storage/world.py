@@ -0,0 +1,518 @@
+# src/infinitejournal/storage/world.py
+"""Persistent world storage: chunk files plus a write-ahead log of edits."""
+
+import logging
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from infinitejournal.storage.files import ChunkFiles, write_atomic
+from infinitejournal.storage.formats import encode_chunk
+from infinitejournal.world.chunks import ChunkCoord
+
+
+# Log operations
+OP_ADD = 1
+OP_ERASE = 2
+OP_MODIFY = 3
+
+# Frame: body length, CRC-32 of body
+FRAME_HEADER = struct.Struct("<II")
+# Body: sequence number, op, stroke id, chunk coord, point count
+RECORD_HEADER = struct.Struct("<QBq3iI")
+
+CHECKPOINT_MAGIC = b"IJCP"
+CHECKPOINT_FORMAT = struct.Struct("<4sIQq")
+CHECKPOINT_VERSION = 1
+
+SEGMENT_EXTENSION = ".wal"
+
+
+class StrokeRecord:
+    """One logged stroke edit."""
+    
+    __slots__ = ('seq', 'op', 'stroke_id', 'coord', 'positions', 'pressures', 'colors')
+    
+    def __init__(self, seq: int, op: int, stroke_id: int, coord: ChunkCoord,
+                 positions: Optional[np.ndarray] = None,
+                 pressures: Optional[np.ndarray] = None,
+                 colors: Optional[np.ndarray] = None):
+        self.seq = seq
+        self.op = op
+        self.stroke_id = stroke_id
+        self.coord = coord
+        self.positions = positions
+        self.pressures = pressures
+        self.colors = colors
+        
+    @property
+    def is_erase(self) -> bool:
+        """Check if the record removes its stroke."""
+        return self.op == OP_ERASE
+        
+    def encode(self) -> bytes:
+        """Serialize the record into a checksummed frame."""
+        count = len(self.positions) if self.positions is not None else 0
+        parts = [RECORD_HEADER.pack(self.seq, self.op, self.stroke_id, *self.coord, count)]
+        if count:
+            parts.append(np.ascontiguousarray(self.positions, dtype='<f4').tobytes())
+            parts.append(np.ascontiguousarray(self.pressures, dtype='<f4').tobytes())
+            parts.append(np.ascontiguousarray(self.colors, dtype='<f4').tobytes())
+        body = b"".join(parts)
+        return FRAME_HEADER.pack(len(body), zlib.crc32(body)) + body
+        
+    @classmethod
+    def decode(cls, body: bytes) -> "StrokeRecord":
+        """Parse a record body (without its frame header)."""
+        seq, op, stroke_id, x, y, z, count = RECORD_HEADER.unpack_from(body, 0)
+        if op not in (OP_ADD, OP_ERASE, OP_MODIFY):
+            raise ValueError(f"Unknown log operation {op}")
+        expected = RECORD_HEADER.size + count * 8 * 4
+        if len(body) != expected:
+            raise ValueError(f"Log record size {len(body)} does not match {expected}")
+            
+        record = cls(seq, op, stroke_id, (x, y, z))
+        if count:
+            data = np.frombuffer(body, dtype='<f4', offset=RECORD_HEADER.size)
+            record.positions = data[:count * 3].reshape(-1, 3)
+            record.pressures = data[count * 3:count * 4]
+            record.colors = data[count * 4:].reshape(-1, 4)
+        return record
+        
+    def __repr__(self) -> str:
+        count = len(self.positions) if self.positions is not None else 0
+        return f"StrokeRecord(seq={self.seq}, op={self.op}, id={self.stroke_id}, points={count})"
+
+
+def read_segment(path: Path) -> Tuple[List[StrokeRecord], int]:
+    """Read the records of a log segment.
+    
+    Reading stops at the first truncated or corrupt frame, which is what a
+    crash in the middle of an append leaves behind. Returns the records
+    and the byte length of the valid prefix.
+    """
+    data = Path(path).read_bytes()
+    records = []
+    position = 0
+    while position + FRAME_HEADER.size <= len(data):
+        length, checksum = FRAME_HEADER.unpack_from(data, position)
+        start = position + FRAME_HEADER.size
+        body = data[start:start + length]
+        if len(body) != length or zlib.crc32(body) != checksum:
+            break
+        try:
+            records.append(StrokeRecord.decode(body))
+        except (ValueError, struct.error):
+            break
+        position = start + length
+    return records, position
+
+
+def merge_chunk(data, edits: Dict[int, StrokeRecord]) -> Tuple[np.ndarray, ...]:
+    """Apply pending edits on top of a chunk's saved strokes.
+    
+    `data` is the chunk's ChunkData (or None) and `edits` the latest record
+    per stroke id. Returns concatenated (ids, positions, lengths,
+    pressures, colors) arrays of the resulting strokes.
+    """
+    ids, positions, lengths, pressures, colors = [], [], [], [], []
+    
+    if data is not None and len(data):
+        saved_ids = data.stroke_ids.astype(np.int64)
+        keep = ~np.isin(saved_ids, np.fromiter(edits, dtype=np.int64, count=len(edits)))
+        saved_lengths = data.lengths.astype(np.int64)
+        starts = data.offsets.astype(np.int64)[keep]
+        kept_lengths = saved_lengths[keep]
+        rows = np.repeat(starts - (np.cumsum(kept_lengths) - kept_lengths), kept_lengths)
+        rows += np.arange(int(kept_lengths.sum()))
+        ids.append(saved_ids[keep])
+        lengths.append(kept_lengths)
+        positions.append(data.positions[rows])
+        pressures.append(data.pressures[rows])
+        colors.append(data.colors[rows])
+        
+    for stroke_id, record in edits.items():
+        if record.is_erase or record.positions is None or len(record.positions) == 0:
+            continue
+        ids.append(np.array([stroke_id], dtype=np.int64))
+        lengths.append(np.array([len(record.positions)], dtype=np.int64))
+        positions.append(record.positions)
+        pressures.append(record.pressures)
+        colors.append(record.colors)
+        
+    if not ids:
+        return (np.zeros(0, dtype=np.int64), np.zeros((0, 3), dtype=np.float32),
+                np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32),
+                np.zeros((0, 4), dtype=np.float32))
+    return (np.concatenate(ids), np.concatenate(positions).astype(np.float32, copy=False),
+            np.concatenate(lengths), np.concatenate(pressures).astype(np.float32, copy=False),
+            np.concatenate(colors).astype(np.float32, copy=False))
+
+
+class WorldStorage:
+    """Stores the world as chunk files and logs every edit before it lands.
+    
+    Edits are appended to a write-ahead log, so saving a stroke costs one
+    small sequential write no matter how big the journal is. The log is
+    split into segments; once the active segment grows past
+    `compaction_threshold` bytes it is sealed and a background thread
+    folds the edits of all sealed segments into the affected chunk files,
+    records the last folded sequence number in a checkpoint and deletes
+    the segments. On startup every record newer than the checkpoint is
+    replayed.
+    
+    Edits that have not been compacted yet are kept in memory per chunk,
+    and `load_chunk` overlays them on the chunk file, so readers always
+    see the latest state.
+    """
+    
+    def __init__(self, directory: Path, quantize: bool = False,
+                 compaction_threshold: int = 4 * 1024 * 1024):
+        """Initialize storage rooted at a directory; call open() before use."""
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.log_directory = self.directory / "log"
+        self.checkpoint_path = self.directory / "checkpoint"
+        self.chunk_files = ChunkFiles(self.directory / "chunks")
+        self.quantize = quantize
+        self.compaction_threshold = compaction_threshold
+        
+        self._lock = threading.RLock()
+        self._pending: Dict[ChunkCoord, Dict[int, StrokeRecord]] = {}
+        self._versions: Dict[ChunkCoord, int] = {}  # Edits per chunk this session
+        self._next_seq = 1
+        self._checkpoint_seq = 0
+        self._next_stroke_id = 0
+        
+        # Log segments: sealed ones wait for compaction, appends go to the last
+        self._segment = None
+        self._segment_path: Optional[Path] = None
+        self._segment_bytes = 0
+        self._sealed_bytes = 0
+        
+        # Background compaction
+        self._compact_event = threading.Event()
+        self._compact_done = threading.Event()
+        self._compact_done.set()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        
+        self._opened = False
+        
+    # ----------------------------------------------------------------
+    # Lifecycle
+    # ----------------------------------------------------------------
+    
+    def open(self):
+        """Read the checkpoint, replay the log and start the compactor."""
+        if self._opened:
+            return
+            
+        self.log_directory.mkdir(parents=True, exist_ok=True)
+        self._read_checkpoint()
+        self._replay()
+        self._start_segment()
+        
+        self._stop = False
+        self._thread = threading.Thread(target=self._compaction_loop,
+                                        name="world-compaction", daemon=True)
+        self._thread.start()
+        self._opened = True
+        
+        # Fold whatever the last session left in the log
+        if self._sealed_bytes:
+            self._compact_done.clear()
+            self._compact_event.set()
+        
+    def close(self):
+        """Fold every pending edit into the chunk files and stop the compactor."""
+        if not self._opened:
+            return
+            
+        self._stop = True
+        self._compact_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            
+        with self._lock:
+            self._seal_segment()
+        self._compact()
+        self._opened = False
+        self.logger.info("World storage closed")
+        
+    # ----------------------------------------------------------------
+    # Logging edits
+    # ----------------------------------------------------------------
+    
+    def log_add(self, stroke_id: int, coord: ChunkCoord, positions: np.ndarray,
+                pressures: np.ndarray, colors: np.ndarray):
+        """Persist a new stroke."""
+        self._append(OP_ADD, stroke_id, coord, positions, pressures, colors)
+        
+    def log_modify(self, stroke_id: int, coord: ChunkCoord, positions: np.ndarray,
+                   pressures: np.ndarray, colors: np.ndarray,
+                   previous_coord: Optional[ChunkCoord] = None):
+        """Persist a stroke's new points, moving it if its chunk changed."""
+        if previous_coord is not None and tuple(previous_coord) != tuple(coord):
+            self._append(OP_ERASE, stroke_id, previous_coord)
+        self._append(OP_MODIFY, stroke_id, coord, positions, pressures, colors)
+        
+    def log_erase(self, stroke_id: int, coord: ChunkCoord):
+        """Persist the removal of a stroke."""
+        self._append(OP_ERASE, stroke_id, coord)
+        
+    def flush(self, durable: bool = False):
+        """Push appended records to the OS, and to disk if durable."""
+        with self._lock:
+            if self._segment is not None:
+                self._segment.flush()
+                if durable:
+                    os.fsync(self._segment.fileno())
+                    
+    # ----------------------------------------------------------------
+    # Reading
+    # ----------------------------------------------------------------
+    
+    def load_chunk(self, coord: ChunkCoord) -> Tuple[np.ndarray, ...]:
+        """Get a chunk's strokes with pending edits applied.
+        
+        Returns concatenated (ids, positions, lengths, pressures, colors).
+        """
+        with self._lock:
+            edits = dict(self._pending.get(coord, {}))
+        mapped = self.chunk_files.load(coord)
+        try:
+            return merge_chunk(mapped.data if mapped is not None else None, edits)
+        finally:
+            if mapped is not None:
+                mapped.close()
+                
+    def chunk_version(self, coord: ChunkCoord) -> int:
+        """Get a counter that changes whenever a chunk is edited.
+        
+        Caches of chunk content compare it to tell whether they are stale.
+        """
+        return self._versions.get(coord, 0)
+        
+    def has_chunk(self, coord: ChunkCoord) -> bool:
+        """Check if a chunk has saved or pending content."""
+        with self._lock:
+            if coord in self._pending:
+                return True
+        return self.chunk_files.exists(coord)
+        
+    @property
+    def next_stroke_id(self) -> int:
+        """Get an id above every stroke ever stored."""
+        return self._next_stroke_id
+        
+    @property
+    def pending_bytes(self) -> int:
+        """Get the size of the log not yet folded into chunk files."""
+        return self._sealed_bytes + self._segment_bytes
+        
+    # ----------------------------------------------------------------
+    # Compaction
+    # ----------------------------------------------------------------
+    
+    def request_compaction(self):
+        """Seal the current segment and compact it in the background."""
+        with self._lock:
+            if self._segment_bytes == 0:
+                return
+            self._seal_segment()
+            self._start_segment()
+        self._compact_done.clear()
+        self._compact_event.set()
+        
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> bool:
+        """Block until a running compaction finishes."""
+        return self._compact_done.wait(timeout)
+        
+    def _compaction_loop(self):
+        """Background thread body."""
+        while True:
+            self._compact_event.wait()
+            self._compact_event.clear()
+            if self._stop:
+                self._compact_done.set()
+                return
+            try:
+                self._compact()
+            except Exception as e:
+                self.logger.error(f"World compaction failed: {e}")
+            self._compact_done.set()
+            
+    def _compact(self):
+        """Fold the edits of all sealed segments into chunk files."""
+        with self._lock:
+            sealed = self._sealed_segments()
+            if not sealed:
+                return
+            # Everything below the active segment's first record is sealed
+            if self._segment_path is not None:
+                upto = self._segment_first_seq(self._segment_path) - 1
+            else:
+                upto = self._next_seq - 1
+            snapshot = {
+                coord: {sid: rec for sid, rec in edits.items() if rec.seq <= upto}
+                for coord, edits in self._pending.items()
+            }
+            next_stroke_id = self._next_stroke_id
+            
+        written = 0
+        for coord, edits in snapshot.items():
+            if not edits:
+                continue
+            mapped = self.chunk_files.load(coord)
+            try:
+                ids, positions, lengths, pressures, colors = merge_chunk(
+                    mapped.data if mapped is not None else None, edits
+                )
+            finally:
+                if mapped is not None:
+                    mapped.close()
+                    
+            if len(ids) == 0:
+                self.chunk_files.delete(coord)
+            else:
+                self.chunk_files.save(coord, encode_chunk(coord, ids, positions, lengths,
+                                                          pressures, colors, self.quantize))
+            written += 1
+            
+        self._write_checkpoint(upto, next_stroke_id)
+        
+        with self._lock:
+            # Forget folded edits unless a newer one replaced them meanwhile
+            for coord, edits in snapshot.items():
+                pending = self._pending.get(coord)
+                if pending is None:
+                    continue
+                for stroke_id, record in edits.items():
+                    if pending.get(stroke_id) is record:
+                        del pending[stroke_id]
+                if not pending:
+                    del self._pending[coord]
+            for path in sealed:
+                self._sealed_bytes -= path.stat().st_size
+                path.unlink()
+            self._sealed_bytes = max(0, self._sealed_bytes)
+            self._checkpoint_seq = upto
+            
+        self.logger.debug(f"Compacted log up to {upto} into {written} chunk files")
+        
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+    
+    def _append(self, op: int, stroke_id: int, coord: ChunkCoord,
+                positions: Optional[np.ndarray] = None,
+                pressures: Optional[np.ndarray] = None,
+                colors: Optional[np.ndarray] = None):
+        """Write a record to the log and the pending overlay."""
+        if not self._opened:
+            raise RuntimeError("World storage is not open")
+            
+        coord = tuple(int(c) for c in coord)
+        if positions is not None:
+            positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+            pressures = np.array(pressures, dtype=np.float32).reshape(-1)
+            colors = np.array(colors, dtype=np.float32).reshape(-1, 4)
+            
+        with self._lock:
+            record = StrokeRecord(self._next_seq, op, int(stroke_id), coord,
+                                  positions, pressures, colors)
+            frame = record.encode()
+            self._segment.write(frame)
+            self._segment.flush()
+            self._segment_bytes += len(frame)
+            self._next_seq += 1
+            self._next_stroke_id = max(self._next_stroke_id, int(stroke_id) + 1)
+            self._pending.setdefault(coord, {})[record.stroke_id] = record
+            self._versions[coord] = self._versions.get(coord, 0) + 1
+            should_compact = self._segment_bytes >= self.compaction_threshold
+            
+        if should_compact and self._compact_done.is_set():
+            self.request_compaction()
+            
+    def _replay(self):
+        """Load every record newer than the checkpoint into the overlay."""
+        replayed = 0
+        for path in self._segment_paths():
+            records, valid = read_segment(path)
+            size = path.stat().st_size
+            if valid < size:
+                self.logger.warning(f"Truncating torn log tail in {path.name} "
+                                    f"({size - valid} bytes)")
+                with open(path, 'r+b') as f:
+                    f.truncate(valid)
+            for record in records:
+                self._next_seq = max(self._next_seq, record.seq + 1)
+                self._next_stroke_id = max(self._next_stroke_id, record.stroke_id + 1)
+                if record.seq <= self._checkpoint_seq:
+                    continue
+                self._pending.setdefault(record.coord, {})[record.stroke_id] = record
+                replayed += 1
+            self._sealed_bytes += valid
+            
+        if replayed:
+            self.logger.info(f"Replayed {replayed} logged edits since checkpoint "
+                             f"{self._checkpoint_seq}")
+                             
+    def _read_checkpoint(self):
+        """Load the last compacted sequence number and stroke id counter."""
+        if not self.checkpoint_path.exists():
+            return
+        data = self.checkpoint_path.read_bytes()
+        magic, version, seq, next_stroke_id = CHECKPOINT_FORMAT.unpack_from(data, 0)
+        if magic != CHECKPOINT_MAGIC or version > CHECKPOINT_VERSION:
+            raise ValueError(f"Invalid world checkpoint: {self.checkpoint_path}")
+        self._checkpoint_seq = seq
+        self._next_seq = max(self._next_seq, seq + 1)
+        self._next_stroke_id = max(self._next_stroke_id, next_stroke_id)
+        
+    def _write_checkpoint(self, seq: int, next_stroke_id: int):
+        """Record that every edit up to seq lives in the chunk files."""
+        write_atomic(self.checkpoint_path, CHECKPOINT_FORMAT.pack(
+            CHECKPOINT_MAGIC, CHECKPOINT_VERSION, seq, next_stroke_id
+        ))
+        
+    def _segment_paths(self) -> List[Path]:
+        """Get all log segments, oldest first."""
+        return sorted(self.log_directory.glob(f"*{SEGMENT_EXTENSION}"),
+                      key=self._segment_first_seq)
+                      
+    def _sealed_segments(self) -> List[Path]:
+        """Get the segments no longer appended to."""
+        return [path for path in self._segment_paths() if path != self._segment_path]
+        
+    @staticmethod
+    def _segment_first_seq(path: Path) -> int:
+        """Get the first sequence number a segment may contain."""
+        return int(path.stem)
+        
+    def _start_segment(self):
+        """Open a fresh segment for appends."""
+        self._segment_path = self.log_directory / f"{self._next_seq:020d}{SEGMENT_EXTENSION}"
+        self._segment = open(self._segment_path, 'ab')
+        self._segment_bytes = 0
+        
+    def _seal_segment(self):
+        """Close the active segment so it can be compacted."""
+        if self._segment is None:
+            return
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        self._segment.close()
+        if self._segment_bytes == 0:
+            self._segment_path.unlink()
+        self._sealed_bytes += self._segment_bytes
+        self._segment = None
+        self._segment_path = None
+        self._segment_bytes = 0
@@ -0,0 +1,177 @@
+# src/infinitejournal/tools/brush.py
+"""Brush tool that turns pointer input into strokes."""
+
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from infinitejournal.drawing.models.curves import StrokeCurve
+from infinitejournal.drawing.strokes import DEFAULT_COLOR, StrokeStore
+
+
+def project_to_plane(pixels: np.ndarray, camera, viewport: Tuple[int, int],
+                     plane_point: np.ndarray, plane_normal: np.ndarray) -> np.ndarray:
+    """Project (N, 2) window positions (y down) onto a plane facing the camera.
+    
+    Returns one point per position; rays that miss the plane are dropped.
+    """
+    width, height = viewport
+    ndc = np.empty((len(pixels), 2), dtype=np.float32)
+    ndc[:, 0] = (pixels[:, 0] + 0.5) * (2.0 / width) - 1.0
+    ndc[:, 1] = 1.0 - (pixels[:, 1] + 0.5) * (2.0 / height)
+    origins, directions = camera.screen_rays(ndc)
+    
+    # Ray-plane intersection for every ray at once
+    facing = directions @ plane_normal
+    hits = facing > 1e-6
+    origins, directions, facing = origins[hits], directions[hits], facing[hits]
+    distances = ((plane_point - origins) @ plane_normal) / facing
+    return origins + directions * distances[:, None]
+
+
+class Brush:
+    """Draws strokes on a plane in front of the camera.
+    
+    Holding the left button (or pen tip) draws. The drawing plane faces
+    the camera at `distance` and is fixed when a stroke starts, so moving
+    mid-stroke does not bend it.
+    
+    Pointer input is handled per frame rather than per event: the motion
+    samples of a frame are collected, unprojected together through the
+    camera's inverse view-projection and fed to the stroke's curve with
+    one call. Tablets and high-rate mice deliver hundreds of samples per
+    frame, and none of them is dropped.
+    
+    The curve smooths the samples; its samples that can no longer change
+    are appended to the open stroke in the store as they appear, and the
+    rest when the stroke ends.
+    """
+    
+    BUTTON = 1
+    
+    def __init__(self, store: StrokeStore, on_commit: Optional[Callable[[int], None]] = None,
+                 color: tuple = DEFAULT_COLOR, distance: float = 2.0, width: float = 0.004,
+                 subdivisions: int = 4):
+        """Initialize the brush.
+        
+        `on_commit` is called with the id of every finished stroke.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.on_commit = on_commit
+        self.color = tuple(color)
+        self.distance = distance
+        self.width = width
+        self.subdivisions = subdivisions
+        self.enabled = True
+        
+        # The stroke being drawn, its curve and its plane
+        self.stroke_id: Optional[int] = None
+        self.curve: Optional[StrokeCurve] = None
+        self._plane_point = np.zeros(3, dtype=np.float32)
+        self._plane_normal = np.zeros(3, dtype=np.float32)
+        self._last_pixel = None
+        
+        # Statistics
+        self.samples_drawn = 0
+        
+    @property
+    def drawing(self) -> bool:
+        """Check if a stroke is being drawn."""
+        return self.stroke_id is not None
+        
+    def handle_events(self, events: list, camera, viewport: Tuple[int, int]) -> list:
+        """Draw with a frame's pointer events.
+        
+        Returns the events the brush did not use, in order. While the brush
+        is disabled every event is passed on and an open stroke is finished.
+        """
+        if not self.enabled:
+            self.end_stroke()
+            return events
+            
+        remaining = []
+        samples: List[Tuple[int, int]] = []
+        for event in events:
+            kind = event.type
+            if kind == pygame.MOUSEMOTION and self.stroke_id is not None:
+                samples.append(event.pos)
+            elif kind == pygame.MOUSEBUTTONDOWN and event.button == self.BUTTON:
+                self._append(samples, camera, viewport)
+                samples = []
+                self.end_stroke()
+                self.begin_stroke(event.pos, camera, viewport)
+            elif kind == pygame.MOUSEBUTTONUP and event.button == self.BUTTON:
+                if self.stroke_id is not None:
+                    samples.append(event.pos)
+                    self._append(samples, camera, viewport)
+                    samples = []
+                    self.end_stroke()
+            else:
+                remaining.append(event)
+                
+        self._append(samples, camera, viewport)
+        return remaining
+        
+    def begin_stroke(self, pixel: Tuple[int, int], camera, viewport: Tuple[int, int]):
+        """Start a stroke at a window position."""
+        self.end_stroke()
+        
+        # The plane through the view center at the brush distance
+        _, direction = camera.screen_ray(0.0, 0.0)
+        self._plane_normal[:] = direction
+        self._plane_point[:] = camera.position + direction * self.distance
+        
+        self.stroke_id = self.store.begin_stroke(color=self.color).stroke_id
+        self.curve = StrokeCurve(self._plane_normal, self.width, self.subdivisions)
+        self._last_pixel = None
+        self._append([pixel], camera, viewport)
+        
+    def end_stroke(self):
+        """Finish the stroke being drawn, if any, and commit it."""
+        if self.stroke_id is None:
+            return
+        stroke_id = self.stroke_id
+        self.stroke_id = None
+        self._last_pixel = None
+        
+        # The curve's final samples complete the stroke
+        stable = self.curve.stable_count
+        centers, pressures, _ = self.curve.finish()
+        if len(centers) > stable:
+            self.store.append_points(stroke_id, centers[stable:], pressures[stable:])
+            
+        # A stroke that never received points is dropped by the store
+        self.store.end_stroke(stroke_id)
+        if stroke_id in self.store and self.on_commit is not None:
+            self.on_commit(stroke_id)
+            
+    def unproject(self, pixels: np.ndarray, camera, viewport: Tuple[int, int]) -> np.ndarray:
+        """Project window positions (y down) onto the drawing plane."""
+        return project_to_plane(pixels, camera, viewport, self._plane_point, self._plane_normal)
+        
+    def _append(self, samples: list, camera, viewport: Tuple[int, int]):
+        """Unproject pointer samples and append them to the open stroke."""
+        if self.stroke_id is None or not samples:
+            return
+        pixels = np.array(samples, dtype=np.float32).reshape(-1, 2)
+        
+        # Repeated positions (common from tablets) add nothing to the stroke
+        previous = np.empty_like(pixels)
+        previous[0] = self._last_pixel if self._last_pixel is not None else np.nan
+        previous[1:] = pixels[:-1]
+        pixels = pixels[np.any(pixels != previous, axis=1)]
+        if len(pixels) == 0:
+            return
+        self._last_pixel = pixels[-1].copy()
+        
+        points = self.unproject(pixels, camera, viewport)
+        if len(points) == 0:
+            return
+        self.samples_drawn += len(points)
+        stable = self.curve.append(points)
+        if stable:
+            self.store.append_points(self.stroke_id, self.curve.stable_centers[-stable:],
+                                     self.curve.stable_pressures[-stable:])
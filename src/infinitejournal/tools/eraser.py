@@ -0,0 +1,223 @@
+# src/infinitejournal/tools/eraser.py
+"""Eraser tool that cuts strokes apart along the pointer's path."""
+
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from infinitejournal.drawing.models.spatial import SpatialHashGrid
+from infinitejournal.drawing.strokes import StrokeStore
+from infinitejournal.tools.brush import project_to_plane
+from infinitejournal.utilities.spatial import aabb_overlaps, capsules_contain
+
+
+def surviving_runs(keep: np.ndarray, lengths: np.ndarray,
+                   min_length: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """Split concatenated strokes into the runs of points they keep.
+    
+    `keep` flags the points of strokes stored back to back with the given
+    `lengths`. A run ends at every dropped point and at every stroke
+    boundary; runs shorter than `min_length` are dropped too. Returns the
+    indices of the points in the remaining runs, in order, and the run
+    lengths, ready for StrokeStore.add_strokes.
+    """
+    count = len(keep)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        
+    first = np.zeros(count, dtype=bool)
+    first[(np.cumsum(lengths) - lengths)[lengths > 0]] = True
+    after_kept = np.zeros(count, dtype=bool)
+    after_kept[1:] = keep[:-1]
+    starts = keep & (first | ~after_kept)
+    
+    # Kept points numbered by their run
+    kept = np.flatnonzero(keep)
+    runs = np.cumsum(starts)[kept] - 1
+    run_lengths = np.bincount(runs, minlength=int(np.count_nonzero(starts)))
+    long_enough = run_lengths >= min_length
+    return kept[long_enough[runs]], run_lengths[long_enough]
+
+
+class Eraser:
+    """Erases parts of strokes under a capsule swept along the pointer.
+    
+    Holding the right button erases on a plane facing the camera at
+    `distance`, fixed when the gesture starts like the brush's drawing
+    plane. Each frame the pointer's path since the last frame becomes a
+    chain of capsules of the eraser radius.
+    
+    Candidate strokes come from a spatial hash grid over the stroke
+    bounds, kept in step with the store through its change log. Their
+    points are gathered and tested against every capsule in one NumPy
+    pass, and each hit stroke is replaced by the runs of points it keeps,
+    all added with one bulk call. No step loops over points in Python.
+    """
+    
+    BUTTON = 3
+    
+    # Cell size of the stroke index; strokes a few units across stay out of
+    # its oversized list, which every query scans
+    CELL_SIZE = 1.0
+    
+    def __init__(self, store: StrokeStore, on_commit: Optional[Callable[[int], None]] = None,
+                 on_remove: Optional[Callable[[int], None]] = None, radius: float = 0.02,
+                 distance: float = 2.0):
+        """Initialize the eraser.
+        
+        `on_commit` is called with the id of every stroke piece the eraser
+        adds and `on_remove` with the id of every stroke it replaces; the
+        latter must remove the stroke from the store and defaults to
+        doing only that.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.on_commit = on_commit
+        self.on_remove = on_remove if on_remove is not None else store.remove_stroke
+        self.radius = radius
+        self.distance = distance
+        self.enabled = True
+        
+        # Stroke bounds, mirrored from the store
+        self.index = SpatialHashGrid(self.CELL_SIZE)
+        self._revision = -1
+        
+        # The gesture in progress
+        self.erasing = False
+        self._plane_point = np.zeros(3, dtype=np.float32)
+        self._plane_normal = np.zeros(3, dtype=np.float32)
+        self._last_point: Optional[np.ndarray] = None
+        
+        # Statistics
+        self.points_tested = 0
+        self.points_erased = 0
+        
+    def handle_events(self, events: list, camera, viewport: Tuple[int, int]) -> list:
+        """Erase with a frame's pointer events.
+        
+        Returns the events the eraser did not use, in order. While the
+        eraser is disabled every event is passed on.
+        """
+        if not self.enabled:
+            self.end()
+            return events
+            
+        remaining = []
+        samples: List[Tuple[int, int]] = []
+        for event in events:
+            kind = event.type
+            if kind == pygame.MOUSEMOTION and self.erasing:
+                samples.append(event.pos)
+            elif kind == pygame.MOUSEBUTTONDOWN and event.button == self.BUTTON:
+                self._erase_samples(samples, camera, viewport)
+                samples = []
+                self.begin(camera)
+                samples.append(event.pos)
+            elif kind == pygame.MOUSEBUTTONUP and event.button == self.BUTTON:
+                if self.erasing:
+                    samples.append(event.pos)
+                    self._erase_samples(samples, camera, viewport)
+                    samples = []
+                    self.end()
+            else:
+                remaining.append(event)
+                
+        self._erase_samples(samples, camera, viewport)
+        return remaining
+        
+    def begin(self, camera):
+        """Start erasing on the plane through the view center."""
+        _, direction = camera.screen_ray(0.0, 0.0)
+        self._plane_normal[:] = direction
+        self._plane_point[:] = camera.position + direction * self.distance
+        self._last_point = None
+        self.erasing = True
+        
+    def end(self):
+        """Stop erasing."""
+        self.erasing = False
+        self._last_point = None
+        
+    def erase_path(self, path: np.ndarray) -> int:
+        """Erase everything within the radius of a polyline.
+        
+        A single point erases a sphere. Returns the number of points
+        erased.
+        """
+        path = np.asarray(path, dtype=np.float32).reshape(-1, 3)
+        if len(path) == 0:
+            return 0
+        self.sync_index()
+        
+        lower = path.min(axis=0) - self.radius
+        upper = path.max(axis=0) + self.radius
+        store = self.store
+        ids = np.array([i for i in self.index.query_aabb(lower, upper).tolist()
+                        if not store.is_open(i)], dtype=np.int64)
+        if len(ids) == 0:
+            return 0
+            
+        positions, lengths, pressures, colors = store.gather(ids)
+        self.points_tested += len(positions)
+        
+        # Only points inside the path's box can be hit
+        near = np.flatnonzero(aabb_overlaps(positions, positions, lower, upper))
+        starts = path[:-1] if len(path) > 1 else path
+        ends = path[1:] if len(path) > 1 else path
+        erased = np.zeros(len(positions), dtype=bool)
+        erased[near] = capsules_contain(positions[near], starts, ends, self.radius)
+        if not erased.any():
+            return 0
+            
+        # Only strokes that lost points are replaced
+        offsets = np.cumsum(lengths) - lengths
+        hit = np.logical_or.reduceat(erased, offsets)
+        points = np.repeat(hit, lengths)
+        indices, run_lengths = surviving_runs(~erased[points], lengths[hit])
+        
+        for stroke_id in ids[hit].tolist():
+            self.on_remove(stroke_id)
+        if len(run_lengths):
+            rows = np.flatnonzero(points)[indices]
+            pieces = store.add_strokes(positions[rows], run_lengths, pressures[rows], colors[rows])
+            if self.on_commit is not None:
+                for stroke_id in pieces.tolist():
+                    self.on_commit(stroke_id)
+                    
+        count = int(np.count_nonzero(erased))
+        self.points_erased += count
+        return count
+        
+    def sync_index(self):
+        """Bring the stroke index up to date with the store."""
+        store = self.store
+        if store.revision == self._revision:
+            return
+            
+        removed = store.removed_since(self._revision) if self._revision >= 0 else None
+        ids, mins, maxs = store.get_all_bounds()
+        if removed is None:
+            self.index.clear()
+        else:
+            for stroke_id in removed.tolist():
+                self.index.remove(stroke_id)
+            changed = np.isin(ids, store.changed_since(self._revision))
+            ids, mins, maxs = ids[changed], mins[changed], maxs[changed]
+        self.index.bulk_insert(ids, mins, maxs)
+        self._revision = store.revision
+        
+    def _erase_samples(self, samples: list, camera, viewport: Tuple[int, int]):
+        """Unproject pointer samples and erase along them from the last point."""
+        if not self.erasing or not samples:
+            return
+        pixels = np.array(samples, dtype=np.float32).reshape(-1, 2)
+        points = project_to_plane(pixels, camera, viewport, self._plane_point,
+                                  self._plane_normal)
+        if len(points) == 0:
+            return
+        if self._last_point is not None:
+            points = np.concatenate([self._last_point[None, :], points])
+        self._last_point = points[-1].copy()
+        self.erase_path(points)
@@ -2,8 +2,11 @@
 
 import logging
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from typing import List, Optional, Tuple
 
 
 def setup_logging(log_level=logging.INFO, log_file=None):
@@ -36,3 +39,33 @@ def setup_logging(log_level=logging.INFO, log_file=None):
     
     logger = logging.getLogger(__name__)
     logger.info(f"Logging initialized. Log file: {log_file}")
+
+
+class StartupTimer:
+    """Times the phases of application startup and logs a summary."""
+    
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """Start timing."""
+        self.logger = logger or logging.getLogger("infinitejournal.startup")
+        self.start = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        
+    @contextmanager
+    def phase(self, name: str):
+        """Time a phase of startup."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases.append((name, elapsed))
+            self.logger.debug(f"Startup phase '{name}' took {elapsed * 1000:.1f} ms")
+            
+    def elapsed(self) -> float:
+        """Get the seconds since startup began."""
+        return time.perf_counter() - self.start
+        
+    def log_summary(self):
+        """Log the total startup time and each phase."""
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases)
+        self.logger.info(f"Started in {self.elapsed() * 1000:.0f} ms ({phases})")
@@ -0,0 +1,374 @@
+# src/infinitejournal/utilities/performance.py
+"""Frame profiling: scoped CPU timers, GPU timer queries and trace export."""
+
+import json
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from OpenGL.GL import *
+
+
+class RingBuffer:
+    """Fixed-size history of float samples; the oldest are overwritten."""
+    
+    __slots__ = ('_values', '_index', '_count')
+    
+    def __init__(self, capacity: int):
+        self._values = np.zeros(max(1, int(capacity)), dtype=np.float64)
+        self._index = 0
+        self._count = 0
+        
+    def append(self, value: float):
+        """Add a sample."""
+        self._values[self._index] = value
+        self._index = (self._index + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+            
+    def values(self) -> np.ndarray:
+        """Get the samples, oldest first."""
+        if self._count < len(self._values):
+            return self._values[:self._count].copy()
+        return np.roll(self._values, -self._index)
+        
+    def percentiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Get percentiles of the samples (zeros when empty)."""
+        if self._count == 0:
+            return np.zeros(len(qs))
+        return np.percentile(self._values[:self._count], qs)
+        
+    @property
+    def mean(self) -> float:
+        """Get the mean of the samples."""
+        return float(self._values[:self._count].mean()) if self._count else 0.0
+        
+    @property
+    def max(self) -> float:
+        """Get the largest sample."""
+        return float(self._values[:self._count].max()) if self._count else 0.0
+        
+    @property
+    def last(self) -> float:
+        """Get the newest sample."""
+        return float(self._values[self._index - 1]) if self._count else 0.0
+        
+    def clear(self):
+        """Drop every sample."""
+        self._index = 0
+        self._count = 0
+        
+    def __len__(self) -> int:
+        return self._count
+
+
+class GpuTimer:
+    """Measures GPU time with GL_TIME_ELAPSED queries.
+    
+    Results are read a few frames later, once the GPU has caught up, so
+    timing never stalls the pipeline. Only one query can run at a time,
+    which means GPU scopes cannot nest.
+    """
+    
+    def __init__(self, max_frames_in_flight: int = 4):
+        """Initialize the timer; queries are created on first use."""
+        self.logger = logging.getLogger(__name__)
+        self.max_frames_in_flight = max(1, max_frames_in_flight)
+        self._free: List[int] = []
+        self._all: List[int] = []
+        self._current: List[Tuple[str, int]] = []
+        self._frames: Deque[Tuple[int, List[Tuple[str, int]]]] = deque()
+        self._active = False
+        self._flag = np.zeros(1, dtype=np.int32)
+        self._result = np.zeros(1, dtype=np.int64)  # PyOpenGL has no uint64 array handler
+        self._initialized = False
+        
+    def initialize(self):
+        """Enable the timer; needs a current GL context."""
+        self._initialized = True
+        
+    def begin(self, name: str) -> bool:
+        """Start timing a section; returns False if one is already running."""
+        if not self._initialized or self._active:
+            return False
+        if self._free:
+            query = self._free.pop()
+        else:
+            # PyOpenGL returns a scalar or a one-element array depending on version
+            query = int(np.ravel(glGenQueries(1))[0])
+            self._all.append(query)
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self._current.append((name, query))
+        self._active = True
+        return True
+        
+    def end(self):
+        """Stop timing the running section."""
+        glEndQuery(GL_TIME_ELAPSED)
+        self._active = False
+        
+    def end_frame(self, frame: int):
+        """Close the queries issued this frame."""
+        if self._current:
+            self._frames.append((frame, self._current))
+            self._current = []
+            
+    def collect(self) -> List[Tuple[int, str, float]]:
+        """Read finished queries as (frame, name, milliseconds), oldest first.
+        
+        Frames still pending after `max_frames_in_flight` are dropped.
+        """
+        results = []
+        while self._frames:
+            frame, queries = self._frames[0]
+            glGetQueryObjectiv(queries[-1][1], GL_QUERY_RESULT_AVAILABLE, self._flag)
+            if self._flag[0]:
+                for name, query in queries:
+                    glGetQueryObjecti64v(query, GL_QUERY_RESULT, self._result)
+                    results.append((frame, name, float(self._result[0]) / 1e6))
+            elif len(self._frames) <= self.max_frames_in_flight:
+                break
+            self._frames.popleft()
+            self._free.extend(query for _, query in queries)
+        return results
+        
+    def cleanup(self):
+        """Delete the queries."""
+        if self._all:
+            glDeleteQueries(len(self._all), self._all)
+        self._all = []
+        self._free = []
+        self._current = []
+        self._frames.clear()
+        self._initialized = False
+
+
+class _Scope:
+    """Reusable context manager timing one named section."""
+    
+    __slots__ = ('profiler', 'name', 'gpu')
+    
+    def __init__(self, profiler: "FrameProfiler", name: str, gpu: bool):
+        self.profiler = profiler
+        self.name = name
+        self.gpu = gpu
+        
+    def __enter__(self):
+        self.profiler._push(self.name, self.gpu)
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._pop()
+
+
+class _NullScope:
+    """Scope used while profiling is disabled."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class FrameProfiler:
+    """Per-frame timings kept in ring buffers.
+    
+    Sections are timed with nestable `scope` blocks between `begin_frame`
+    and `end_frame`. A stage's time is inclusive of the scopes nested in
+    it and summed over every entry in the frame. The last `trace_frames`
+    frames are kept as individual events for `export_chrome_trace`.
+    Scopes must be used from a single thread.
+    """
+    
+    PERCENTILES = (50, 95, 99)
+    
+    def __init__(self, history: int = 300, enabled: bool = True, gpu: bool = True,
+                 trace_frames: int = 120):
+        """Initialize the profiler."""
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.history = max(1, int(history))
+        self.gpu_timer = GpuTimer() if gpu else None
+        
+        self.frame_times = RingBuffer(self.history)
+        self.stage_times: Dict[str, RingBuffer] = {}
+        self.gpu_times: Dict[str, RingBuffer] = {}
+        self.frame_index = 0
+        
+        self._scopes: Dict[Tuple[str, bool], _Scope] = {}
+        self._stack: List[Tuple[str, int, bool]] = []  # (name, start_ns, gpu_started)
+        self._totals: Dict[str, int] = {}
+        self._events: List[Tuple[str, int, int, int]] = []  # (name, start_ns, duration_ns, depth)
+        self._frame_start: Optional[int] = None
+        self._origin = time.perf_counter_ns()
+        
+        # Recent frames for trace export
+        self._trace: Deque[tuple] = deque(maxlen=max(1, trace_frames))
+        self._gpu_trace: Deque[Tuple[int, str, float]] = deque(maxlen=max(1, trace_frames) * 8)
+        
+    def initialize(self):
+        """Enable GPU timing; needs a current GL context."""
+        if self.gpu_timer is not None:
+            self.gpu_timer.initialize()
+            
+    # ----------------------------------------------------------------
+    # Recording
+    # ----------------------------------------------------------------
+    
+    def begin_frame(self):
+        """Mark the start of a frame."""
+        if self.enabled:
+            self._frame_start = time.perf_counter_ns()
+            
+    def end_frame(self):
+        """Mark the end of a frame and store its timings."""
+        if not self.enabled or self._frame_start is None:
+            return
+        end = time.perf_counter_ns()
+        duration = end - self._frame_start
+        self.frame_times.append(duration / 1e6)
+        
+        # Stages that did not run this frame record zero
+        for name, total in self._totals.items():
+            buffer = self.stage_times.get(name)
+            if buffer is None:
+                buffer = self.stage_times[name] = RingBuffer(self.history)
+            buffer.append(total / 1e6)
+        for name, buffer in self.stage_times.items():
+            if name not in self._totals:
+                buffer.append(0.0)
+                
+        if self.gpu_timer is not None:
+            self.gpu_timer.end_frame(self.frame_index)
+            for frame, name, ms in self.gpu_timer.collect():
+                buffer = self.gpu_times.get(name)
+                if buffer is None:
+                    buffer = self.gpu_times[name] = RingBuffer(self.history)
+                buffer.append(ms)
+                self._gpu_trace.append((frame, name, ms))
+                
+        self._trace.append((self.frame_index, self._frame_start, duration, self._events))
+        self._events = []
+        self._totals = {}
+        self._frame_start = None
+        self.frame_index += 1
+        
+    def scope(self, name: str, gpu: bool = False):
+        """Get a context manager timing a section; `gpu` also times it on the GPU."""
+        if not self.enabled:
+            return _NULL_SCOPE
+        key = (name, gpu)
+        scope = self._scopes.get(key)
+        if scope is None:
+            scope = self._scopes[key] = _Scope(self, name, gpu and self.gpu_timer is not None)
+        return scope
+        
+    def _push(self, name: str, gpu: bool):
+        """Open a scope."""
+        gpu_started = gpu and self.gpu_timer.begin(name)
+        self._stack.append((name, time.perf_counter_ns(), gpu_started))
+        
+    def _pop(self):
+        """Close the innermost scope."""
+        end = time.perf_counter_ns()
+        name, start, gpu_started = self._stack.pop()
+        if gpu_started:
+            self.gpu_timer.end()
+        duration = end - start
+        self._totals[name] = self._totals.get(name, 0) + duration
+        self._events.append((name, start, duration, len(self._stack)))
+        
+    # ----------------------------------------------------------------
+    # Results
+    # ----------------------------------------------------------------
+    
+    def frame_time_percentiles(self) -> Dict[str, float]:
+        """Get the p50/p95/p99 frame times in milliseconds."""
+        values = self.frame_times.percentiles(self.PERCENTILES)
+        return {f"p{q}": float(v) for q, v in zip(self.PERCENTILES, values)}
+        
+    def get_stats(self) -> dict:
+        """Get frame time and per-stage statistics in milliseconds."""
+        return {
+            'frames': len(self.frame_times),
+            'frame_time': self._summarize(self.frame_times),
+            'stages': {name: self._summarize(buffer) for name, buffer in self.stage_times.items()},
+            'gpu': {name: self._summarize(buffer) for name, buffer in self.gpu_times.items()}
+        }
+        
+    def reset(self):
+        """Drop all recorded timings."""
+        self.frame_times.clear()
+        self.stage_times.clear()
+        self.gpu_times.clear()
+        self._trace.clear()
+        self._gpu_trace.clear()
+        
+    def export_chrome_trace(self, path: Path) -> int:
+        """Write the recent frames as Chrome trace JSON (chrome://tracing, Perfetto).
+        
+        CPU scopes go on thread 1. GPU sections have no GPU timestamps, so
+        they are laid end to end from the start of their frame on thread 2.
+        Returns the number of frames written.
+        """
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'CPU'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 2, 'args': {'name': 'GPU'}}
+        ]
+        frame_starts = {}
+        for frame, start, duration, scopes in self._trace:
+            frame_starts[frame] = start
+            events.append({
+                'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                'ts': self._micros(start), 'dur': duration / 1000.0, 'args': {'frame': frame}
+            })
+            for name, scope_start, scope_duration, depth in scopes:
+                events.append({
+                    'name': name, 'cat': 'cpu', 'ph': 'X', 'pid': 1, 'tid': 1,
+                    'ts': self._micros(scope_start), 'dur': scope_duration / 1000.0,
+                    'args': {'frame': frame, 'depth': depth}
+                })
+                
+        offsets: Dict[int, float] = {}
+        for frame, name, ms in self._gpu_trace:
+            if frame not in frame_starts:
+                continue
+            offset = offsets.get(frame, 0.0)
+            events.append({
+                'name': name, 'cat': 'gpu', 'ph': 'X', 'pid': 1, 'tid': 2,
+                'ts': self._micros(frame_starts[frame]) + offset, 'dur': ms * 1000.0,
+                'args': {'frame': frame}
+            })
+            offsets[frame] = offset + ms * 1000.0
+            
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        self.logger.info(f"Wrote {len(self._trace)} frames of trace to {path}")
+        return len(self._trace)
+        
+    def cleanup(self):
+        """Release GPU queries."""
+        if self.gpu_timer is not None:
+            self.gpu_timer.cleanup()
+            
+    def _micros(self, ns: int) -> float:
+        """Convert a perf counter reading to microseconds since creation."""
+        return (ns - self._origin) / 1000.0
+        
+    def _summarize(self, buffer: RingBuffer) -> Dict[str, float]:
+        """Get average, percentiles and maximum of a buffer."""
+        summary = {'avg': buffer.mean, 'max': buffer.max}
+        for q, value in zip(self.PERCENTILES, buffer.percentiles(self.PERCENTILES)):
+            summary[f"p{q}"] = float(value)
+        return summary
@@ -0,0 +1,153 @@
+# src/infinitejournal/utilities/spatial.py
+"""Vectorized bounding-box geometry helpers.
+
+Reductions over the short xyz axis of (N, 3) arrays are slow in NumPy, so
+these helpers combine the three columns explicitly instead.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def aabb_overlaps(mins: np.ndarray, maxs: np.ndarray,
+                  query_min: np.ndarray, query_max: np.ndarray) -> np.ndarray:
+    """Test (N, 3) boxes against one query box; returns an (N,) bool mask."""
+    below = mins <= query_max
+    above = maxs >= query_min
+    return (below[:, 0] & below[:, 1] & below[:, 2] &
+            above[:, 0] & above[:, 1] & above[:, 2])
+
+
+def point_aabb_distance(point: np.ndarray, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """Get the distance from a point to each of (N, 3) boxes (0 inside)."""
+    delta = np.maximum(mins - point, 0.0) + np.maximum(point - maxs, 0.0)
+    delta *= delta
+    return np.sqrt(delta[:, 0] + delta[:, 1] + delta[:, 2])
+
+
+def ray_aabb_intersect(origin: np.ndarray, direction: np.ndarray, mins: np.ndarray,
+                       maxs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Slab-test a ray against (N, 3) boxes.
+    
+    Returns a hit mask and the entry distance along the ray for each box.
+    The entry distance is clamped to 0 for rays starting inside a box and
+    is only meaningful where the mask is True.
+    """
+    dtype = np.result_type(mins.dtype, np.float32)
+    origin = np.asarray(origin, dtype=dtype)
+    direction = np.asarray(direction, dtype=dtype)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_dir = 1.0 / direction
+        t1 = (mins - origin) * inv_dir
+        t2 = (maxs - origin) * inv_dir
+    near = np.minimum(t1, t2)
+    far = np.maximum(t1, t2)
+    
+    # Axis-parallel rays: inside the slab spans everything, outside misses
+    parallel = direction == 0.0
+    if np.any(parallel):
+        inside = (origin >= mins) & (origin <= maxs)
+        near = np.where(parallel, np.where(inside, -np.inf, np.inf), near)
+        far = np.where(parallel, np.where(inside, np.inf, -np.inf), far)
+        
+    t_near = np.maximum(np.maximum(near[:, 0], near[:, 1]), near[:, 2])
+    t_far = np.minimum(np.minimum(far[:, 0], far[:, 1]), far[:, 2])
+    hit = (t_near <= t_far) & (t_far >= 0.0)
+    return hit, np.maximum(t_near, 0.0)
+
+
+def capsules_contain(points: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                     radius: float, max_pairs: int = 1 << 20) -> np.ndarray:
+    """Test (N, 3) points against a chain of capsules; returns an (N,) bool mask.
+    
+    Capsule k is every point within radius of the segment starts[k] to
+    ends[k]; a point is inside if it is in any of them. All point-segment
+    pairs are tested at once, in blocks of about `max_pairs`.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    starts = np.asarray(starts, dtype=np.float32).reshape(-1, 3)
+    axes = np.asarray(ends, dtype=np.float32).reshape(-1, 3) - starts
+    inside = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(starts) == 0:
+        return inside
+        
+    # Degenerate segments are spheres: their projection stays at the start
+    lengths2 = axes[:, 0] * axes[:, 0] + axes[:, 1] * axes[:, 1] + axes[:, 2] * axes[:, 2]
+    with np.errstate(divide='ignore'):
+        inverse = np.where(lengths2 > 0.0, 1.0 / lengths2, 0.0).astype(np.float32)
+    radius2 = np.float32(radius * radius)
+    
+    x, y, z = (points[:, i, None] for i in range(3))
+    step = max(1, max_pairs // len(points))
+    for first in range(0, len(starts), step):
+        a = starts[first:first + step]
+        d = axes[first:first + step]
+        ox, oy, oz = x - a[:, 0], y - a[:, 1], z - a[:, 2]
+        
+        # Closest point on each segment, as a fraction of its length
+        t = (ox * d[:, 0] + oy * d[:, 1] + oz * d[:, 2]) * inverse[first:first + step]
+        np.clip(t, 0.0, 1.0, out=t)
+        ox -= t * d[:, 0]
+        oy -= t * d[:, 1]
+        oz -= t * d[:, 2]
+        distance2 = ox * ox + oy * oy + oz * oz
+        inside |= np.any(distance2 <= radius2, axis=1)
+    return inside
+
+
+class Frustum:
+    """View frustum as a set of inward-facing planes.
+    
+    Planes are stored as rows (a, b, c, d) with unit normals, so a point p
+    is inside a plane when a*x + b*y + c*z + d >= 0.
+    """
+    
+    def __init__(self, planes: np.ndarray):
+        """Initialize from an (M, 4) array of normalized planes."""
+        self.planes = np.asarray(planes, dtype=np.float32).reshape(-1, 4)
+        self._normals = self.planes[:, :3]
+        self._abs_normals = np.abs(self._normals)
+        self._offsets = self.planes[:, 3]
+        
+    @classmethod
+    def from_matrix(cls, view_projection: np.ndarray) -> "Frustum":
+        """Extract the frustum planes from a camera's view-projection matrix.
+        
+        The camera stores matrices in OpenGL's column-major layout, i.e. a
+        world point p maps to clip space as p @ view_projection, so the
+        Gribb-Hartmann planes are sums and differences of matrix columns.
+        Planes with vanishing normals (e.g. an infinite far plane) are
+        dropped.
+        """
+        m = np.asarray(view_projection, dtype=np.float64)
+        w = m[:, 3]
+        planes = np.stack([
+            w + m[:, 0],  # Left
+            w - m[:, 0],  # Right
+            w + m[:, 1],  # Bottom
+            w - m[:, 1],  # Top
+            w + m[:, 2],  # Near
+            w - m[:, 2],  # Far
+        ])
+        lengths = np.linalg.norm(planes[:, :3], axis=1)
+        valid = lengths > 1e-6
+        return cls(planes[valid] / lengths[valid, None])
+        
+    def test_aabbs(self, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+        """Test (N, 3) boxes against the frustum in one pass.
+        
+        Returns an (N,) mask that is False only for boxes lying entirely
+        outside at least one plane. Boxes straddling a frustum corner may
+        be reported visible; the test is conservative.
+        """
+        centers = (mins + maxs) * 0.5
+        extents = (maxs - mins) * 0.5
+        distance = centers @ self._normals.T + self._offsets
+        radius = extents @ self._abs_normals.T
+        return np.all(distance + radius >= 0.0, axis=1)
+        
+    def test_points(self, points: np.ndarray) -> np.ndarray:
+        """Test (N, 3) points against the frustum."""
+        return np.all(points @ self._normals.T + self._offsets >= 0.0, axis=1)
@@ -1,22 +1,44 @@
 # src/infinitejournal/world/camera.py
-"""Camera system for 3D navigation."""
+"""Camera system for 3D navigation.
+
+Matrices are column-major, so points transform as p @ view @ projection.
+Vectors and matrices live in preallocated buffers that are updated in
+place; arrays returned by the getters change when the camera moves, so
+copy them to keep a snapshot.
+"""
 
 import numpy as np
 from abc import ABC, abstractmethod
 from typing import Tuple
 import math
 
+WORLD_UP = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+
 
 class Camera(ABC):
     """Abstract base camera class."""
     
-    def __init__(self, position: np.ndarray = None, aspect_ratio: float = 16/9):
-        self.position = position if position is not None else np.array([0.0, 1.0, 3.0], dtype=np.float32)
-        self.aspect_ratio = aspect_ratio
+    def __init__(self, position: np.ndarray = None, aspect_ratio: float = 16/9,
+                 fov: float = 45.0, near: float = 0.1, far: float = 1000.0):
+        self.position = np.array(position if position is not None else [0.0, 1.0, 3.0],
+                                 dtype=np.float32)
+        self._aspect_ratio = aspect_ratio
+        self._fov = fov
+        self._near = near
+        self._far = far
+        self._reversed_z = False
+        
         self._view_matrix = np.eye(4, dtype=np.float32)
-        self._projection_matrix = np.eye(4, dtype=np.float32)
+        self._projection_matrix = np.zeros((4, 4), dtype=np.float32)
         self._view_projection_matrix = np.eye(4, dtype=np.float32)
+        self._inverse_view_matrix = np.eye(4, dtype=np.float32)
+        self._inverse_projection_matrix = np.zeros((4, 4), dtype=np.float32)
+        self._inverse_view_projection_matrix = np.eye(4, dtype=np.float32)
+        
+        # The view changes every frame the camera moves; the projection
+        # only on resize or lens changes
         self._needs_update = True
+        self._projection_dirty = True
         
     @abstractmethod
     def update(self, delta_time: float):
@@ -33,33 +55,217 @@ class Camera(ABC):
         """Handle keyboard input for camera movement."""
         pass
         
+    @property
+    def aspect_ratio(self) -> float:
+        """Get the viewport aspect ratio."""
+        return self._aspect_ratio
+        
+    @aspect_ratio.setter
+    def aspect_ratio(self, value: float):
+        self._aspect_ratio = value
+        self._projection_dirty = True
+        
+    @property
+    def fov(self) -> float:
+        """Get the vertical field of view in degrees."""
+        return self._fov
+        
+    @fov.setter
+    def fov(self, value: float):
+        self._fov = value
+        self._projection_dirty = True
+        
+    @property
+    def near(self) -> float:
+        """Get the near plane distance."""
+        return self._near
+        
+    @near.setter
+    def near(self, value: float):
+        self._near = value
+        self._projection_dirty = True
+        
+    @property
+    def far(self) -> float:
+        """Get the far plane distance."""
+        return self._far
+        
+    @far.setter
+    def far(self, value: float):
+        self._far = value
+        self._projection_dirty = True
+        
+    @property
+    def reversed_z(self) -> bool:
+        """Check if depth is reversed, with the far plane at infinity.
+        
+        Depth then runs from 1 at the near plane to 0 at infinity, so depth
+        is cleared to 0 and tested with GL_GREATER; `far` is ignored by the
+        projection.
+        """
+        return self._reversed_z
+        
+    @reversed_z.setter
+    def reversed_z(self, value: bool):
+        self._reversed_z = bool(value)
+        self._projection_dirty = True
+        
     def get_view_matrix(self) -> np.ndarray:
         """Get the view matrix."""
-        if self._needs_update:
-            self._update_matrices()
+        self._ensure_matrices()
         return self._view_matrix
         
     def get_projection_matrix(self) -> np.ndarray:
         """Get the projection matrix."""
-        if self._needs_update:
-            self._update_matrices()
+        self._ensure_matrices()
         return self._projection_matrix
         
     def get_view_projection_matrix(self) -> np.ndarray:
         """Get the combined view-projection matrix."""
-        if self._needs_update:
-            self._update_matrices()
+        self._ensure_matrices()
         return self._view_projection_matrix
         
+    def get_inverse_view_matrix(self) -> np.ndarray:
+        """Get the camera-to-world matrix."""
+        self._ensure_matrices()
+        return self._inverse_view_matrix
+        
+    def get_inverse_projection_matrix(self) -> np.ndarray:
+        """Get the clip-to-camera matrix."""
+        self._ensure_matrices()
+        return self._inverse_projection_matrix
+        
+    def get_inverse_view_projection_matrix(self) -> np.ndarray:
+        """Get the clip-to-world matrix."""
+        self._ensure_matrices()
+        return self._inverse_view_projection_matrix
+        
+    def screen_ray(self, x: float, y: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the world-space (origin, direction) of the ray through a point.
+        
+        `x` and `y` are normalized device coordinates in [-1, 1], y up.
+        """
+        origins, directions = self.screen_rays(np.array([[x, y]], dtype=np.float32))
+        return origins[0], directions[0]
+        
+    def screen_rays(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the world-space (origins, directions) of rays through many points.
+        
+        `points` is an (N, 2) array of normalized device coordinates, y up.
+        All rays are unprojected with a single product against the inverse
+        view-projection.
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        count = len(points)
+        inverse = self.get_inverse_view_projection_matrix()
+        
+        # Two depths in front of the camera; reversed depth reaches infinity at 0
+        near_depth, far_depth = (1.0, 0.5) if self._reversed_z else (-1.0, 1.0)
+        clip = np.empty((2 * count, 4), dtype=np.float32)
+        clip[:count, :2] = points
+        clip[count:, :2] = points
+        clip[:count, 2] = near_depth
+        clip[count:, 2] = far_depth
+        clip[:, 3] = 1.0
+        world = clip @ inverse
+        world = world[:, :3] / world[:, 3:]
+        origins = world[:count]
+        directions = world[count:] - origins
+        directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+        return origins, directions
+        
+    def _ensure_matrices(self):
+        """Rebuild whichever matrices are stale."""
+        if not (self._needs_update or self._projection_dirty):
+            return
+        if self._projection_dirty:
+            self._update_projection()
+            self._projection_dirty = False
+        if self._needs_update:
+            self._update_view()
+            self._needs_update = False
+        np.matmul(self._view_matrix, self._projection_matrix, out=self._view_projection_matrix)
+        np.matmul(self._inverse_projection_matrix, self._inverse_view_matrix,
+                  out=self._inverse_view_projection_matrix)
+                  
     @abstractmethod
-    def _update_matrices(self):
-        """Update internal matrices."""
+    def _update_view(self):
+        """Rebuild the view matrix and its inverse."""
         pass
         
+    def _update_projection(self):
+        """Rebuild the perspective projection and its inverse."""
+        f = 1.0 / math.tan(math.radians(self._fov) * 0.5)
+        near, far = self._near, self._far
+        if self._reversed_z:
+            # Clip z is the constant near, so depth is near / distance
+            a, b = 0.0, near
+        else:
+            a = (far + near) / (near - far)
+            b = (2.0 * far * near) / (near - far)
+            
+        result = self._projection_matrix
+        result[0, 0] = f / self._aspect_ratio
+        result[1, 1] = f
+        result[2, 2] = a
+        result[2, 3] = -1.0
+        result[3, 2] = b
+        
+        inverse = self._inverse_projection_matrix
+        inverse[0, 0] = self._aspect_ratio / f
+        inverse[1, 1] = 1.0 / f
+        inverse[2, 3] = 1.0 / b
+        inverse[3, 2] = -1.0
+        inverse[3, 3] = a / b
+        
+    def _write_view(self, eye: np.ndarray, s: np.ndarray, u: np.ndarray, f: np.ndarray):
+        """Write a look-at view matrix from an orthonormal basis.
+        
+        `s`, `u` and `f` are the camera's right, up and forward vectors.
+        """
+        ex, ey, ez = float(eye[0]), float(eye[1]), float(eye[2])
+        sx, sy, sz = float(s[0]), float(s[1]), float(s[2])
+        ux, uy, uz = float(u[0]), float(u[1]), float(u[2])
+        fx, fy, fz = float(f[0]), float(f[1]), float(f[2])
+        
+        result = self._view_matrix
+        result[0, 0] = sx
+        result[1, 0] = sy
+        result[2, 0] = sz
+        result[0, 1] = ux
+        result[1, 1] = uy
+        result[2, 1] = uz
+        result[0, 2] = -fx
+        result[1, 2] = -fy
+        result[2, 2] = -fz
+        result[3, 0] = -(sx * ex + sy * ey + sz * ez)
+        result[3, 1] = -(ux * ex + uy * ey + uz * ez)
+        result[3, 2] = fx * ex + fy * ey + fz * ez
+        
+        # The rotation is orthonormal, so the inverse is its transpose
+        # followed by the camera position
+        inverse = self._inverse_view_matrix
+        inverse[0, 0] = sx
+        inverse[0, 1] = sy
+        inverse[0, 2] = sz
+        inverse[1, 0] = ux
+        inverse[1, 1] = uy
+        inverse[1, 2] = uz
+        inverse[2, 0] = -fx
+        inverse[2, 1] = -fy
+        inverse[2, 2] = -fz
+        inverse[3, 0] = ex
+        inverse[3, 1] = ey
+        inverse[3, 2] = ez
+        
+    def set_position(self, position: np.ndarray):
+        """Move the camera."""
+        self.position[:] = position
+        self._needs_update = True
+        
     def set_aspect_ratio(self, aspect_ratio: float):
         """Update the aspect ratio."""
         self.aspect_ratio = aspect_ratio
-        self._needs_update = True
 
 
 class FPSCamera(Camera):
@@ -67,10 +273,7 @@ class FPSCamera(Camera):
     
     def __init__(self, position: np.ndarray = None, aspect_ratio: float = 16/9,
                  fov: float = 45.0, near: float = 0.1, far: float = 1000.0):
-        super().__init__(position, aspect_ratio)
-        self.fov = fov
-        self.near = near
-        self.far = far
+        super().__init__(position, aspect_ratio, fov, near, far)
         
         # Euler angles
         self.yaw = -90.0  # Looking along -Z
@@ -91,22 +294,30 @@ class FPSCamera(Camera):
         self.acceleration = 20.0
         self.friction = 10.0
         
+        # Scratch space for per-frame vector math
+        self._scratch = np.zeros(3, dtype=np.float32)
+        
         self._update_camera_vectors()
         
     def update(self, delta_time: float):
         """Update camera state with smooth movement."""
-        # Apply friction
-        if np.linalg.norm(self.velocity) > 0.01:
-            friction_force = -self.velocity * self.friction * delta_time
-            self.velocity += friction_force
+        velocity = self.velocity
+        speed_squared = float(velocity @ velocity)
+        
+        # Apply friction; exponential decay stays stable for any step size
+        if speed_squared > 0.01 ** 2:
+            velocity *= np.float32(math.exp(-self.friction * delta_time))
+            speed_squared = float(velocity @ velocity)
             
             # Stop if velocity is very small
-            if np.linalg.norm(self.velocity) < 0.1:
-                self.velocity = np.zeros(3, dtype=np.float32)
-        
+            if speed_squared < 0.1 ** 2:
+                velocity.fill(0.0)
+                speed_squared = 0.0
+                
         # Update position
-        if np.linalg.norm(self.velocity) > 0:
-            self.position += self.velocity * delta_time
+        if speed_squared > 0:
+            np.multiply(velocity, delta_time, out=self._scratch)
+            self.position += self._scratch
             self._needs_update = True
             
     def handle_mouse_movement(self, dx: float, dy: float):
@@ -115,7 +326,7 @@ class FPSCamera(Camera):
         self.pitch -= dy * self.mouse_sensitivity
         
         # Clamp pitch to prevent flipping
-        self.pitch = np.clip(self.pitch, -89.0, 89.0)
+        self.pitch = min(max(self.pitch, -89.0), 89.0)
         
         self._update_camera_vectors()
         self._needs_update = True
@@ -123,7 +334,8 @@ class FPSCamera(Camera):
     def handle_keyboard(self, keys: dict, delta_time: float):
         """Handle WASD movement with acceleration."""
         # Calculate desired movement direction
-        movement = np.zeros(3, dtype=np.float32)
+        movement = self._scratch
+        movement.fill(0.0)
         
         speed = self.movement_speed
         if keys.get('shift', False):
@@ -143,97 +355,46 @@ class FPSCamera(Camera):
             movement -= self.up
             
         # Normalize movement vector
-        if np.linalg.norm(movement) > 0:
-            movement = movement / np.linalg.norm(movement)
-            
-            # Apply acceleration
-            target_velocity = movement * speed
-            velocity_diff = target_velocity - self.velocity
+        length = math.sqrt(float(movement @ movement))
+        if length > 0:
+            # Turn the movement into the difference to the target velocity
+            movement *= speed / length
+            movement -= self.velocity
             
             # Smooth acceleration
-            if np.linalg.norm(velocity_diff) > 0:
-                accel = velocity_diff / np.linalg.norm(velocity_diff) * self.acceleration
-                self.velocity += accel * delta_time
+            difference = math.sqrt(float(movement @ movement))
+            if difference > 0:
+                movement *= self.acceleration * delta_time / difference
+                self.velocity += movement
                 
                 # Clamp to max speed
-                if np.linalg.norm(self.velocity) > speed:
-                    self.velocity = self.velocity / np.linalg.norm(self.velocity) * speed
+                current = math.sqrt(float(self.velocity @ self.velocity))
+                if current > speed:
+                    self.velocity *= speed / current
                     
     def _update_camera_vectors(self):
         """Update camera orientation vectors from euler angles."""
-        # Calculate front vector
-        front = np.zeros(3, dtype=np.float32)
-        front[0] = np.cos(np.radians(self.yaw)) * np.cos(np.radians(self.pitch))
-        front[1] = np.sin(np.radians(self.pitch))
-        front[2] = np.sin(np.radians(self.yaw)) * np.cos(np.radians(self.pitch))
-        
-        self.front = front / np.linalg.norm(front)
-        self.right = np.cross(self.front, self.up)
-        self.right = self.right / np.linalg.norm(self.right)
-        
-        # Recalculate up vector to ensure orthogonality
-        self.up = np.cross(self.right, self.front)
-        self.up = self.up / np.linalg.norm(self.up)
-        
-    def _update_matrices(self):
-        """Update view and projection matrices."""
-        # View matrix using lookAt
-        self._view_matrix = self._look_at(
-            self.position,
-            self.position + self.front,
-            self.up
-        )
-        
-        # Projection matrix
-        self._projection_matrix = self._perspective(
-            np.radians(self.fov),
-            self.aspect_ratio,
-            self.near,
-            self.far
-        )
-        
-        # Combined matrix
-        self._view_projection_matrix = self._projection_matrix @ self._view_matrix
-        self._needs_update = False
-        
-    def _look_at(self, eye: np.ndarray, center: np.ndarray, up: np.ndarray) -> np.ndarray:
-        """Create a look-at view matrix."""
-        f = center - eye
-        f = f / np.linalg.norm(f)
-        
-        s = np.cross(f, up)
-        s = s / np.linalg.norm(s)
-        
-        u = np.cross(s, f)
-        
-        result = np.eye(4, dtype=np.float32)
-        result[0, 0] = s[0]
-        result[1, 0] = s[1]
-        result[2, 0] = s[2]
-        result[0, 1] = u[0]
-        result[1, 1] = u[1]
-        result[2, 1] = u[2]
-        result[0, 2] = -f[0]
-        result[1, 2] = -f[1]
-        result[2, 2] = -f[2]
-        result[3, 0] = -np.dot(s, eye)
-        result[3, 1] = -np.dot(u, eye)
-        result[3, 2] = np.dot(f, eye)
-        
-        return result
-        
-    def _perspective(self, fovy: float, aspect: float, near: float, far: float) -> np.ndarray:
-        """Create a perspective projection matrix."""
-        f = 1.0 / np.tan(fovy / 2.0)
-        
-        result = np.zeros((4, 4), dtype=np.float32)
-        result[0, 0] = f / aspect
-        result[1, 1] = f
-        result[2, 2] = (far + near) / (near - far)
-        result[2, 3] = -1.0
-        result[3, 2] = (2.0 * far * near) / (near - far)
-        
-        return result
+        yaw = math.radians(self.yaw)
+        pitch = math.radians(self.pitch)
+        cos_yaw, sin_yaw = math.cos(yaw), math.sin(yaw)
+        cos_pitch, sin_pitch = math.cos(pitch), math.sin(pitch)
+        
+        # Closed forms of front, front x world up and right x front; all
+        # three are unit length by construction
+        front, right, up = self.front, self.right, self.up
+        front[0] = cos_yaw * cos_pitch
+        front[1] = sin_pitch
+        front[2] = sin_yaw * cos_pitch
+        right[0] = -sin_yaw
+        right[1] = 0.0
+        right[2] = cos_yaw
+        up[0] = -cos_yaw * sin_pitch
+        up[1] = cos_pitch
+        up[2] = -sin_yaw * sin_pitch
+        
+    def _update_view(self):
+        """Rebuild the view matrix from the camera vectors."""
+        self._write_view(self.position, self.right, self.up, self.front)
 
 
 class OrbitCamera(Camera):
@@ -245,18 +406,16 @@ class OrbitCamera(Camera):
         # Initialize at a position relative to target
         if target is None:
             target = np.zeros(3, dtype=np.float32)
-        
-        super().__init__(target + np.array([0, 0, distance], dtype=np.float32), aspect_ratio)
-        
-        self.target = target
+            
+        super().__init__(target + np.array([0, 0, distance], dtype=np.float32), aspect_ratio,
+                         fov, near, far)
+                         
+        self.target = np.array(target, dtype=np.float32)
+        self.up = WORLD_UP.copy()
         self.distance = distance
         self.min_distance = 1.0
         self.max_distance = 100.0
         
-        self.fov = fov
-        self.near = near
-        self.far = far
-        
         # Spherical coordinates
         self.azimuth = 0.0  # Horizontal rotation
         self.elevation = 20.0  # Vertical rotation
@@ -284,10 +443,9 @@ class OrbitCamera(Camera):
             self.elevation += dy * self.rotation_speed
             
             # Clamp elevation
-            self.elevation = np.clip(self.elevation, -85.0, 85.0)
+            self.elevation = min(max(self.elevation, -85.0), 85.0)
             
             self._update_position()
-            self._needs_update = True
             
         elif buttons.get('middle', False):
             # Pan camera
@@ -301,15 +459,13 @@ class OrbitCamera(Camera):
             self.target += up * dy * self.pan_speed * self.distance
             
             self._update_position()
-            self._needs_update = True
             
     def handle_scroll(self, delta: float):
         """Handle mouse scroll for zooming."""
         self.distance *= 1.0 - delta * self.zoom_speed
-        self.distance = np.clip(self.distance, self.min_distance, self.max_distance)
+        self.distance = min(max(self.distance, self.min_distance), self.max_distance)
         
         self._update_position()
-        self._needs_update = True
         
     def handle_keyboard(self, keys: dict, delta_time: float):
         """Handle keyboard input."""
@@ -319,67 +475,22 @@ class OrbitCamera(Camera):
     def _update_position(self):
         """Update camera position from spherical coordinates."""
         # Convert spherical to cartesian
-        azimuth_rad = np.radians(self.azimuth)
-        elevation_rad = np.radians(self.elevation)
-        
-        x = self.distance * np.cos(elevation_rad) * np.sin(azimuth_rad)
-        y = self.distance * np.sin(elevation_rad)
-        z = self.distance * np.cos(elevation_rad) * np.cos(azimuth_rad)
-        
-        self.position = self.target + np.array([x, y, z], dtype=np.float32)
-        
-    def _update_matrices(self):
-        """Update view and projection matrices."""
-        # View matrix
-        self._view_matrix = self._look_at(self.position, self.target, self.up)
-        
-        # Projection matrix
-        self._projection_matrix = self._perspective(
-            np.radians(self.fov),
-            self.aspect_ratio,
-            self.near,
-            self.far
-        )
+        azimuth_rad = math.radians(self.azimuth)
+        elevation_rad = math.radians(self.elevation)
         
-        # Combined matrix
-        self._view_projection_matrix = self._projection_matrix @ self._view_matrix
-        self._needs_update = False
+        position = self.position
+        position[0] = self.target[0] + self.distance * math.cos(elevation_rad) * math.sin(azimuth_rad)
+        position[1] = self.target[1] + self.distance * math.sin(elevation_rad)
+        position[2] = self.target[2] + self.distance * math.cos(elevation_rad) * math.cos(azimuth_rad)
+        self._needs_update = True
         
-    def _look_at(self, eye: np.ndarray, center: np.ndarray, up: np.ndarray) -> np.ndarray:
-        """Create a look-at view matrix."""
-        f = center - eye
-        f = f / np.linalg.norm(f)
+    def _update_view(self):
+        """Rebuild the view matrix looking at the target."""
+        f = self.target - self.position
+        f /= np.linalg.norm(f)
         
-        s = np.cross(f, up)
-        s = s / np.linalg.norm(s)
+        s = np.cross(f, self.up)
+        s /= np.linalg.norm(s)
         
         u = np.cross(s, f)
-        
-        result = np.eye(4, dtype=np.float32)
-        result[0, 0] = s[0]
-        result[1, 0] = s[1]
-        result[2, 0] = s[2]
-        result[0, 1] = u[0]
-        result[1, 1] = u[1]
-        result[2, 1] = u[2]
-        result[0, 2] = -f[0]
-        result[1, 2] = -f[1]
-        result[2, 2] = -f[2]
-        result[3, 0] = -np.dot(s, eye)
-        result[3, 1] = -np.dot(u, eye)
-        result[3, 2] = np.dot(f, eye)
-        
-        return result
-        
-    def _perspective(self, fovy: float, aspect: float, near: float, far: float) -> np.ndarray:
-        """Create a perspective projection matrix."""
-        f = 1.0 / np.tan(fovy / 2.0)
-        
-        result = np.zeros((4, 4), dtype=np.float32)
-        result[0, 0] = f / aspect
-        result[1, 1] = f
-        result[2, 2] = (far + near) / (near - far)
-        result[2, 3] = -1.0
-        result[3, 2] = (2.0 * far * near) / (near - far)
-        
-        return result
\ No newline at end of file
+        self._write_view(self.position, s, u, f)
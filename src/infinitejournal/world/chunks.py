@@ -0,0 +1,268 @@
+# src/infinitejournal/world/chunks.py
+"""Chunked partitioning of the infinite world around the camera."""
+
+import logging
+import math
+from enum import Enum
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+ChunkCoord = Tuple[int, int, int]
+
+
+class ChunkState(Enum):
+    """Lifecycle state of a chunk."""
+    
+    LOADING = "loading"
+    LOADED = "loaded"
+
+
+class Chunk:
+    """A fixed-size cubic cell of the world and the strokes it owns."""
+    
+    __slots__ = ('coord', 'state', 'stroke_ids', 'data')
+    
+    def __init__(self, coord: ChunkCoord):
+        self.coord = coord
+        self.state = ChunkState.LOADING
+        self.stroke_ids: Set[int] = set()
+        self.data = None  # Payload attached by the loader
+        
+    @property
+    def is_loaded(self) -> bool:
+        """Check if the chunk's content is resident."""
+        return self.state == ChunkState.LOADED
+        
+    def __repr__(self) -> str:
+        return f"Chunk({self.coord}, {self.state.value}, strokes={len(self.stroke_ids)})"
+
+
+class ChunkManager:
+    """Keeps the chunks around the camera resident and unloads the rest.
+    
+    The world is split into cubes of `chunk_size` world units. Chunks whose
+    horizontal (XZ) distance from the camera's chunk is within
+    `load_radius` and whose vertical distance is within `vertical_radius`
+    are loaded. Chunks are only unloaded once they fall `unload_margin`
+    chunks beyond those radii, so walking along a chunk border does not
+    thrash loads and unloads. Pinned chunks (e.g. ones holding content that
+    has not been persisted yet) stay resident regardless of distance.
+    
+    Loading and unloading are delegated to optional callbacks. A loader
+    that finishes synchronously should call `mark_loaded`; if no loader is
+    set chunks are marked loaded immediately.
+    """
+    
+    def __init__(self, chunk_size: float = 32.0, load_radius: int = 4,
+                 vertical_radius: int = 1, unload_margin: int = 1,
+                 loader: Optional[Callable[[Chunk], None]] = None,
+                 unloader: Optional[Callable[[Chunk], None]] = None):
+        """Initialize the chunk manager."""
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+            
+        self.logger = logging.getLogger(__name__)
+        self.chunk_size = float(chunk_size)
+        self.load_radius = max(0, int(load_radius))
+        self.vertical_radius = max(0, int(vertical_radius))
+        self.unload_margin = max(0, int(unload_margin))
+        self.loader = loader
+        self.unloader = unloader
+        
+        self._chunks: Dict[ChunkCoord, Chunk] = {}
+        self._stroke_chunks: Dict[int, ChunkCoord] = {}
+        self._center: Optional[ChunkCoord] = None
+        
+        # Offsets within the load region, nearest first
+        self._offsets = self._build_offsets(self.load_radius, self.vertical_radius)
+        
+    # ----------------------------------------------------------------
+    # Coordinates
+    # ----------------------------------------------------------------
+    
+    def chunk_coord(self, position: np.ndarray) -> ChunkCoord:
+        """Get the coordinate of the chunk containing a world position."""
+        size = self.chunk_size
+        return (
+            int(math.floor(position[0] / size)),
+            int(math.floor(position[1] / size)),
+            int(math.floor(position[2] / size)),
+        )
+        
+    def chunk_coords(self, positions: np.ndarray) -> np.ndarray:
+        """Get the (N, 3) chunk coordinates of many world positions."""
+        return np.floor(np.asarray(positions) / self.chunk_size).astype(np.int64)
+        
+    def chunk_bounds(self, coord: ChunkCoord) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the world-space (min, max) corners of a chunk."""
+        lower = np.array(coord, dtype=np.float32) * self.chunk_size
+        return lower, lower + self.chunk_size
+        
+    def region(self, center: ChunkCoord) -> Iterator[ChunkCoord]:
+        """Iterate over the chunks of the load region around a center, nearest first."""
+        cx, cy, cz = center
+        for dx, dy, dz in self._offsets:
+            yield (cx + dx, cy + dy, cz + dz)
+            
+    def get_bounds_array(self, coords: List[ChunkCoord]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (N, 3) min and max corners of several chunks."""
+        lower = np.array(coords, dtype=np.float32).reshape(-1, 3) * self.chunk_size
+        return lower, lower + self.chunk_size
+        
+    # ----------------------------------------------------------------
+    # Streaming
+    # ----------------------------------------------------------------
+    
+    def update(self, position: np.ndarray, force: bool = False) -> bool:
+        """Load and unload chunks for a camera position.
+        
+        Returns True if the set of resident chunks was recomputed.
+        """
+        center = self.chunk_coord(position)
+        if center == self._center and not force:
+            return False
+        self._center = center
+        
+        # Unload chunks that drifted out of range
+        for coord, chunk in list(self._chunks.items()):
+            if not self._within_keep_range(coord, center):
+                self.unload(coord)
+                
+        # Load missing chunks, nearest first
+        for coord in self.region(center):
+            if coord not in self._chunks:
+                self.load(coord)
+                
+        return True
+        
+    def load(self, coord: ChunkCoord) -> Chunk:
+        """Request a chunk to be loaded and return it."""
+        chunk = self._chunks.get(coord)
+        if chunk is not None:
+            return chunk
+            
+        chunk = Chunk(coord)
+        self._chunks[coord] = chunk
+        if self.loader is not None:
+            self.loader(chunk)
+        else:
+            chunk.state = ChunkState.LOADED
+        return chunk
+        
+    def mark_loaded(self, coord: ChunkCoord, data=None) -> Optional[Chunk]:
+        """Mark a requested chunk as resident; ignored if it was unloaded meanwhile."""
+        chunk = self._chunks.get(coord)
+        if chunk is None:
+            return None
+        chunk.data = data
+        chunk.state = ChunkState.LOADED
+        return chunk
+        
+    def unload(self, coord: ChunkCoord):
+        """Unload a chunk and forget the strokes it owns."""
+        chunk = self._chunks.pop(coord, None)
+        if chunk is None:
+            return
+        if self.unloader is not None:
+            self.unloader(chunk)
+        for stroke_id in chunk.stroke_ids:
+            self._stroke_chunks.pop(stroke_id, None)
+        chunk.stroke_ids.clear()
+        chunk.data = None
+        
+    def unload_all(self):
+        """Unload every resident chunk."""
+        for coord in list(self._chunks):
+            self.unload(coord)
+        self._center = None
+        
+    # ----------------------------------------------------------------
+    # Stroke membership
+    # ----------------------------------------------------------------
+    
+    def assign_stroke(self, stroke_id: int, bounds_min: np.ndarray,
+                      bounds_max: np.ndarray) -> ChunkCoord:
+        """Attach a stroke to the chunk containing its bounding box center."""
+        center = (np.asarray(bounds_min) + np.asarray(bounds_max)) * 0.5
+        coord = self.chunk_coord(center)
+        
+        previous = self._stroke_chunks.get(stroke_id)
+        if previous == coord:
+            return coord
+        if previous is not None:
+            self.release_stroke(stroke_id)
+            
+        # Content created outside the resident area still needs a home. Its
+        # chunk goes through the loader like any other, so the strokes
+        # already stored there are read and merged when the load arrives.
+        chunk = self.load(coord)
+        chunk.stroke_ids.add(stroke_id)
+        self._stroke_chunks[stroke_id] = coord
+        return coord
+        
+    def release_stroke(self, stroke_id: int):
+        """Detach a stroke from its chunk."""
+        coord = self._stroke_chunks.pop(stroke_id, None)
+        if coord is None:
+            return
+        chunk = self._chunks.get(coord)
+        if chunk is not None:
+            chunk.stroke_ids.discard(stroke_id)
+            
+    def chunk_of(self, stroke_id: int) -> Optional[ChunkCoord]:
+        """Get the coordinate of the chunk owning a stroke."""
+        return self._stroke_chunks.get(stroke_id)
+        
+    # ----------------------------------------------------------------
+    # Access
+    # ----------------------------------------------------------------
+    
+    def get_chunk(self, coord: ChunkCoord) -> Optional[Chunk]:
+        """Get a resident or loading chunk."""
+        return self._chunks.get(coord)
+        
+    def get_loaded_chunks(self) -> List[Chunk]:
+        """Get every fully loaded chunk."""
+        return [chunk for chunk in self._chunks.values() if chunk.is_loaded]
+        
+    @property
+    def center(self) -> Optional[ChunkCoord]:
+        """Get the chunk the camera was last in."""
+        return self._center
+        
+    def __contains__(self, coord: ChunkCoord) -> bool:
+        return coord in self._chunks
+        
+    def __len__(self) -> int:
+        return len(self._chunks)
+        
+    def __iter__(self) -> Iterator[Chunk]:
+        return iter(list(self._chunks.values()))
+        
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+    
+    def _within_keep_range(self, coord: ChunkCoord, center: ChunkCoord) -> bool:
+        """Check if a chunk is close enough to the center to stay resident."""
+        dx = coord[0] - center[0]
+        dy = coord[1] - center[1]
+        dz = coord[2] - center[2]
+        radius = self.load_radius + self.unload_margin
+        return (dx * dx + dz * dz <= radius * radius and
+                abs(dy) <= self.vertical_radius + self.unload_margin)
+                
+    @staticmethod
+    def _build_offsets(radius: int, vertical_radius: int) -> List[ChunkCoord]:
+        """Enumerate chunk offsets inside the load cylinder, nearest first."""
+        offsets = []
+        for dx in range(-radius, radius + 1):
+            for dz in range(-radius, radius + 1):
+                if dx * dx + dz * dz > radius * radius:
+                    continue
+                for dy in range(-vertical_radius, vertical_radius + 1):
+                    offsets.append((dx, dy, dz))
+        offsets.sort(key=lambda o: o[0] * o[0] + o[1] * o[1] + o[2] * o[2])
+        return offsets
@@ -0,0 +1,110 @@
+# src/infinitejournal/world/culling.py
+"""View-frustum culling of chunks and strokes."""
+
+import logging
+from typing import Dict
+
+import numpy as np
+
+from infinitejournal.drawing.strokes import StrokeStore
+from infinitejournal.utilities.spatial import Frustum
+from infinitejournal.world.chunks import ChunkCoord, ChunkManager
+
+
+class StrokeCuller:
+    """Finds the strokes inside the camera frustum, grouped by chunk.
+    
+    Strokes are grouped by the chunk that owns them (the chunk containing
+    their bounding box center) and each group's combined bounds are kept.
+    The grouping is rebuilt only when the stroke store changes. Each frame
+    then costs one vectorized frustum test over the chunk bounds and one
+    over the strokes of the chunks that survived.
+    """
+    
+    def __init__(self, store: StrokeStore, chunk_manager: ChunkManager):
+        """Initialize the culler."""
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.chunk_manager = chunk_manager
+        
+        # Strokes sorted by chunk, and each chunk's [start, end) slice
+        self._revision = -1
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._mins = np.zeros((0, 3), dtype=np.float32)
+        self._maxs = np.zeros((0, 3), dtype=np.float32)
+        self._chunk_coords = []
+        self._chunk_starts = np.zeros(0, dtype=np.int64)
+        self._chunk_ends = np.zeros(0, dtype=np.int64)
+        self._chunk_mins = np.zeros((0, 3), dtype=np.float32)
+        self._chunk_maxs = np.zeros((0, 3), dtype=np.float32)
+        
+        # Statistics of the last cull
+        self.visible_chunk_count = 0
+        self.visible_stroke_count = 0
+        
+    def cull(self, view_projection: np.ndarray) -> Dict[ChunkCoord, np.ndarray]:
+        """Get the ids of visible strokes for every chunk with visible content."""
+        if self._revision != self.store.revision:
+            self._rebuild()
+            
+        self.visible_chunk_count = 0
+        self.visible_stroke_count = 0
+        if len(self._chunk_coords) == 0:
+            return {}
+            
+        frustum = Frustum.from_matrix(view_projection)
+        
+        # Chunk pass
+        chunk_visible = np.flatnonzero(frustum.test_aabbs(self._chunk_mins, self._chunk_maxs))
+        if len(chunk_visible) == 0:
+            return {}
+            
+        # Stroke pass over the strokes of surviving chunks
+        starts = self._chunk_starts[chunk_visible]
+        counts = self._chunk_ends[chunk_visible] - starts
+        total = int(counts.sum())
+        group_starts = np.cumsum(counts) - counts
+        rows = np.repeat(starts - group_starts, counts) + np.arange(total)
+        stroke_visible = frustum.test_aabbs(self._mins[rows], self._maxs[rows])
+        
+        # Split the surviving strokes back into their chunks
+        visible_counts = np.add.reduceat(stroke_visible.astype(np.int64), group_starts)
+        visible_ids = self._ids[rows[stroke_visible]]
+        bounds = np.cumsum(visible_counts)
+        
+        result = {}
+        begin = 0
+        for chunk_index, end in zip(chunk_visible.tolist(), bounds.tolist()):
+            if end > begin:
+                result[self._chunk_coords[chunk_index]] = visible_ids[begin:end]
+            begin = end
+            
+        self.visible_chunk_count = len(result)
+        self.visible_stroke_count = len(visible_ids)
+        return result
+        
+    def invalidate(self):
+        """Force the chunk grouping to be rebuilt on the next cull."""
+        self._revision = -1
+        
+    def _rebuild(self):
+        """Group the store's strokes by owning chunk."""
+        ids, mins, maxs = self.store.get_all_bounds()
+        self._revision = self.store.revision
+        if len(ids) == 0:
+            self._chunk_coords = []
+            return
+            
+        coords = self.chunk_manager.chunk_coords((mins + maxs) * 0.5)
+        order = np.lexsort((coords[:, 2], coords[:, 1], coords[:, 0]))
+        coords = coords[order]
+        self._ids = ids[order]
+        self._mins = mins[order]
+        self._maxs = maxs[order]
+        
+        changes = np.flatnonzero(np.any(coords[1:] != coords[:-1], axis=1)) + 1
+        self._chunk_starts = np.concatenate([[0], changes]).astype(np.int64)
+        self._chunk_ends = np.concatenate([changes, [len(ids)]]).astype(np.int64)
+        self._chunk_mins = np.minimum.reduceat(self._mins, self._chunk_starts, axis=0)
+        self._chunk_maxs = np.maximum.reduceat(self._maxs, self._chunk_starts, axis=0)
+        self._chunk_coords = [tuple(c) for c in coords[self._chunk_starts].tolist()]
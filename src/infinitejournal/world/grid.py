@@ -4,28 +4,33 @@
 import numpy as np
 from OpenGL.GL import *
 import logging
+from typing import Optional
+
+from infinitejournal.backends.opengl import glcalls
+from infinitejournal.backends.opengl.shaders import ShaderManager
 
 
 class GridRenderer:
-    """Renders an infinite grid using a single quad and shaders."""
+    """Renders an infinite grid using a single quad and shaders.
+    
+    With a reversed-Z camera the grid is drawn as real geometry instead: a
+    fan from the point below the camera out to points at infinity, which an
+    infinite far plane can rasterize. Its depth then comes from the
+    rasterizer, so the fragment shader does not write gl_FragDepth and
+    early depth testing stays enabled.
+    """
     
     # Vertex shader for the grid
     VERTEX_SHADER = """
     #version 330 core
     
-    layout(location = 0) in vec3 aPos;
-    
-    uniform mat4 viewProjection;
+    uniform mat4 inverseViewProjection;
     
     out vec3 nearPoint;
     out vec3 farPoint;
-    out mat4 fragView;
-    out mat4 fragProj;
     
-    vec3 UnprojectPoint(float x, float y, float z, mat4 view, mat4 projection) {
-        mat4 viewInv = inverse(view);
-        mat4 projInv = inverse(projection);
-        vec4 unprojectedPoint = viewInv * projInv * vec4(x, y, z, 1.0);
+    vec3 UnprojectPoint(float x, float y, float z) {
+        vec4 unprojectedPoint = inverseViewProjection * vec4(x, y, z, 1.0);
         return unprojectedPoint.xyz / unprojectedPoint.w;
     }
     
@@ -40,13 +45,9 @@ class GridRenderer:
         
         vec3 p = gridPlane[gl_VertexID].xyz;
         
-        // Pass matrices to fragment shader
-        fragView = viewProjection;
-        fragProj = viewProjection;
-        
-        // Unproject points to world space
-        nearPoint = UnprojectPoint(p.x, p.y, 0.0, fragView, fragProj).xyz;
-        farPoint = UnprojectPoint(p.x, p.y, 1.0, fragView, fragProj).xyz;
+        // Unproject the corner on the near and far planes to world space
+        nearPoint = UnprojectPoint(p.x, p.y, -1.0);
+        farPoint = UnprojectPoint(p.x, p.y, 1.0);
         
         gl_Position = vec4(p, 1.0);
     }
@@ -58,11 +59,10 @@ class GridRenderer:
     
     in vec3 nearPoint;
     in vec3 farPoint;
-    in mat4 fragView;
-    in mat4 fragProj;
     
     out vec4 FragColor;
     
+    uniform mat4 viewProjection;
     uniform float near;
     uniform float far;
     uniform vec3 gridColor;
@@ -91,19 +91,6 @@ class GridRenderer:
         return color;
     }
     
-    float computeDepth(vec3 pos) {
-        vec4 clip_space_pos = fragProj * vec4(pos.xyz, 1.0);
-        float ndc_depth = clip_space_pos.z / clip_space_pos.w;
-        return (ndc_depth + 1.0) * 0.5;
-    }
-    
-    float computeLinearDepth(vec3 pos) {
-        vec4 clip_space_pos = fragProj * vec4(pos.xyz, 1.0);
-        float clip_space_depth = clip_space_pos.z / clip_space_pos.w;
-        float linearDepth = (2.0 * near * far) / (far + near - clip_space_depth * (far - near));
-        return linearDepth / far;
-    }
-    
     void main() {
         // Ray-plane intersection
         float t = -nearPoint.y / (farPoint.y - nearPoint.y);
@@ -116,10 +103,12 @@ class GridRenderer:
         vec3 fragPos3D = nearPoint + t * (farPoint - nearPoint);
         
         // Compute depth for proper occlusion
-        gl_FragDepth = computeDepth(fragPos3D);
+        vec4 clipPos = viewProjection * vec4(fragPos3D, 1.0);
+        float ndcDepth = clipPos.z / clipPos.w;
+        gl_FragDepth = ndcDepth * 0.5 + 0.5;
         
         // Compute linear depth for fading
-        float linearDepth = computeLinearDepth(fragPos3D);
+        float linearDepth = (2.0 * near) / (far + near - ndcDepth * (far - near));
         float fading = max(0, (fadeDistance - linearDepth) / fadeDistance);
         
         // Main grid
@@ -139,8 +128,102 @@ class GridRenderer:
     }
     """
     
-    def __init__(self):
+    # Vertex shader for the ground plane fan (reversed-Z)
+    PLANE_VERTEX_SHADER = """
+    #version 330 core
+    
+    uniform mat4 viewProjection;
+    uniform vec3 cameraPosition;
+    
+    out vec4 worldPoint;
+    
+    const vec2 directions[4] = vec2[](
+        vec2( 1,  1),
+        vec2(-1,  1),
+        vec2(-1, -1),
+        vec2( 1, -1)
+    );
+    
+    void main() {
+        // Four triangles, each covering one quadrant of the y = 0 plane:
+        // the point below the camera and two directions at infinity (w = 0)
+        int triangle = gl_VertexID / 3;
+        int corner = gl_VertexID % 3;
+        if (corner == 0) {
+            worldPoint = vec4(cameraPosition.x, 0.0, cameraPosition.z, 1.0);
+        } else {
+            vec2 direction = directions[(triangle + corner - 1) % 4];
+            worldPoint = vec4(direction.x, 0.0, direction.y, 0.0);
+        }
+        gl_Position = viewProjection * worldPoint;
+    }
+    """
+    
+    # Fragment shader for the ground plane fan (reversed-Z)
+    PLANE_FRAGMENT_SHADER = """
+    #version 330 core
+    
+    in vec4 worldPoint;
+    
+    out vec4 FragColor;
+    
+    uniform vec3 cameraPosition;
+    uniform float far;
+    uniform vec3 gridColor;
+    uniform vec3 axisColorX;
+    uniform vec3 axisColorZ;
+    uniform float gridSize;
+    uniform float gridSubdivisions;
+    uniform float fadeDistance;
+    uniform float lineWidth;
+    
+    vec4 grid(vec3 fragPos3D, float scale) {
+        vec2 coord = fragPos3D.xz * scale;
+        vec2 derivative = fwidth(coord);
+        vec2 grid = abs(fract(coord - 0.5) - 0.5) / derivative;
+        float line = min(grid.x, grid.y);
+        float minimumz = min(derivative.y, 1);
+        float minimumx = min(derivative.x, 1);
+        vec4 color = vec4(gridColor, 1.0 - min(line, 1.0));
+        
+        // Highlight axes
+        if(fragPos3D.x > -lineWidth * minimumx && fragPos3D.x < lineWidth * minimumx)
+            color = vec4(axisColorZ, 1.0);
+        if(fragPos3D.z > -lineWidth * minimumz && fragPos3D.z < lineWidth * minimumz)
+            color = vec4(axisColorX, 1.0);
+            
+        return color;
+    }
+    
+    void main() {
+        vec3 fragPos3D = worldPoint.xyz / worldPoint.w;
+        
+        // Fade with distance, as a fraction of the fade reference distance
+        float distance = length(fragPos3D - cameraPosition) / far;
+        float fading = max(0, (fadeDistance - distance) / fadeDistance);
+        if (fading <= 0.0)
+            discard;
+            
+        // Main grid
+        vec4 mainGrid = grid(fragPos3D, 1.0 / gridSize);
+        
+        // Subdivisions (smaller grid)
+        vec4 subGrid = grid(fragPos3D, gridSubdivisions / gridSize);
+        subGrid.a *= 0.5; // Make subdivisions more subtle
+        
+        // Combine grids
+        FragColor = mainGrid;
+        FragColor.a = max(mainGrid.a, subGrid.a) * fading;
+        
+        // Discard nearly transparent fragments
+        if (FragColor.a < 0.01)
+            discard;
+    }
+    """
+    
+    def __init__(self, shaders: Optional[ShaderManager] = None):
         self.logger = logging.getLogger(__name__)
+        self.shaders = shaders if shaders is not None else ShaderManager()
         
         # Grid settings
         self.grid_size = 1.0  # Size of main grid squares
@@ -154,7 +237,9 @@ class GridRenderer:
         # OpenGL objects
         self.vao = None
         self.shader_program = None
-        self.uniform_locations = {}
+        self.uniforms = None
+        self.plane_program = None
+        self.plane_uniforms = None
         
         self._initialized = False
         
@@ -170,6 +255,11 @@ class GridRenderer:
                 self.FRAGMENT_SHADER
             )
             
+            self.plane_program = self._create_shader_program(
+                self.PLANE_VERTEX_SHADER,
+                self.PLANE_FRAGMENT_SHADER
+            )
+            
             # Get uniform locations
             self._get_uniform_locations()
             
@@ -184,41 +274,53 @@ class GridRenderer:
             raise
             
     def render(self, camera, near=0.1, far=1000.0):
-        """Render the infinite grid."""
+        """Render the infinite grid.
+        
+        `far` is also the distance the grid fade is relative to.
+        """
         if not self._initialized:
             self.initialize()
             
+        reversed_z = getattr(camera, 'reversed_z', False)
+        uniforms = self.plane_uniforms if reversed_z else self.uniforms
+        
         # Use shader program
-        glUseProgram(self.shader_program)
-        
-        # Set uniforms
-        view_projection = camera.get_view_projection_matrix()
-        glUniformMatrix4fv(self.uniform_locations['viewProjection'], 1, GL_TRUE, view_projection)
-        
-        glUniform1f(self.uniform_locations['near'], near)
-        glUniform1f(self.uniform_locations['far'], far)
-        glUniform3fv(self.uniform_locations['gridColor'], 1, self.grid_color)
-        glUniform3fv(self.uniform_locations['axisColorX'], 1, self.axis_color_x)
-        glUniform3fv(self.uniform_locations['axisColorZ'], 1, self.axis_color_z)
-        glUniform1f(self.uniform_locations['gridSize'], self.grid_size)
-        glUniform1f(self.uniform_locations['gridSubdivisions'], self.grid_subdivisions)
-        glUniform1f(self.uniform_locations['fadeDistance'], self.fade_distance)
-        glUniform1f(self.uniform_locations['lineWidth'], self.line_width)
+        glcalls.use_program(self.plane_program if reversed_z else self.shader_program)
+        
+        # Set uniforms; unchanged values are not uploaded again
+        uniforms.set_matrix4('viewProjection', camera.get_view_projection_matrix())
+        if reversed_z:
+            uniforms.set_vec3('cameraPosition', camera.position)
+        else:
+            uniforms.set_matrix4('inverseViewProjection',
+                                 camera.get_inverse_view_projection_matrix())
+            uniforms.set_float('near', near)
+        uniforms.set_float('far', far)
+        uniforms.set_vec3('gridColor', self.grid_color)
+        uniforms.set_vec3('axisColorX', self.axis_color_x)
+        uniforms.set_vec3('axisColorZ', self.axis_color_z)
+        uniforms.set_float('gridSize', self.grid_size)
+        uniforms.set_float('gridSubdivisions', self.grid_subdivisions)
+        uniforms.set_float('fadeDistance', self.fade_distance)
+        uniforms.set_float('lineWidth', self.line_width)
         
         # Enable blending for transparency
-        glEnable(GL_BLEND)
+        glcalls.enable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
-        # Render the quad
-        glBindVertexArray(self.vao)
-        glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
-        glBindVertexArray(0)
+        # Render the plane fan or the fullscreen quad
+        glcalls.bind_vertex_array(self.vao)
+        if reversed_z:
+            glcalls.draw_arrays(GL_TRIANGLES, 0, 12)
+        else:
+            glcalls.draw_arrays(GL_TRIANGLE_STRIP, 0, 4)
+        glcalls.bind_vertex_array(0)
         
         # Disable blending
-        glDisable(GL_BLEND)
+        glcalls.disable(GL_BLEND)
         
         # Reset shader
-        glUseProgram(0)
+        glcalls.use_program(0)
         
     def set_grid_size(self, size: float):
         """Set the size of grid squares."""
@@ -237,64 +339,23 @@ class GridRenderer:
         if self.vao:
             glDeleteVertexArrays(1, [self.vao])
         if self.shader_program:
-            glDeleteProgram(self.shader_program)
+            self.shaders.release(self.shader_program)
+        if self.plane_program:
+            self.shaders.release(self.plane_program)
+        self.shader_program = self.plane_program = None
         self._initialized = False
         
     def _create_shader_program(self, vertex_source: str, fragment_source: str) -> int:
         """Create and link a shader program."""
-        # Create vertex shader
-        vertex_shader = glCreateShader(GL_VERTEX_SHADER)
-        glShaderSource(vertex_shader, vertex_source)
-        glCompileShader(vertex_shader)
-        
-        # Check vertex shader compilation
-        if not glGetShaderiv(vertex_shader, GL_COMPILE_STATUS):
-            error = glGetShaderInfoLog(vertex_shader).decode()
-            glDeleteShader(vertex_shader)
-            raise RuntimeError(f"Vertex shader compilation failed: {error}")
-            
-        # Create fragment shader
-        fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)
-        glShaderSource(fragment_shader, fragment_source)
-        glCompileShader(fragment_shader)
-        
-        # Check fragment shader compilation
-        if not glGetShaderiv(fragment_shader, GL_COMPILE_STATUS):
-            error = glGetShaderInfoLog(fragment_shader).decode()
-            glDeleteShader(vertex_shader)
-            glDeleteShader(fragment_shader)
-            raise RuntimeError(f"Fragment shader compilation failed: {error}")
-            
-        # Create and link program
-        program = glCreateProgram()
-        glAttachShader(program, vertex_shader)
-        glAttachShader(program, fragment_shader)
-        glLinkProgram(program)
-        
-        # Check linking
-        if not glGetProgramiv(program, GL_LINK_STATUS):
-            error = glGetProgramInfoLog(program).decode()
-            glDeleteShader(vertex_shader)
-            glDeleteShader(fragment_shader)
-            glDeleteProgram(program)
-            raise RuntimeError(f"Shader program linking failed: {error}")
-            
-        # Clean up shaders (they're linked to the program now)
-        glDeleteShader(vertex_shader)
-        glDeleteShader(fragment_shader)
-        
-        return program
+        return self.shaders.get_program(vertex_source, fragment_source)
         
     def _get_uniform_locations(self):
         """Get and cache uniform locations."""
-        uniforms = [
-            'viewProjection', 'near', 'far', 'gridColor',
-            'axisColorX', 'axisColorZ', 'gridSize', 'gridSubdivisions',
-            'fadeDistance', 'lineWidth'
+        style = [
+            'viewProjection', 'far', 'gridColor', 'axisColorX', 'axisColorZ',
+            'gridSize', 'gridSubdivisions', 'fadeDistance', 'lineWidth'
         ]
-        
-        for uniform in uniforms:
-            location = glGetUniformLocation(self.shader_program, uniform)
-            if location == -1:
-                self.logger.warning(f"Uniform '{uniform}' not found in shader")
-            self.uniform_locations[uniform] = location
\ No newline at end of file
+        self.uniforms = self.shaders.get_uniforms(self.shader_program,
+                                                  style + ['inverseViewProjection', 'near'])
+        self.plane_uniforms = self.shaders.get_uniforms(self.plane_program,
+                                                        style + ['cameraPosition'])
\ No newline at end of file
@@ -3,8 +3,8 @@
 
 import pygame
 import numpy as np
-from typing import Optional
-from src.infinitejournal.world.camera import FPSCamera
+from typing import Optional, Tuple
+from infinitejournal.world.camera import FPSCamera
 
 
 class PlayerController:
@@ -39,18 +39,24 @@ class PlayerController:
         self.mouse_smoothing = 0.3
         self.smoothed_mouse_delta = np.zeros(2)
         
+        # Input comes from a recording; leave the real mouse alone
+        self.replaying = False
+        
     def update(self, delta_time: float):
         """Update player state."""
         # Apply gravity if not grounded
         if not self.is_grounded:
+            # Semi-implicit Euler: velocity first, then position
             self.vertical_velocity += self.gravity * delta_time
-            self.camera.position[1] += self.vertical_velocity * delta_time
+            position = self.camera.position.copy()
+            position[1] += self.vertical_velocity * delta_time
             
             # Check if landed
-            if self.camera.position[1] <= self.ground_height + 1.7:  # Eye height
-                self.camera.position[1] = self.ground_height + 1.7
+            if position[1] <= self.ground_height + 1.7:  # Eye height
+                position[1] = self.ground_height + 1.7
                 self.vertical_velocity = 0.0
                 self.is_grounded = True
+            self.camera.set_position(position)
                 
         # Handle keyboard movement
         self._handle_movement(delta_time)
@@ -147,13 +153,52 @@ class PlayerController:
         self.camera.handle_keyboard(self.keys_pressed, delta_time)
         
         # Adjust camera speed based on player state
+        self.camera.movement_speed = self.get_move_speed()
+        
+    def get_move_speed(self) -> float:
+        """Get the movement speed for the current sprint/crouch state."""
         if self.is_sprinting and not self.is_crouching:
-            self.camera.movement_speed = self.base_move_speed * self.sprint_multiplier
+            return self.base_move_speed * self.sprint_multiplier
         elif self.is_crouching:
-            self.camera.movement_speed = self.base_move_speed * self.crouch_multiplier
-        else:
-            self.camera.movement_speed = self.base_move_speed
+            return self.base_move_speed * self.crouch_multiplier
+        return self.base_move_speed
+        
+    def get_expected_velocity(self) -> np.ndarray:
+        """Get the velocity the camera is heading toward.
+        
+        While movement keys are held the camera accelerates to the full
+        movement speed (sprint included), so that speed is assumed along the
+        current direction of travel, or the view direction when starting
+        from rest. Without input the current velocity is kept.
+        """
+        velocity = np.asarray(self.camera.velocity, dtype=np.float32)
+        speed = float(np.linalg.norm(velocity))
+        keys = self.keys_pressed
+        if not any(keys.get(key) for key in ('w', 's', 'a', 'd')):
+            return velocity.copy()
             
+        if speed > 0.1:
+            direction = velocity / speed
+        elif keys.get('w') and not keys.get('s'):
+            direction = self.camera.front
+        elif keys.get('s') and not keys.get('w'):
+            direction = -self.camera.front
+        else:
+            return velocity.copy()
+        return (direction * self.get_move_speed()).astype(np.float32)
+        
+    def predict_path(self, horizon: float, samples: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict camera positions over the next `horizon` seconds.
+        
+        Returns (times, positions) for `samples` evenly spaced steps,
+        extrapolated along the expected velocity.
+        """
+        samples = max(1, int(samples))
+        times = np.linspace(horizon / samples, horizon, samples, dtype=np.float32)
+        velocity = self.get_expected_velocity()
+        positions = self.camera.position[None, :] + times[:, None] * velocity[None, :]
+        return times, positions
+        
     def _jump(self):
         """Make the player jump."""
         if self.is_grounded:
@@ -163,6 +208,8 @@ class PlayerController:
     def toggle_mouse_capture(self):
         """Toggle mouse capture for looking around."""
         self.mouse_captured = not self.mouse_captured
+        if self.replaying:
+            return
         pygame.mouse.set_visible(not self.mouse_captured)
         pygame.mouse.set_grab(self.mouse_captured)
         
@@ -179,7 +226,7 @@ class PlayerController:
         
     def set_position(self, position: np.ndarray):
         """Set player position."""
-        self.camera.position = position.copy()
+        self.camera.set_position(position)
         
     def get_view_matrix(self) -> np.ndarray:
         """Get view matrix from camera."""
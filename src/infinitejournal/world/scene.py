@@ -1,28 +1,88 @@
 # src/infinitejournal/world/scene.py
 """Scene management for organizing world objects."""
 
+import math
 import numpy as np
 from typing import Optional
 import logging
 from OpenGL.GL import *
 
-from world.camera import Camera, FPSCamera
-from world.grid import GridRenderer
-from world.player import PlayerController
+from infinitejournal.backends.opengl.renderer import StrokeRenderer, build_chunk_vertices
+from infinitejournal.backends.opengl.shaders import ShaderManager
+from infinitejournal.config import Config
+from infinitejournal.drawing.models.preview import StrokePreview
+from infinitejournal.drawing.strokes import StrokeStore
+from infinitejournal.storage.cache import ByteBudgetCache
+from infinitejournal.storage.world import WorldStorage
+from infinitejournal.tools.brush import Brush
+from infinitejournal.tools.eraser import Eraser
+from infinitejournal.utilities.performance import FrameProfiler
+from infinitejournal.world.camera import Camera, FPSCamera
+from infinitejournal.world.chunks import Chunk, ChunkManager
+from infinitejournal.world.culling import StrokeCuller
+from infinitejournal.world.grid import GridRenderer
+from infinitejournal.world.player import PlayerController
+from infinitejournal.world.streaming import ChunkStreamer
 
 
 class Scene:
     """Manages the 3D scene and rendering order."""
     
-    def __init__(self):
+    def __init__(self, config: Optional[Config] = None, storage: Optional[WorldStorage] = None):
         """Initialize the scene."""
         self.logger = logging.getLogger(__name__)
+        self.config = config if config is not None else Config()
         
         # Scene components
         self.player = PlayerController()
-        self.grid_renderer = GridRenderer()
+        self.player.camera.reversed_z = self.config.reversed_z
+        self.shaders = ShaderManager(
+            self.config.save_directory / "shader_cache" if self.config.shader_binary_cache else None
+        )
+        self.grid_renderer = GridRenderer(self.shaders)
+        self.strokes = StrokeStore()
+        self.chunk_manager = ChunkManager(
+            chunk_size=self.config.chunk_size,
+            load_radius=self.config.chunk_load_radius,
+            vertical_radius=self.config.chunk_vertical_radius,
+            loader=self._on_chunk_load,
+            unloader=self._on_chunk_unload
+        )
+        # Startup may have opened the storage already, in the background
+        self.storage = storage if storage is not None else WorldStorage(
+            self.config.save_directory / "world"
+        )
+        self.chunk_cache = ByteBudgetCache(self.config.cache_memory_mb * 1024 * 1024, "chunk")
+        self.culler = StrokeCuller(self.strokes, self.chunk_manager)
+        self.brush = Brush(self.strokes, self.commit_stroke, self.config.brush_color,
+                           self.config.brush_distance, self.config.brush_width,
+                           self.config.brush_subdivisions)
+        self.eraser = Eraser(self.strokes, self.commit_stroke, self.remove_stroke,
+                             self.config.eraser_radius, self.config.brush_distance)
+        self.stroke_renderer = StrokeRenderer(
+            lod_levels=self.config.lod_levels,
+            lod_tolerance=self.config.lod_tolerance,
+            lod_pixel_error=self.config.lod_pixel_error,
+            shaders=self.shaders
+        )
+        self.preview = StrokePreview(self.shaders)
+        self.streamer = ChunkStreamer(self._read_chunk, self.config.stream_workers)
+        self.profiler = FrameProfiler(
+            history=self.config.profiler_history,
+            enabled=self.config.profiler_enabled,
+            gpu=self.config.profile_gpu
+        )
+        self._prefetch_centers = ()
+        self._previous_position = np.zeros(3, dtype=np.float32)
+        self._stepped_position = np.zeros(3, dtype=np.float32)
+        self._has_stepped = False
+        self.prefetched_chunks = 0
+        
+        # Visible stroke ids per chunk, refreshed every render
+        self.visible_strokes = {}
         
         # Scene settings
+        self.viewport_size = (self.config.window_width, self.config.window_height)
         self.near_plane = 0.1
         self.far_plane = 1000.0
         self.clear_color = (0.0, 0.0, 0.0, 1.0)
@@ -39,8 +99,19 @@ class Scene:
             return
             
         try:
+            # Open world storage before any chunk gets loaded
+            self.storage.open()
+            self.strokes.reserve_ids(self.storage.next_stroke_id)
+            self.streamer.start()
+            
             # Initialize grid renderer
             self.grid_renderer.initialize()
+            self._setup_depth_range()
+            
+            # Initialize stroke renderer
+            self.stroke_renderer.initialize()
+            self.preview.initialize()
+            self.profiler.initialize()
             
             # Set initial player position
             self.player.set_position(np.array([0.0, 1.7, 5.0], dtype=np.float32))
@@ -53,49 +124,305 @@ class Scene:
             raise
             
     def update(self, delta_time: float):
-        """Update scene state."""
+        """Advance the simulation by one step."""
         if not self._initialized:
             self.initialize()
             
-        # Update player/camera
-        self.player.update(delta_time)
-        
+        with self.profiler.scope("update"):
+            # Remember where the camera was, for interpolating between steps
+            np.copyto(self._previous_position, self.player.camera.position)
+            self._has_stepped = True
+            
+            # Update player/camera
+            self.player.update(delta_time)
+            
         # Update performance stats
-        self.frame_count += 1
         self.total_time += delta_time
         
-    def render(self):
-        """Render the scene."""
+    def render(self, alpha: float = 1.0):
+        """Render the scene.
+        
+        `alpha` is how far the frame lies between the last two simulation
+        steps; the camera is drawn at the interpolated position.
+        """
         if not self._initialized:
             self.initialize()
+        self.stroke_renderer.begin_frame()
+        
+        with self.profiler.scope("chunks"):
+            # Keep the chunks around the camera resident
+            self.chunk_manager.update(self.player.camera.position)
             
-        # Clear with scene color
-        glClearColor(*self.clear_color)
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            # Start on the chunks the camera is about to reach
+            if self.config.prefetch_horizon_ms > 0:
+                self._prefetch_chunks()
+                
+        # Hand chunks finished by the loader threads to the GPU, within budget
+        with self.profiler.scope("stream"):
+            self.streamer.drain(
+                self._apply_loaded_chunk,
+                self.config.stream_budget_ms / 1000.0,
+                self._on_chunk_load_failed
+            )
+            
+        camera = self.player.camera
+        position = self._stepped_position
+        previous = self._previous_position
+        np.copyto(position, camera.position)
+        interpolate = (alpha < 1.0 and self._has_stepped and
+                       not np.array_equal(previous, position))
+        if interpolate:
+            camera.set_position(previous + (position - previous) * alpha)
+            
+        # Cull chunks and strokes against the view frustum
+        with self.profiler.scope("cull"):
+            self.visible_strokes = self.culler.cull(
+                self.player.camera.get_view_projection_matrix()
+            )
+            
+        # Bring stroke buffers up to date with the store
+        with self.profiler.scope("upload"):
+            self.stroke_renderer.sync(self.strokes, self.chunk_manager)
+            self.preview.update(self.brush.curve if self.brush.drawing else None,
+                                self.brush.color)
+            
+        with self.profiler.scope("draw", gpu=True):
+            # Clear with scene color; reversed depth is farthest at 0
+            reversed_z = self.player.camera.reversed_z
+            glClearColor(*self.clear_color)
+            glClearDepth(0.0 if reversed_z else 1.0)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            
+            # Enable depth testing
+            glEnable(GL_DEPTH_TEST)
+            glDepthFunc(GL_GREATER if reversed_z else GL_LESS)
+            
+            # Render opaque strokes, one batched draw per visible chunk
+            self.stroke_renderer.render(self.player.camera, self.visible_strokes)
+            
+            # Render grid last for proper transparency
+            self.grid_renderer.render(
+                self.player.camera,
+                self.near_plane,
+                self.far_plane
+            )
+            
+            # The stroke being drawn goes on top, from its own buffer
+            self.preview.render(self.player.camera)
+            
+        # TODO: Render UI overlay
         
-        # Enable depth testing
-        glEnable(GL_DEPTH_TEST)
-        glDepthFunc(GL_LESS)
+        if interpolate:
+            camera.set_position(position)
+        self.frame_count += 1
         
-        # TODO: Render opaque objects here (future strokes, etc.)
+    def _setup_depth_range(self):
+        """Map clip depth straight to [0, 1] for reversed-Z where supported.
         
-        # Render grid last for proper transparency
-        self.grid_renderer.render(
-            self.player.camera,
-            self.near_plane,
-            self.far_plane
-        )
+        With OpenGL's default [-1, 1] clip range, the remap to window depth
+        cancels most of the precision reversed-Z gains; the infinite far
+        plane still works without it.
+        """
+        if not self.player.camera.reversed_z:
+            return
+        if bool(glClipControl):
+            glClipControl(GL_LOWER_LEFT, GL_ZERO_TO_ONE)
+        else:
+            self.logger.info("glClipControl unavailable; reversed-Z keeps the [-1, 1] depth range")
+            
+    def add_stroke(self, points: np.ndarray, **kwargs):
+        """Add a finished stroke to the scene and its chunk."""
+        stroke = self.strokes.add_stroke(points, **kwargs)
+        self.commit_stroke(stroke.stroke_id)
+        return stroke
         
-        # TODO: Render UI overlay
+    def commit_stroke(self, stroke_id: int):
+        """Give a finished stroke of the store its chunk and save it."""
+        stroke = self.strokes.get(stroke_id)
+        coord = self.chunk_manager.assign_stroke(stroke_id, *stroke.bounds)
+        self.storage.log_add(stroke_id, coord, stroke.points, stroke.pressures, stroke.colors)
+        
+    def remove_stroke(self, stroke_id: int):
+        """Remove a stroke from the scene."""
+        coord = self.chunk_manager.chunk_of(stroke_id)
+        if coord is not None:
+            self.storage.log_erase(stroke_id, coord)
+        self.chunk_manager.release_stroke(stroke_id)
+        self.strokes.remove_stroke(stroke_id)
+        
+    def _on_chunk_load(self, chunk: Chunk):
+        """Start loading a chunk, reviving it straight from the cache if possible."""
+        coord = chunk.coord
+        version = self.storage.chunk_version(coord)
+        
+        # Cached entries are (version, payload); stale ones are dropped. A
+        # load counts once in the cache statistics, under its strokes.
+        cached = self.chunk_cache.pop(('strokes', coord))
+        if cached is not None and cached[0] != version:
+            cached = None
+        gpu = self.chunk_cache.pop(('gpu', coord), count=False)
+        if gpu is not None and (cached is None or gpu[0] != version):
+            gpu[1].delete()
+            gpu = None
+            
+        if gpu is not None:
+            # Strokes and GPU buffers are still in memory; no worker needed
+            self._add_chunk_strokes(cached[1])
+            self.stroke_renderer.adopt_chunk(coord, gpu[1], self.strokes)
+            self.chunk_manager.mark_loaded(coord)
+            return
+            
+        payload = cached[1] if cached is not None else None
+        self.streamer.request(coord, self._load_priority(coord), (version, payload))
+        
+    def _read_chunk(self, coord, request):
+        """Read a chunk and build its vertices (runs on a loader thread)."""
+        version, data = request
+        if data is None:
+            data = self.storage.load_chunk(coord)
+        ids, positions, lengths, pressures, colors = data
+        vertices = build_chunk_vertices(ids, positions, lengths, colors,
+                                        self.stroke_renderer.lod.tolerances)
+        return version, data, vertices
+        
+    def _apply_loaded_chunk(self, coord, result):
+        """Add a chunk finished by a loader thread to the scene."""
+        version, data, vertices = result
+        chunk = self.chunk_manager.get_chunk(coord)
+        if chunk is None or chunk.is_loaded:
+            return
+        if version != self.storage.chunk_version(coord):
+            # Edited while loading, so the result may be stale; load it again
+            self.streamer.request(coord, self._load_priority(coord),
+                                  (self.storage.chunk_version(coord), None))
+            return
+            
+        self._add_chunk_strokes(data)
+        self.stroke_renderer.adopt_vertices(coord, vertices, self.strokes)
+        self.chunk_manager.mark_loaded(coord)
+        
+    def _on_chunk_load_failed(self, coord, error: Exception):
+        """Drop a chunk that could not be loaded; it is retried when the camera moves."""
+        self.chunk_manager.unload(coord)
+        
+    def _add_chunk_strokes(self, data):
+        """Add a chunk's strokes to the store and to their chunks."""
+        ids, positions, lengths, pressures, colors = data
         
+        # Strokes drawn into the chunk while it was loading are already here
+        present = np.fromiter((i in self.strokes for i in ids.tolist()), dtype=bool,
+                              count=len(ids))
+        if present.any():
+            rows = np.repeat(~present, lengths)
+            ids, lengths = ids[~present], lengths[~present]
+            positions, pressures, colors = positions[rows], pressures[rows], colors[rows]
+            
+        if len(ids):
+            self.strokes.add_strokes(positions, lengths, pressures, colors, ids)
+            for stroke_id in ids.tolist():
+                self.chunk_manager.assign_stroke(stroke_id, *self.strokes.get_bounds(stroke_id))
+                
+    def _load_priority(self, coord, position=None, delay: float = 0.0) -> float:
+        """Estimate the seconds until the camera reaches a chunk.
+        
+        Loads are served in this order. `position` and `delay` give a
+        predicted camera position and the time until it is reached.
+        """
+        if position is None:
+            position = self.player.camera.position
+        lower, upper = self.chunk_manager.chunk_bounds(coord)
+        offset = (lower + upper) * 0.5 - position
+        distance = math.sqrt(float(offset @ offset))
+        speed = max(self.player.get_move_speed(), self.player.base_move_speed)
+        return delay + distance / speed
+        
+    def _prefetch_chunks(self):
+        """Queue the load regions around predicted camera positions.
+        
+        Positions are sampled about every half chunk along the expected
+        velocity up to the prefetch horizon, so sprinting looks further
+        ahead. Chunks get their estimated arrival time as load priority.
+        """
+        horizon = self.config.prefetch_horizon_ms / 1000.0
+        speed = float(np.linalg.norm(self.player.get_expected_velocity()))
+        samples = min(16, int(math.ceil(speed * horizon / (self.chunk_manager.chunk_size * 0.5))))
+        if samples < 1:
+            self._prefetch_centers = ()
+            return
+            
+        times, positions = self.player.predict_path(horizon, samples)
+        current = self.chunk_manager.chunk_coord(self.player.camera.position)
+        centers = []
+        for delay, position in zip(times.tolist(), positions):
+            center = self.chunk_manager.chunk_coord(position)
+            if center != current and (not centers or centers[-1][0] != center):
+                centers.append((center, delay, position))
+                
+        # The path only needs walking again once it crosses other chunks
+        key = tuple(center for center, _, _ in centers)
+        if key == self._prefetch_centers:
+            return
+        self._prefetch_centers = key
+        
+        for center, delay, position in centers:
+            for coord in self.chunk_manager.region(center):
+                chunk = self.chunk_manager.get_chunk(coord)
+                if chunk is not None and chunk.is_loaded:
+                    continue
+                if chunk is None:
+                    self.chunk_manager.load(coord)
+                    self.prefetched_chunks += 1
+                self.streamer.expedite(coord, self._load_priority(coord, position, delay))
+                
+    def _on_chunk_unload(self, chunk: Chunk):
+        """Move the strokes of a chunk that left the resident area into the cache."""
+        coord = chunk.coord
+        version = self.storage.chunk_version(coord)
+        ids = np.array([i for i in chunk.stroke_ids if i in self.strokes], dtype=np.int64)
+        
+        # Only fully loaded chunks are complete enough to cache
+        if chunk.is_loaded:
+            positions, lengths, pressures, colors = self.strokes.gather(ids)
+            nbytes = (ids.nbytes + positions.nbytes + lengths.nbytes + pressures.nbytes +
+                      colors.nbytes)
+            self.chunk_cache.put(('strokes', coord),
+                                 (version, (ids, positions, lengths, pressures, colors)), nbytes)
+        else:
+            self.streamer.cancel(coord)
+            
+        for stroke_id in ids.tolist():
+            self.strokes.remove_stroke(stroke_id)
+        self.strokes.maybe_compact()
+        
+        batch = self.stroke_renderer.retire_chunk(coord)
+        if batch is not None:
+            if chunk.is_loaded:
+                self.chunk_cache.put(('gpu', coord), (version, batch), batch.nbytes, batch.delete)
+            else:
+                batch.delete()
+                
     def handle_event(self, event):
         """Handle pygame events."""
         self.player.handle_event(event)
         
+    def handle_events(self, events: list):
+        """Handle the pygame events of a frame.
+        
+        While the mouse is free, the brush and the eraser take the pointer
+        events as one batch each; everything else goes to the player.
+        """
+        camera = self.player.camera
+        self.brush.enabled = self.eraser.enabled = not self.player.mouse_captured
+        events = self.brush.handle_events(events, camera, self.viewport_size)
+        for event in self.eraser.handle_events(events, camera, self.viewport_size):
+            self.player.handle_event(event)
+        
     def resize(self, width: int, height: int):
         """Handle window resize."""
         # Update viewport
         glViewport(0, 0, width, height)
+        self.viewport_size = (width, height)
+        self.stroke_renderer.set_viewport(width, height)
         
         # Update camera aspect ratio
         aspect_ratio = width / height if height > 0 else 1.0
@@ -123,11 +450,29 @@ class Scene:
             'fps': fps,
             'frame_count': self.frame_count,
             'avg_frame_time': avg_frame_time * 1000,  # Convert to milliseconds
-            'total_time': self.total_time
+            'total_time': self.total_time,
+            'visible_chunks': self.culler.visible_chunk_count,
+            'visible_strokes': self.culler.visible_stroke_count,
+            'stroke_draw_calls': self.stroke_renderer.draw_calls,
+            'stroke_upload_bytes': self.stroke_renderer.bytes_uploaded,
+            'chunk_cache': self.chunk_cache.get_stats(),
+            'pending_chunks': self.streamer.pending_count,
+            'prefetched_chunks': self.prefetched_chunks,
+            'profile': self.profiler.get_stats()
         }
         
     def cleanup(self):
         """Clean up scene resources."""
+        # Keep a stroke still being drawn
+        self.brush.end_stroke()
         if self.grid_renderer:
             self.grid_renderer.cleanup()
+        self.streamer.stop()
+        self.chunk_manager.unload_all()
+        self.chunk_cache.clear()
+        self.stroke_renderer.cleanup()
+        self.preview.cleanup()
+        self.shaders.cleanup()
+        self.profiler.cleanup()
+        self.storage.close()
         self._initialized = False
\ No newline at end of file
@@ -0,0 +1,166 @@
+# src/infinitejournal/world/streaming.py
+"""Background chunk loading on a pool of worker threads."""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from infinitejournal.world.chunks import ChunkCoord
+
+
+class ChunkStreamer:
+    """Loads chunks on worker threads and hands the results to the GL thread.
+    
+    Requests are served lowest priority value first. Each request gets a
+    ticket; asking for a chunk again, moving it up with `expedite` or
+    cancelling it invalidates older tickets, so workers skip superseded
+    requests and stale results are dropped. Requests a worker has already
+    taken are left alone by `expedite`, so their work is not thrown away.
+    Finished results wait in a
+    queue until the GL thread drains it with `drain`, which stops once its
+    per-frame time budget is spent.
+    """
+    
+    def __init__(self, load: Callable[[ChunkCoord, Any], Any], workers: int = 2):
+        """Initialize the streamer; `load(coord, payload)` runs on the workers."""
+        self.logger = logging.getLogger(__name__)
+        self.load = load
+        self.worker_count = max(1, workers)
+        
+        self._requests: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending: Dict[ChunkCoord, Tuple[int, float, Any]] = {}  # coord -> (ticket, priority, payload)
+        self._started: Set[ChunkCoord] = set()  # Pending requests taken by a worker
+        self._ticket_counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        
+        # Statistics
+        self.loaded_count = 0
+        self.failed_count = 0
+        self.applied_last_frame = 0
+        
+    def start(self):
+        """Start the worker threads."""
+        if self._threads:
+            return
+        for index in range(self.worker_count):
+            thread = threading.Thread(target=self._worker, name=f"chunk-loader-{index}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            
+    def stop(self):
+        """Stop the workers and forget every pending request."""
+        with self._lock:
+            self._pending.clear()
+            self._started.clear()
+        for _ in self._threads:
+            self._requests.put((float('inf'), next(self._ticket_counter), None, None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        
+    def request(self, coord: ChunkCoord, priority: float = 0.0, payload: Any = None):
+        """Queue a chunk load, superseding any pending request for it."""
+        ticket = next(self._ticket_counter)
+        with self._lock:
+            self._pending[coord] = (ticket, priority, payload)
+            self._started.discard(coord)
+        self._requests.put((priority, ticket, coord, payload))
+        
+    def expedite(self, coord: ChunkCoord, priority: float) -> bool:
+        """Move a pending request up to `priority` if that is sooner.
+        
+        Requests a worker has already taken are loading or done, so they
+        are left as they are. Returns True if the request was re-queued.
+        """
+        with self._lock:
+            pending = self._pending.get(coord)
+            if pending is None or pending[1] <= priority or coord in self._started:
+                return False
+            ticket = next(self._ticket_counter)
+            self._pending[coord] = (ticket, priority, pending[2])
+        self._requests.put((priority, ticket, coord, pending[2]))
+        return True
+        
+    def cancel(self, coord: ChunkCoord):
+        """Forget a pending request; its result will be dropped."""
+        with self._lock:
+            self._pending.pop(coord, None)
+            self._started.discard(coord)
+            
+    def is_pending(self, coord: ChunkCoord) -> bool:
+        """Check if a chunk has been requested and not applied yet."""
+        with self._lock:
+            return coord in self._pending
+            
+    @property
+    def pending_count(self) -> int:
+        """Get the number of requested chunks not applied yet."""
+        with self._lock:
+            return len(self._pending)
+            
+    def drain(self, apply: Callable[[ChunkCoord, Any], None],
+              budget: float = 0.004,
+              on_error: Optional[Callable[[ChunkCoord, Exception], None]] = None) -> int:
+        """Apply finished loads on the calling thread until `budget` seconds pass.
+        
+        At least one result is applied per call so streaming always makes
+        progress. Returns the number of results applied.
+        """
+        start = time.perf_counter()
+        applied = 0
+        while True:
+            try:
+                coord, ticket, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+                
+            with self._lock:
+                if not self._is_current(coord, ticket):
+                    continue
+                del self._pending[coord]
+                self._started.discard(coord)
+                
+            if error is not None:
+                self.failed_count += 1
+                self.logger.error(f"Failed to load chunk {coord}: {error}")
+                if on_error is not None:
+                    on_error(coord, error)
+            else:
+                apply(coord, result)
+                applied += 1
+                
+            if time.perf_counter() - start >= budget:
+                break
+                
+        self.applied_last_frame = applied
+        return applied
+        
+    def _worker(self):
+        """Worker thread body."""
+        while True:
+            _, ticket, coord, payload = self._requests.get()
+            if coord is None:
+                return
+                
+            with self._lock:
+                if not self._is_current(coord, ticket):
+                    continue
+                self._started.add(coord)
+                
+            try:
+                result = self.load(coord, payload)
+                self._results.put((coord, ticket, result, None))
+                self.loaded_count += 1
+            except Exception as e:
+                self._results.put((coord, ticket, None, e))
+                
+    def _is_current(self, coord: ChunkCoord, ticket: int) -> bool:
+        """Check if a ticket is the latest request for a chunk (lock held)."""
+        pending = self._pending.get(coord)
+        return pending is not None and pending[0] == ticket
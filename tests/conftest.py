@@ -0,0 +1,9 @@
+# tests/conftest.py
+"""Shared pytest setup: make the package importable from a source checkout."""
+
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
@@ -0,0 +1,103 @@
+# tests/test_cache.py
+"""The byte-budget LRU cache."""
+
+from infinitejournal.storage.cache import ByteBudgetCache
+
+
+OVERHEAD = ByteBudgetCache.ENTRY_OVERHEAD
+
+
+def test_evicts_least_recently_used_within_budget():
+    evicted = []
+    cache = ByteBudgetCache(3 * (100 + OVERHEAD))
+    for key in "abc":
+        cache.put(key, key.upper(), 100, on_evict=lambda key=key: evicted.append(key))
+    assert cache.nbytes == 3 * (100 + OVERHEAD)
+
+    assert cache.get("a") == "A"  # b is now the oldest
+    cache.put("d", "D", 100, on_evict=lambda: evicted.append("d"))
+
+    assert evicted == ["b"]
+    assert "b" not in cache and "a" in cache and "d" in cache
+    assert cache.nbytes <= cache.budget
+    assert cache.evictions == 1
+    assert cache.evicted_bytes == 100 + OVERHEAD
+
+
+def test_oversized_entry_is_evicted_at_once():
+    evicted = []
+    cache = ByteBudgetCache(1000)
+    cache.put("big", object(), 5000, on_evict=lambda: evicted.append("big"))
+    assert evicted == ["big"]
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_pop_hands_over_without_callback():
+    evicted = []
+    cache = ByteBudgetCache(10000)
+    cache.put("a", 1, 10, on_evict=lambda: evicted.append("a"))
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", default="gone") == "gone"
+    assert evicted == []
+    assert cache.nbytes == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_uncounted_pop_leaves_hit_rate_alone():
+    cache = ByteBudgetCache(10000)
+    cache.put("data", 1, 10)
+    cache.put("gpu", 2, 10)
+
+    assert cache.pop("data") == 1
+    assert cache.pop("gpu", count=False) == 2
+    assert cache.pop("gpu", count=False) is None
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.hit_rate == 1.0
+
+
+def test_replace_discard_and_clear_run_callbacks():
+    evicted = []
+    cache = ByteBudgetCache(10000)
+    cache.put("a", 1, 10, on_evict=lambda: evicted.append("a1"))
+    cache.put("a", 2, 20, on_evict=lambda: evicted.append("a2"))
+    assert evicted == ["a1"]
+    assert cache.nbytes == 20 + OVERHEAD
+
+    cache.put("b", 3, 10, on_evict=lambda: evicted.append("b"))
+    cache.discard("b")
+    cache.discard("missing")
+    cache.clear()
+    assert evicted == ["a1", "b", "a2"]
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_shrinking_budget_evicts():
+    cache = ByteBudgetCache(10 * (10 + OVERHEAD))
+    for i in range(10):
+        cache.put(i, i, 10)
+    cache.set_budget(4 * (10 + OVERHEAD))
+    assert sorted(k for k in range(10) if k in cache) == [6, 7, 8, 9]
+
+
+def test_failing_callback_does_not_break_eviction():
+    def fail():
+        raise RuntimeError("boom")
+
+    cache = ByteBudgetCache(OVERHEAD + 10)
+    cache.put("a", 1, 10, on_evict=fail)
+    cache.put("b", 2, 10)
+    assert "a" not in cache and "b" in cache
+
+
+def test_stats():
+    cache = ByteBudgetCache(10000, name="chunks")
+    cache.put("a", 1, 10)
+    cache.get("a")
+    cache.get("b")
+    stats = cache.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+    cache.reset_stats()
+    assert cache.hit_rate == 0.0
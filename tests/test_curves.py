@@ -0,0 +1,111 @@
+# tests/test_curves.py
+"""Streaming Catmull-Rom smoothing and ribbon tessellation."""
+
+import numpy as np
+import pytest
+
+from infinitejournal.drawing.models.curves import StrokeCurve, catmull_rom_basis, ribbon
+
+
+NORMAL = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+
+
+def walk(count, seed=1):
+    """A random walk in the z = 0 plane, with pressures."""
+    rng = np.random.default_rng(seed)
+    points = np.cumsum(rng.normal(0.0, 0.01, (count, 3)), axis=0).astype(np.float32)
+    points[:, 2] = 0.0
+    return points, rng.uniform(0.2, 1.0, count).astype(np.float32)
+
+
+def test_basis_weights():
+    weights, derivatives = catmull_rom_basis(5)
+    assert weights.shape == derivatives.shape == (5, 4)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0, rtol=1e-6)
+    np.testing.assert_allclose(derivatives.sum(axis=1), 0.0, atol=1e-6)
+    np.testing.assert_array_equal(weights[0], [0.0, 1.0, 0.0, 0.0])
+
+
+def test_ribbon_offsets_across_tangent():
+    centers = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 0.0, 0.0]], dtype=np.float32)
+    tangents = np.array([[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 0.0]], dtype=np.float32)
+    vertices = ribbon(centers, tangents, np.array([0.2, 0.4, 0.4]), NORMAL)
+
+    np.testing.assert_allclose(vertices[0:2], [[0.0, 0.1, 0.0], [0.0, -0.1, 0.0]], atol=1e-7)
+    np.testing.assert_allclose(vertices[2:4], [[0.8, 0.0, 0.0], [1.2, 0.0, 0.0]], atol=1e-7)
+    # No direction, no width
+    np.testing.assert_array_equal(vertices[4:6], centers[[2, 2]])
+
+
+@pytest.mark.parametrize("subdivisions", [1, 4, 7])
+def test_streaming_matches_one_shot(subdivisions):
+    points, pressures = walk(600)
+    batch = StrokeCurve(NORMAL, 0.01, subdivisions, capacity=4)
+    batch.append(points, pressures)
+    centers, sample_pressures, strip = batch.finish()
+
+    rng = np.random.default_rng(2)
+    streamed = StrokeCurve(NORMAL, 0.01, subdivisions, capacity=4)
+    end = 0
+    while end < len(points):
+        start, end = end, min(len(points), end + int(rng.integers(1, 7)))
+        streamed.append(points[start:end], pressures[start:end])
+        # Stable geometry never changes once emitted
+        stable = streamed.stable_count
+        np.testing.assert_array_equal(streamed.stable_centers, centers[:stable])
+        np.testing.assert_array_equal(streamed.stable_strip, strip[:2 * stable])
+        # Stable samples plus the tail always end at the newest point
+        np.testing.assert_array_equal(streamed.tail_centers[-1], points[end - 1])
+        assert len(streamed.tail_strip) == 2 * len(streamed.tail_centers)
+    streamed_centers, streamed_pressures, streamed_strip = streamed.finish()
+
+    np.testing.assert_array_equal(streamed_centers, centers)
+    np.testing.assert_array_equal(streamed_pressures, sample_pressures)
+    np.testing.assert_array_equal(streamed_strip, strip)
+
+
+def test_curve_passes_through_inputs():
+    points, pressures = walk(50)
+    curve = StrokeCurve(NORMAL, subdivisions=4)
+    curve.append(points, pressures)
+    centers, sample_pressures, strip = curve.finish()
+
+    assert len(centers) == 4 * (len(points) - 1) + 1
+    assert len(strip) == 2 * len(centers)
+    np.testing.assert_allclose(centers[::4], points, atol=1e-6)
+    np.testing.assert_allclose(sample_pressures[::4], pressures, atol=1e-6)
+
+
+def test_strip_width_follows_pressure():
+    points, pressures = walk(80)
+    curve = StrokeCurve(NORMAL, width=0.05)
+    curve.append(points, pressures)
+    centers, sample_pressures, strip = curve.finish()
+
+    left, right = strip[0::2], strip[1::2]
+    np.testing.assert_allclose(np.linalg.norm(right - left, axis=1), 0.05 * sample_pressures,
+                               rtol=1e-4)
+    np.testing.assert_allclose((left + right) / 2, centers, atol=1e-6)
+    # The ribbon stays in the drawing plane
+    np.testing.assert_array_equal(strip[:, 2], 0.0)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3])
+def test_short_strokes(count):
+    points, _ = walk(count)
+    curve = StrokeCurve(NORMAL)
+    curve.append(points)
+    centers, pressures, strip = curve.finish()
+    assert len(centers) == 4 * (count - 1) + 1
+    assert len(strip) == 2 * len(centers)
+    np.testing.assert_allclose(centers[-1], points[-1])
+    np.testing.assert_array_equal(pressures, 1.0)
+
+
+def test_finished_curve_rejects_points():
+    curve = StrokeCurve(NORMAL)
+    curve.append(np.zeros((2, 3)))
+    curve.finish()
+    assert len(curve.tail_strip) == 0
+    with pytest.raises(ValueError):
+        curve.append(np.zeros((1, 3)))
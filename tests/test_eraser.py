@@ -0,0 +1,115 @@
+# tests/test_eraser.py
+"""Splitting strokes with the eraser."""
+
+import numpy as np
+
+from infinitejournal.drawing.strokes import StrokeStore
+from infinitejournal.tools.eraser import Eraser, surviving_runs
+
+
+def line(count, y=0.0):
+    """A straight stroke along x with points 0.1 apart."""
+    points = np.zeros((count, 3), dtype=np.float32)
+    points[:, 0] = np.arange(count) * 0.1
+    points[:, 1] = y
+    return points
+
+
+def test_surviving_runs_split_at_drops_and_stroke_boundaries():
+    # Two strokes of 5 and 4 points stored back to back
+    keep = np.array([1, 1, 0, 1, 1,  1, 1, 1, 1], dtype=bool)
+    indices, lengths = surviving_runs(keep, np.array([5, 4]))
+    np.testing.assert_array_equal(indices, [0, 1, 3, 4, 5, 6, 7, 8])
+    np.testing.assert_array_equal(lengths, [2, 2, 4])
+
+
+def test_surviving_runs_drop_short_runs():
+    keep = np.array([1, 0, 1, 1, 1, 0, 1], dtype=bool)
+    indices, lengths = surviving_runs(keep, np.array([7]))
+    np.testing.assert_array_equal(indices, [2, 3, 4])
+    np.testing.assert_array_equal(lengths, [3])
+
+    indices, lengths = surviving_runs(keep, np.array([7]), min_length=1)
+    np.testing.assert_array_equal(indices, [0, 2, 3, 4, 6])
+    np.testing.assert_array_equal(lengths, [1, 3, 1])
+
+
+def test_surviving_runs_empty():
+    indices, lengths = surviving_runs(np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64))
+    assert len(indices) == 0 and len(lengths) == 0
+
+
+def test_erase_point_splits_stroke():
+    store = StrokeStore()
+    stroke_id = store.add_stroke(line(11), pressures=np.linspace(0, 1, 11)).stroke_id
+    committed, removed = [], []
+
+    def remove(i):
+        removed.append(i)
+        store.remove_stroke(i)
+
+    eraser = Eraser(store, on_commit=committed.append, on_remove=remove, radius=0.02)
+    assert eraser.erase_path([[0.5, 0.0, 0.0]]) == 1
+
+    assert removed == [stroke_id]
+    assert stroke_id not in store
+    assert sorted(store.stroke_ids().tolist()) == sorted(committed)
+    pieces = sorted((store.get_points(i)[0, 0], i) for i in committed)
+    first, second = (store.get_points(i) for _, i in pieces)
+    np.testing.assert_allclose(first, line(11)[:5])
+    np.testing.assert_allclose(second, line(11)[6:])
+    np.testing.assert_allclose(store.get_pressures(pieces[1][1]), np.linspace(0, 1, 11)[6:],
+                               rtol=1e-6)
+
+
+def test_erase_path_crosses_strokes_and_leaves_others():
+    store = StrokeStore()
+    crossed = [store.add_stroke(line(11, y)).stroke_id for y in (0.0, 0.3)]
+    untouched = store.add_stroke(line(11, 2.0)).stroke_id
+
+    eraser = Eraser(store, radius=0.02)
+    # A vertical sweep through x = 0.3 hits both lower strokes
+    assert eraser.erase_path([[0.3, -0.1, 0.0], [0.3, 0.4, 0.0]]) == 2
+
+    assert untouched in store
+    for stroke_id in crossed:
+        assert stroke_id not in store
+    lengths = sorted(store.get_length(i) for i in store.stroke_ids().tolist() if i != untouched)
+    assert lengths == [3, 3, 7, 7]
+
+
+def test_erase_drops_short_leftovers_and_misses():
+    store = StrokeStore()
+    stroke_id = store.add_stroke(line(3)).stroke_id
+    eraser = Eraser(store, radius=0.02)
+
+    assert eraser.erase_path([[5.0, 5.0, 5.0]]) == 0
+    assert stroke_id in store
+
+    # Erasing the middle point leaves two single points, which are dropped
+    assert eraser.erase_path([[0.1, 0.0, 0.0]]) == 1
+    assert len(store) == 0
+
+
+def test_erase_skips_open_strokes():
+    store = StrokeStore()
+    stroke = store.begin_stroke()
+    store.append_points(stroke.stroke_id, line(5))
+    eraser = Eraser(store, radius=0.02)
+
+    assert eraser.erase_path([[0.2, 0.0, 0.0]]) == 0
+    assert store.get_length(stroke.stroke_id) == 5
+
+
+def test_index_follows_store_changes():
+    store = StrokeStore()
+    eraser = Eraser(store, radius=0.02)
+    first = store.add_stroke(line(5)).stroke_id
+    assert eraser.erase_path([[0.0, 0.0, 0.0]]) == 1
+
+    # Strokes added and removed after the first sync are seen
+    store.remove_strokes(store.stroke_ids())
+    second = store.add_stroke(line(5, 1.0)).stroke_id
+    assert eraser.erase_path([[0.0, 0.0, 0.0]]) == 0
+    assert eraser.erase_path([[0.0, 1.0, 0.0]]) == 1
+    assert first not in store and second not in store
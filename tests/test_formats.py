@@ -0,0 +1,70 @@
+# tests/test_formats.py
+"""Round trips of the binary chunk format."""
+
+import numpy as np
+import pytest
+
+from infinitejournal.storage.formats import decode_chunk, encode_chunk
+
+
+def make_strokes(seed=0):
+    """Three strokes of different lengths as concatenated arrays."""
+    rng = np.random.default_rng(seed)
+    ids = np.array([7, 3, 12], dtype=np.int64)
+    lengths = np.array([5, 1, 9], dtype=np.int64)
+    count = int(lengths.sum())
+    positions = rng.uniform(-4.0, 4.0, (count, 3)).astype(np.float32)
+    pressures = rng.uniform(0.0, 1.0, count).astype(np.float32)
+    colors = rng.uniform(0.0, 1.0, (count, 4)).astype(np.float32)
+    return ids, positions, lengths, pressures, colors
+
+
+def test_round_trip_is_exact():
+    ids, positions, lengths, pressures, colors = make_strokes()
+    data = decode_chunk(encode_chunk((1, -2, 3), ids, positions, lengths, pressures, colors))
+
+    assert data.coord == (1, -2, 3)
+    assert len(data) == 3
+    assert not data.header.quantized
+    np.testing.assert_array_equal(data.stroke_ids, ids)
+    np.testing.assert_array_equal(data.lengths, lengths)
+    np.testing.assert_array_equal(data.offsets, np.cumsum(lengths) - lengths)
+    np.testing.assert_array_equal(data.positions, positions)
+    np.testing.assert_array_equal(data.pressures, pressures)
+    np.testing.assert_array_equal(data.colors, colors)
+    np.testing.assert_array_equal(data.get_points(2), positions[6:])
+
+
+def test_quantized_round_trip_is_close():
+    ids, positions, lengths, pressures, colors = make_strokes(1)
+    exact = encode_chunk((0, 0, 0), ids, positions, lengths, pressures, colors)
+    packed = encode_chunk((0, 0, 0), ids, positions, lengths, pressures, colors, quantize=True)
+    data = decode_chunk(packed)
+
+    assert data.header.quantized
+    assert len(packed) < len(exact)
+    np.testing.assert_array_equal(data.stroke_ids, ids)
+    np.testing.assert_array_equal(data.lengths, lengths)
+    # 16-bit positions over the chunk bounds, 8-bit pressures and colors
+    extent = positions.max(axis=0) - positions.min(axis=0)
+    assert np.all(np.abs(data.positions - positions) <= extent / 65535.0 + 1e-6)
+    assert np.abs(data.pressures - pressures).max() <= 1.0 / 255.0
+    assert np.abs(data.colors - colors).max() <= 1.0 / 255.0
+
+
+def test_empty_chunk():
+    data = decode_chunk(encode_chunk((0, 0, 0), [], np.zeros((0, 3)), [], [], np.zeros((0, 4))))
+    assert len(data) == 0
+    assert data.positions.shape == (0, 3)
+
+
+def test_truncated_buffer_is_rejected():
+    encoded = encode_chunk((0, 0, 0), *make_strokes())
+    with pytest.raises(ValueError):
+        decode_chunk(encoded[:len(encoded) - 8])
+
+
+def test_mismatched_lengths_are_rejected():
+    ids, positions, lengths, pressures, colors = make_strokes()
+    with pytest.raises(ValueError):
+        encode_chunk((0, 0, 0), ids, positions, lengths + 1, pressures, colors)
@@ -0,0 +1,117 @@
+# tests/test_spatial.py
+"""Spatial hash grid queries against brute-force answers."""
+
+import numpy as np
+import pytest
+
+from infinitejournal.drawing.models.spatial import SpatialHashGrid
+from infinitejournal.utilities.spatial import (
+    aabb_overlaps,
+    point_aabb_distance,
+    ray_aabb_intersect,
+)
+
+
+def random_boxes(count, seed=0, extent=40.0):
+    """Boxes of mostly small strokes plus a few huge ones."""
+    rng = np.random.default_rng(seed)
+    mins = rng.uniform(-extent, extent, (count, 3)).astype(np.float32)
+    sizes = rng.exponential(1.0, (count, 3)).astype(np.float32)
+    sizes[::50] *= 40.0
+    return np.arange(count, dtype=np.int64) * 3 + 1, mins, mins + sizes
+
+
+@pytest.fixture
+def grid():
+    ids, mins, maxs = random_boxes(2000)
+    index = SpatialHashGrid(cell_size=2.0, max_cells_per_entry=16)
+    index.bulk_insert(ids, mins, maxs)
+    return index, ids, mins, maxs
+
+
+def test_box_queries_match_brute_force(grid):
+    index, ids, mins, maxs = grid
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        lower = rng.uniform(-45.0, 45.0, 3).astype(np.float32)
+        upper = lower + rng.uniform(0.0, 8.0, 3).astype(np.float32)
+        expected = ids[aabb_overlaps(mins, maxs, lower, upper)]
+        assert sorted(index.query_aabb(lower, upper).tolist()) == sorted(expected.tolist())
+
+
+def test_sphere_queries_match_brute_force(grid):
+    index, ids, mins, maxs = grid
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        center = rng.uniform(-45.0, 45.0, 3).astype(np.float32)
+        expected = ids[point_aabb_distance(center, mins, maxs) <= 3.0]
+        assert sorted(index.query_sphere(center, 3.0).tolist()) == sorted(expected.tolist())
+
+
+def test_nearest_matches_brute_force(grid):
+    index, ids, mins, maxs = grid
+    rng = np.random.default_rng(3)
+    for _ in range(30):
+        point = rng.uniform(-60.0, 60.0, 3).astype(np.float32)
+        found, distances = index.nearest(point, k=8)
+        expected = np.sort(point_aabb_distance(point, mins, maxs))[:8]
+        np.testing.assert_allclose(distances, expected, rtol=1e-5)
+        assert np.all(np.diff(distances) >= 0)
+        assert len(set(found.tolist())) == 8
+
+
+def test_raycasts_match_brute_force(grid):
+    index, ids, mins, maxs = grid
+    rng = np.random.default_rng(4)
+    for _ in range(50):
+        origin = rng.uniform(-60.0, 60.0, 3)
+        direction = rng.normal(size=3)
+        hit, entry = ray_aabb_intersect(origin, direction, mins.astype(np.float64),
+                                        maxs.astype(np.float64))
+        result = index.raycast(origin, direction)
+        if not hit.any():
+            assert result is None
+            continue
+        assert result is not None
+        assert result[1] == pytest.approx(entry[hit].min(), rel=1e-6, abs=1e-6)
+
+
+def test_raycast_finds_first_box():
+    index = SpatialHashGrid(cell_size=1.0)
+    index.insert(1, np.array([5.0, -1.0, -1.0]), np.array([6.0, 1.0, 1.0]))
+    index.insert(2, np.array([10.0, -1.0, -1.0]), np.array([11.0, 1.0, 1.0]))
+    index.insert(3, np.array([2.0, 5.0, -1.0]), np.array([3.0, 6.0, 1.0]))
+
+    stroke_id, distance = index.raycast(np.zeros(3), np.array([1.0, 0.0, 0.0]))
+    assert stroke_id == 1
+    assert distance == pytest.approx(5.0)
+    assert index.raycast(np.zeros(3), np.array([1.0, 0.0, 0.0]), max_distance=4.0) is None
+    assert index.raycast(np.zeros(3), np.array([-1.0, 0.0, 0.0])) is None
+
+    index.remove(1)
+    assert index.raycast(np.zeros(3), np.array([1.0, 0.0, 0.0]))[0] == 2
+
+
+def test_insert_move_remove():
+    index = SpatialHashGrid(cell_size=1.0, max_cells_per_entry=8)
+    index.insert(7, np.zeros(3), np.ones(3))
+    index.insert(8, np.full(3, -50.0), np.full(3, 50.0))  # Oversized
+    assert len(index) == 2
+    assert sorted(index.query_aabb(np.full(3, 0.5), np.full(3, 0.6)).tolist()) == [7, 8]
+
+    index.move(7, np.full(3, 20.0), np.full(3, 21.0))
+    assert index.query_aabb(np.full(3, 0.5), np.full(3, 0.6)).tolist() == [8]
+    np.testing.assert_array_equal(index.get_bounds(7)[0], 20.0)
+
+    index.remove(8)
+    assert 8 not in index
+    assert index.query_aabb(np.full(3, 0.5), np.full(3, 0.6)).tolist() == []
+    assert index.query_aabb(np.full(3, 20.5), np.full(3, 20.6)).tolist() == [7]
+
+    index.clear()
+    assert len(index) == 0
+
+
+def test_invalid_cell_size():
+    with pytest.raises(ValueError):
+        SpatialHashGrid(cell_size=0.0)
@@ -0,0 +1,169 @@
+# tests/test_streaming.py
+"""Background chunk loading with ChunkStreamer."""
+
+import threading
+import time
+
+import pytest
+
+from infinitejournal.world.streaming import ChunkStreamer
+
+
+class Loader:
+    """Records loads; the first one can be held until released."""
+
+    def __init__(self, hold_first=False):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not hold_first:
+            self.release.set()
+
+    def __call__(self, coord, payload):
+        self.calls.append(coord)
+        self.started.set()
+        assert self.release.wait(5.0)
+        if payload == "fail":
+            raise RuntimeError("bad chunk")
+        return (coord, payload)
+
+
+@pytest.fixture
+def streamers():
+    created = []
+
+    def make(load, workers=1):
+        streamer = ChunkStreamer(load, workers)
+        created.append(streamer)
+        return streamer
+
+    yield make
+    for streamer in created:
+        streamer.stop()
+
+
+def drain_all(streamer, timeout=5.0, **kwargs):
+    """Drain until nothing is pending; returns {coord: result} applied."""
+    applied = {}
+    deadline = time.monotonic() + timeout
+    while streamer.pending_count and time.monotonic() < deadline:
+        streamer.drain(lambda coord, result: applied.__setitem__(coord, result), **kwargs)
+        time.sleep(0.001)
+    assert streamer.pending_count == 0
+    return applied
+
+
+def hold_worker(streamer, loader):
+    """Occupy the single worker so later requests queue up."""
+    streamer.request((99, 0, 0), priority=-1.0)
+    streamer.start()
+    assert loader.started.wait(5.0)
+
+
+def test_loads_lowest_priority_first(streamers):
+    loader = Loader(hold_first=True)
+    streamer = streamers(loader)
+    hold_worker(streamer, loader)
+    for x, priority in ((1, 3.0), (2, 1.0), (3, 2.0)):
+        streamer.request((x, 0, 0), priority)
+    loader.release.set()
+
+    applied = drain_all(streamer)
+    assert loader.calls == [(99, 0, 0), (2, 0, 0), (3, 0, 0), (1, 0, 0)]
+    assert sorted(applied) == [(1, 0, 0), (2, 0, 0), (3, 0, 0), (99, 0, 0)]
+    assert streamer.loaded_count == 4
+
+
+def test_newer_request_supersedes_older(streamers):
+    loader = Loader(hold_first=True)
+    streamer = streamers(loader)
+    hold_worker(streamer, loader)
+    streamer.request((1, 0, 0), 1.0, "old")
+    streamer.request((1, 0, 0), 2.0, "new")
+    loader.release.set()
+
+    applied = drain_all(streamer)
+    assert applied[(1, 0, 0)] == ((1, 0, 0), "new")
+    assert loader.calls.count((1, 0, 0)) == 1
+
+
+def test_cancelled_request_is_skipped(streamers):
+    loader = Loader(hold_first=True)
+    streamer = streamers(loader)
+    hold_worker(streamer, loader)
+    streamer.request((1, 0, 0), 1.0)
+    streamer.cancel((1, 0, 0))
+    assert not streamer.is_pending((1, 0, 0))
+    loader.release.set()
+
+    applied = drain_all(streamer)
+    assert (1, 0, 0) not in applied
+    assert (1, 0, 0) not in loader.calls
+
+
+def test_cancelled_result_is_dropped(streamers):
+    loader = Loader(hold_first=True)
+    streamer = streamers(loader)
+    hold_worker(streamer, loader)
+    streamer.cancel((99, 0, 0))
+    loader.release.set()
+
+    streamer.request((1, 0, 0), 1.0)
+    applied = drain_all(streamer)
+    assert list(applied) == [(1, 0, 0)]
+
+
+def test_expedite_moves_queued_request_up(streamers):
+    loader = Loader(hold_first=True)
+    streamer = streamers(loader)
+    hold_worker(streamer, loader)
+    streamer.request((1, 0, 0), 1.0)
+    streamer.request((2, 0, 0), 5.0)
+    assert streamer.expedite((2, 0, 0), 0.5)
+    assert not streamer.expedite((2, 0, 0), 3.0)  # Not sooner
+    assert not streamer.expedite((3, 0, 0), 0.0)  # Never requested
+    loader.release.set()
+
+    drain_all(streamer)
+    assert loader.calls == [(99, 0, 0), (2, 0, 0), (1, 0, 0)]
+
+
+def test_expedite_keeps_in_flight_load(streamers):
+    loader = Loader(hold_first=True)
+    streamer = streamers(loader)
+    hold_worker(streamer, loader)
+
+    # The held load is already running, so it is not re-queued
+    assert not streamer.expedite((99, 0, 0), -5.0)
+    loader.release.set()
+
+    applied = drain_all(streamer)
+    assert list(applied) == [(99, 0, 0)]
+    assert loader.calls == [(99, 0, 0)]
+
+
+def test_failed_load_reports_error(streamers):
+    errors = []
+    streamer = streamers(Loader())
+    streamer.start()
+    streamer.request((1, 0, 0), 0.0, "fail")
+    streamer.request((2, 0, 0), 1.0)
+
+    applied = drain_all(streamer, on_error=lambda coord, e: errors.append(coord))
+    assert errors == [(1, 0, 0)]
+    assert list(applied) == [(2, 0, 0)]
+    assert streamer.failed_count == 1
+
+
+def test_drain_applies_at_least_one_result(streamers):
+    streamer = streamers(Loader(), workers=2)
+    streamer.start()
+    for x in range(4):
+        streamer.request((x, 0, 0), float(x))
+
+    deadline = time.monotonic() + 5.0
+    while streamer.pending_count and time.monotonic() < deadline:
+        applied = streamer.drain(lambda coord, result: time.sleep(0.002), budget=0.0)
+        assert applied <= 1
+        time.sleep(0.001)
+    assert streamer.pending_count == 0
@@ -0,0 +1,125 @@
+# tests/test_strokes.py
+"""The columnar stroke store."""
+
+import numpy as np
+import pytest
+
+from infinitejournal.drawing.strokes import StrokeStore
+
+
+RED = (1.0, 0.0, 0.0, 1.0)
+BLUE = (0.0, 0.0, 1.0, 1.0)
+
+
+def points(count, seed=0):
+    return np.random.default_rng(seed).uniform(-1.0, 1.0, (count, 3)).astype(np.float32)
+
+
+def test_add_and_read_stroke():
+    store = StrokeStore(point_capacity=4)
+    pts = points(10)
+    stroke = store.add_stroke(pts, pressures=np.linspace(0, 1, 10), color=RED)
+
+    assert stroke.stroke_id in store
+    assert len(store) == 1
+    np.testing.assert_array_equal(store.get_points(stroke.stroke_id), pts)
+    np.testing.assert_allclose(store.get_pressures(stroke.stroke_id), np.linspace(0, 1, 10))
+    np.testing.assert_array_equal(store.get_colors(stroke.stroke_id), np.tile(RED, (10, 1)))
+    lower, upper = store.get_bounds(stroke.stroke_id)
+    np.testing.assert_array_equal(lower, pts.min(axis=0))
+    np.testing.assert_array_equal(upper, pts.max(axis=0))
+
+
+def test_open_stroke_grows_and_closes():
+    store = StrokeStore()
+    stroke_id = store.begin_stroke(color=RED, reserve=4).stroke_id
+    assert store.is_open(stroke_id)
+
+    pts = points(30)
+    for start in range(0, 30, 3):
+        store.append_points(stroke_id, pts[start:start + 3])
+    store.end_stroke(stroke_id)
+
+    assert not store.is_open(stroke_id)
+    np.testing.assert_array_equal(store.get_points(stroke_id), pts)
+    np.testing.assert_array_equal(store.get_colors(stroke_id), np.tile(RED, (30, 1)))
+
+
+def test_open_stroke_keeps_color_when_relocated_before_any_points():
+    store = StrokeStore()
+    stroke_id = store.begin_stroke(color=RED, reserve=8).stroke_id
+    # Another stroke lands after the reservation, so growing must relocate
+    other = store.add_stroke(points(5), color=BLUE).stroke_id
+    store.append_points(stroke_id, points(100, 1))
+    store.end_stroke(stroke_id)
+
+    np.testing.assert_array_equal(store.get_points(stroke_id), points(100, 1))
+    np.testing.assert_array_equal(store.get_colors(stroke_id), np.tile(RED, (100, 1)))
+    np.testing.assert_array_equal(store.get_colors(other), np.tile(BLUE, (5, 1)))
+
+
+def test_open_stroke_without_points_is_removed():
+    store = StrokeStore()
+    stroke_id = store.begin_stroke().stroke_id
+    store.end_stroke(stroke_id)
+    assert stroke_id not in store
+
+
+def test_bulk_add_and_gather():
+    store = StrokeStore(point_capacity=2)
+    pts = points(12)
+    lengths = np.array([3, 4, 5])
+    colors = np.random.default_rng(2).uniform(0, 1, (12, 4)).astype(np.float32)
+    ids = store.add_strokes(pts, lengths, np.full(12, 0.5), colors)
+
+    np.testing.assert_array_equal(ids, [0, 1, 2])
+    np.testing.assert_array_equal(store.get_points(1), pts[3:7])
+
+    # Gathering in another order keeps the strokes back to back
+    positions, gathered_lengths, pressures, gathered_colors = store.gather(ids[::-1])
+    np.testing.assert_array_equal(gathered_lengths, [5, 4, 3])
+    np.testing.assert_array_equal(positions, np.concatenate([pts[7:], pts[3:7], pts[:3]]))
+    np.testing.assert_array_equal(pressures, 0.5)
+    np.testing.assert_array_equal(gathered_colors[:5], colors[7:])
+
+
+def test_bulk_add_rejects_bad_ids_without_allocating():
+    store = StrokeStore()
+    store.add_stroke(points(2), stroke_id=5)
+    count = store.point_count
+
+    for ids in ([1, 1], [1, 5], [1]):
+        with pytest.raises(ValueError):
+            store.add_strokes(points(4), [2, 2], stroke_ids=ids)
+    assert store.point_count == count
+    assert len(store) == 1
+
+
+def test_change_tracking():
+    store = StrokeStore()
+    first = store.add_stroke(points(3)).stroke_id
+    second = store.add_stroke(points(3)).stroke_id
+    revision = store.revision
+
+    store.remove_stroke(first)
+    third = store.add_stroke(points(3)).stroke_id
+
+    np.testing.assert_array_equal(store.changed_since(revision), [third])
+    np.testing.assert_array_equal(store.removed_since(revision), [first])
+    assert sorted(store.stroke_ids().tolist()) == [second, third]
+
+
+def test_compact_keeps_strokes_and_open_reservations():
+    store = StrokeStore()
+    ids = [store.add_stroke(points(10, i), color=BLUE).stroke_id for i in range(4)]
+    open_id = store.begin_stroke(color=RED, reserve=16).stroke_id
+    store.append_points(open_id, points(3, 9))
+    store.remove_strokes(ids[:2])
+
+    store.compact()
+
+    assert store.point_count == 20 + 16
+    for i in ids[2:]:
+        np.testing.assert_array_equal(store.get_points(i), points(10, i))
+    store.append_points(open_id, points(5, 10))
+    np.testing.assert_array_equal(store.get_colors(open_id), np.tile(RED, (8, 1)))
@@ -0,0 +1,170 @@
+# tests/test_world_storage.py
+"""Write-ahead log replay, torn tails and compaction of WorldStorage."""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from infinitejournal.storage.world import (
+    FRAME_HEADER, OP_ADD, SEGMENT_EXTENSION, StrokeRecord, WorldStorage, read_segment
+)
+
+
+def stroke(seed, count=6):
+    """Positions, pressures and colors of a random stroke."""
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(-1.0, 1.0, (count, 3)).astype(np.float32),
+            rng.uniform(0.0, 1.0, count).astype(np.float32),
+            rng.uniform(0.0, 1.0, (count, 4)).astype(np.float32))
+
+
+def chunk_strokes(storage, coord):
+    """A chunk's strokes as {id: (positions, pressures, colors)}."""
+    ids, positions, lengths, pressures, colors = storage.load_chunk(coord)
+    starts = np.cumsum(lengths) - lengths
+    return {
+        int(i): (positions[s:s + n], pressures[s:s + n], colors[s:s + n])
+        for i, s, n in zip(ids.tolist(), starts.tolist(), lengths.tolist())
+    }
+
+
+def assert_same_strokes(left, right):
+    assert sorted(left) == sorted(right)
+    for stroke_id, arrays in left.items():
+        for a, b in zip(arrays, right[stroke_id]):
+            np.testing.assert_array_equal(a, b)
+
+
+@pytest.fixture
+def opened():
+    """Open WorldStorage instances and close them after the test."""
+    instances = []
+
+    def open_storage(directory, **kwargs):
+        storage = WorldStorage(directory, **kwargs)
+        storage.open()
+        instances.append(storage)
+        return storage
+
+    yield open_storage
+    for storage in instances:
+        storage.close()
+
+
+def write_log(directory, records):
+    """Write records to a fresh log segment, as a crashed session leaves them."""
+    log = directory / "log"
+    log.mkdir(parents=True)
+    path = log / f"{1:020d}{SEGMENT_EXTENSION}"
+    path.write_bytes(b"".join(record.encode() for record in records))
+    return path
+
+
+def logged_adds(count, coord=(0, 0, 0)):
+    return [StrokeRecord(seq, OP_ADD, 10 + seq, coord, *stroke(seq))
+            for seq in range(1, count + 1)]
+
+
+def test_torn_final_frame_is_dropped(tmp_path, opened):
+    records = logged_adds(3)
+    path = write_log(tmp_path, records)
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) - 5])
+
+    replayed, valid = read_segment(path)
+    assert [r.seq for r in replayed] == [1, 2]
+    assert valid == len(records[0].encode()) + len(records[1].encode())
+
+    storage = opened(tmp_path)
+    strokes = chunk_strokes(storage, (0, 0, 0))
+    assert sorted(strokes) == [11, 12]
+    np.testing.assert_array_equal(strokes[12][0], records[1].positions)
+    assert storage.next_stroke_id == 13
+
+
+def test_bad_checksum_final_frame_is_dropped(tmp_path, opened):
+    records = logged_adds(3)
+    path = write_log(tmp_path, records)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    replayed, valid = read_segment(path)
+    assert [r.seq for r in replayed] == [1, 2]
+    assert valid == len(data) - len(records[2].encode())
+
+    storage = opened(tmp_path)
+    assert sorted(chunk_strokes(storage, (0, 0, 0))) == [11, 12]
+
+
+def test_torn_frame_header_is_dropped(tmp_path):
+    path = write_log(tmp_path, logged_adds(2))
+    with open(path, 'ab') as f:
+        f.write(FRAME_HEADER.pack(1000, 0)[:5])
+
+    replayed, valid = read_segment(path)
+    assert [r.seq for r in replayed] == [1, 2]
+    assert valid == path.stat().st_size - 5
+
+
+def test_appends_after_torn_tail_survive_reopen(tmp_path, opened):
+    path = write_log(tmp_path, logged_adds(2))
+    with open(path, 'ab') as f:
+        f.write(b"\x00" * 3)
+
+    storage = opened(tmp_path)
+    storage.log_add(50, (0, 0, 0), *stroke(50))
+    storage.close()
+
+    reopened = opened(tmp_path)
+    assert sorted(chunk_strokes(reopened, (0, 0, 0))) == [11, 12, 50]
+
+
+def apply_edits(storage, compact_midway):
+    """A session of adds, moves and erases across a few chunks."""
+    for i in range(12):
+        storage.log_add(i, (i % 3, 0, 0), *stroke(i))
+    if compact_midway:
+        storage.request_compaction()
+        assert storage.wait_for_compaction(10.0)
+    storage.log_modify(4, (2, 0, 0), *stroke(100, 9), previous_coord=(1, 0, 0))
+    storage.log_modify(5, (2, 0, 0), *stroke(101, 3))
+    storage.log_erase(0, (0, 0, 0))
+    storage.log_erase(7, (1, 0, 0))
+    storage.log_add(20, (1, 0, 0), *stroke(20))
+    storage.flush(durable=True)
+
+
+COORDS = [(0, 0, 0), (1, 0, 0), (2, 0, 0)]
+
+
+def test_compaction_matches_replay(tmp_path, opened):
+    # Replay only: the whole session is still in the log
+    logged = opened(tmp_path / "logged", compaction_threshold=1 << 30)
+    apply_edits(logged, compact_midway=False)
+    shutil.copytree(tmp_path / "logged", tmp_path / "logged-crash")
+
+    # Checkpoint plus chunk files, with the rest of the session in the log
+    compacted = opened(tmp_path / "compacted", compaction_threshold=1 << 30)
+    apply_edits(compacted, compact_midway=True)
+    assert compacted.wait_for_compaction(10.0)
+    assert (tmp_path / "compacted" / "checkpoint").exists()
+    shutil.copytree(tmp_path / "compacted", tmp_path / "compacted-crash")
+
+    replayed = opened(tmp_path / "logged-crash")
+    recovered = opened(tmp_path / "compacted-crash")
+    for coord in COORDS:
+        expected = chunk_strokes(logged, coord)
+        assert_same_strokes(chunk_strokes(compacted, coord), expected)
+        assert_same_strokes(chunk_strokes(replayed, coord), expected)
+        assert_same_strokes(chunk_strokes(recovered, coord), expected)
+    assert replayed.next_stroke_id == recovered.next_stroke_id == 21
+
+    # Folding everything on close leaves the same world
+    compacted.close()
+    assert compacted.pending_bytes == 0
+    reopened = opened(tmp_path / "compacted")
+    for coord in COORDS:
+        assert_same_strokes(chunk_strokes(reopened, coord), chunk_strokes(logged, coord))
+    assert sorted(chunk_strokes(reopened, (2, 0, 0))) == [2, 4, 5, 8, 11]